@@ -0,0 +1,94 @@
+"""add player stats
+
+Revision ID: 3f1c9b2a7d45
+Revises: 7e7f6f73932e
+Create Date: 2026-10-18 12:00:41.518223
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c9b2a7d45'
+down_revision: Union[str, None] = '7e7f6f73932e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COUNTERS = [
+    "games_count_total",
+    "won_games_count_total",
+    "games_count_as_civilian",
+    "won_games_count_as_civilian",
+    "games_count_as_mafia",
+    "won_games_count_as_mafia",
+    "games_count_as_don",
+    "won_games_count_as_don",
+    "games_count_as_sheriff",
+    "won_games_count_as_sheriff",
+    "first_killed_count",
+    "best_move_count_total",
+    "zero_mafia_best_move_count",
+    "one_mafia_best_move_count",
+    "two_mafia_best_move_count",
+    "three_mafia_best_move_count",
+]
+
+FILL_PLAYER_STATS = """
+INSERT INTO player_stats (player_id, {counters})
+SELECT
+    pg.player_id,
+    count(*),
+    count(*) FILTER (WHERE {is_won}),
+    count(*) FILTER (WHERE pg.role = 'civilian'),
+    count(*) FILTER (WHERE pg.role = 'civilian' AND {is_won}),
+    count(*) FILTER (WHERE pg.role = 'mafia'),
+    count(*) FILTER (WHERE pg.role = 'mafia' AND {is_won}),
+    count(*) FILTER (WHERE pg.role = 'don'),
+    count(*) FILTER (WHERE pg.role = 'don' AND {is_won}),
+    count(*) FILTER (WHERE pg.role = 'sheriff'),
+    count(*) FILTER (WHERE pg.role = 'sheriff' AND {is_won}),
+    count(*) FILTER (WHERE {is_first_killed}),
+    count(*) FILTER (WHERE {has_best_move}),
+    count(*) FILTER (WHERE {has_best_move} AND bm.black_in_best_move = 0),
+    count(*) FILTER (WHERE {has_best_move} AND bm.black_in_best_move = 1),
+    count(*) FILTER (WHERE {has_best_move} AND bm.black_in_best_move = 2),
+    count(*) FILTER (WHERE {has_best_move} AND bm.black_in_best_move = 3)
+FROM players_games pg
+JOIN games g ON g.id = pg.game_id
+LEFT JOIN (
+    SELECT
+        game_id,
+        count(*) FILTER (WHERE in_best_move) AS best_move_size,
+        count(*) FILTER (WHERE in_best_move AND role IN ('mafia', 'don')) AS black_in_best_move
+    FROM players_games
+    GROUP BY game_id
+) bm ON bm.game_id = pg.game_id
+WHERE g.status = 'ended'
+GROUP BY pg.player_id
+""".format(
+    counters=", ".join(COUNTERS),
+    is_won=(
+        "((pg.role IN ('civilian', 'sheriff') AND g.result = 'civilians_won') "
+        "OR (pg.role IN ('mafia', 'don') AND g.result = 'mafia_won'))"
+    ),
+    is_first_killed="(pg.is_first_killed AND pg.role IN ('civilian', 'sheriff'))",
+    has_best_move="(pg.is_first_killed AND pg.role IN ('civilian', 'sheriff') AND bm.best_move_size > 0)",
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "player_stats",
+        sa.Column("player_id", sa.Integer(), nullable=False),
+        *[sa.Column(name, sa.Integer(), nullable=False, server_default="0") for name in COUNTERS],
+        sa.ForeignKeyConstraint(["player_id"], ["players.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("player_id"),
+    )
+    op.execute(FILL_PLAYER_STATS)
+
+
+def downgrade() -> None:
+    op.drop_table("player_stats")
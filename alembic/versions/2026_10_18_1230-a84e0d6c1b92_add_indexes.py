@@ -0,0 +1,37 @@
+"""add indexes
+
+Revision ID: a84e0d6c1b92
+Revises: 3f1c9b2a7d45
+Create Date: 2026-10-18 12:30:12.904417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a84e0d6c1b92'
+down_revision: Union[str, None] = '3f1c9b2a7d45'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_players_games_player_id_role", "players_games", ["player_id", "role"])
+    op.create_index("ix_players_games_game_id_number", "players_games", ["game_id", "number"])
+    op.create_index("ix_games_status_created_at", "games", ["status", sa.text("created_at DESC")])
+    op.create_index(
+        "ix_games_draft_created_at",
+        "games",
+        [sa.text("created_at DESC")],
+        postgresql_where=sa.text("status = 'draft'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_games_draft_created_at", table_name="games")
+    op.drop_index("ix_games_status_created_at", table_name="games")
+    op.drop_index("ix_players_games_game_id_number", table_name="players_games")
+    op.drop_index("ix_players_games_player_id_role", table_name="players_games")
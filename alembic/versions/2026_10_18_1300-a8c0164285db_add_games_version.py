@@ -0,0 +1,26 @@
+"""add games version
+
+Revision ID: a8c0164285db
+Revises: a84e0d6c1b92
+Create Date: 2026-10-18 13:00:41.517203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8c0164285db'
+down_revision: Union[str, None] = 'a84e0d6c1b92'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("games", sa.Column("version", sa.Integer(), server_default="1", nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column("games", "version")
@@ -0,0 +1,64 @@
+"""add leaderboard
+
+Revision ID: c51e7a3d0f28
+Revises: a8c0164285db
+Create Date: 2026-10-18 13:30:12.402817
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c51e7a3d0f28'
+down_revision: Union[str, None] = 'a8c0164285db'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CATEGORIES = {
+    "overall": ("total",),
+    "red": ("as_civilian", "as_sheriff"),
+    "black": ("as_mafia", "as_don"),
+    "civilian": ("as_civilian",),
+    "mafia": ("as_mafia",),
+    "don": ("as_don",),
+    "sheriff": ("as_sheriff",),
+}
+
+FILL_LEADERBOARD = "\nUNION ALL\n".join(
+    """
+SELECT '{category}', player_id, {games_count}, {won_games_count}, CAST({won_games_count} AS FLOAT) / ({games_count})
+FROM player_stats
+WHERE {games_count} > 0""".format(
+        category=category,
+        games_count=" + ".join(f"games_count_{suffix}" for suffix in suffixes),
+        won_games_count=" + ".join(f"won_games_count_{suffix}" for suffix in suffixes),
+    )
+    for category, suffixes in CATEGORIES.items()
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "leaderboard",
+        sa.Column("category", sa.String(), nullable=False),
+        sa.Column("player_id", sa.Integer(), nullable=False),
+        sa.Column("games_count", sa.Integer(), nullable=False),
+        sa.Column("won_games_count", sa.Integer(), nullable=False),
+        sa.Column("win_rate", sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(["player_id"], ["players.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("category", "player_id"),
+    )
+    op.create_index(
+        "ix_leaderboard_category_win_rate",
+        "leaderboard",
+        ["category", sa.text("win_rate DESC"), sa.text("games_count DESC"), sa.text("player_id DESC")],
+    )
+    op.execute(f"INSERT INTO leaderboard (category, player_id, games_count, won_games_count, win_rate){FILL_LEADERBOARD}")
+
+
+def downgrade() -> None:
+    op.drop_index("ix_leaderboard_category_win_rate", table_name="leaderboard")
+    op.drop_table("leaderboard")
@@ -0,0 +1,89 @@
+"""add players ratings
+
+Revision ID: 3e9b7d21c6a4
+Revises: c51e7a3d0f28
+Create Date: 2026-10-18 15:15:41.285114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3e9b7d21c6a4'
+down_revision: Union[str, None] = 'c51e7a3d0f28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# same order as ratings are rebuilt by `manage.py rebuild-ratings`
+ENDED_GAMES_PARTICIPANTS = """
+SELECT pg.game_id, pg.player_id, pg.role, g.result
+FROM players_games pg
+JOIN games g ON g.id = pg.game_id
+WHERE g.status = 'ended'
+ORDER BY g.created_at, g.id, pg.number
+"""
+
+# frozen copy of core.ratings as of this revision, the migration must not change with the application code
+INITIAL_RATING = 1500.0
+RATING_K_FACTOR = 24.0
+ROLES_WEIGHTS = {"civilian": 1.0, "sheriff": 1.5, "mafia": 1.0, "don": 1.5}
+RED_ROLES = ("civilian", "sheriff")
+RED_TEAM_SCORES = {"civilians_won": 1.0, "draw": 0.5, "mafia_won": 0.0}
+
+
+def _rate_game(ratings, roles, result):
+    """returns ratings changes of game players, see core.rate_game"""
+    signed_weights = [ROLES_WEIGHTS[role] if role in RED_ROLES else -ROLES_WEIGHTS[role] for role in roles]
+    red_weights_sum = sum(w for w in signed_weights if w > 0)
+    black_weights_sum = -sum(w for w in signed_weights if w < 0)
+    ratings_difference = sum(
+        rating * w / (red_weights_sum if w > 0 else black_weights_sum) for rating, w in zip(ratings, signed_weights)
+    )
+    red_expected_score = 1 / (1 + 10 ** (-ratings_difference / 400))
+    return [RATING_K_FACTOR * w * (RED_TEAM_SCORES[result] - red_expected_score) for w in signed_weights]
+
+
+def _replay_games(participants):
+    """participants are chronological (game_id, player_id, role, result) rows, returns rating and games count by player"""
+    ratings = {}
+    games_counts = {}
+    games = {}
+    for game_id, player_id, role, result in participants:
+        games.setdefault(game_id, []).append((player_id, role, result))
+    for game_participants in games.values():
+        players_ids = [player_id for player_id, _, _ in game_participants]
+        deltas = _rate_game(
+            [ratings.get(player_id, INITIAL_RATING) for player_id in players_ids],
+            [role for _, role, _ in game_participants],
+            game_participants[0][2],
+        )
+        for player_id, delta in zip(players_ids, deltas):
+            ratings[player_id] = ratings.get(player_id, INITIAL_RATING) + delta
+            games_counts[player_id] = games_counts.get(player_id, 0) + 1
+    return [(player_id, rating, games_counts[player_id]) for player_id, rating in sorted(ratings.items())]
+
+
+def upgrade() -> None:
+    players_ratings = op.create_table(
+        "players_ratings",
+        sa.Column("player_id", sa.Integer(), nullable=False),
+        sa.Column("rating", sa.Float(), nullable=False),
+        sa.Column("games_count", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["player_id"], ["players.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("player_id"),
+    )
+    participants = op.get_bind().execute(sa.text(ENDED_GAMES_PARTICIPANTS)).all()
+    op.bulk_insert(
+        players_ratings,
+        [
+            {"player_id": player_id, "rating": rating, "games_count": games_count}
+            for player_id, rating, games_count in _replay_games(participants)
+        ],
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("players_ratings")
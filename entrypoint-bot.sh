@@ -1,4 +1,6 @@
 #!/bin/sh
-uv run alembic upgrade head
+if [ "$DB_BACKEND" != "sqlite" ]; then
+    uv run alembic upgrade head
+fi
 cd src
 uv run python3 main.py
\ No newline at end of file
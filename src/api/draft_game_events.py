@@ -0,0 +1,71 @@
+import asyncio
+import logging
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager, suppress
+
+from usecases.schemas import GameStateSchema
+
+SUBSCRIBER_QUEUE_SIZE = 1  # viewers need only the latest state
+
+
+class DraftGameEvents:
+    """
+    Fans out state of the draft game to all subscribed viewers. The state is read once per change
+    and is sent only if it differs from the last sent one, so changes of other games cost a single query.
+    """
+
+    def __init__(
+        self,
+        get_state: Callable[[], Awaitable[GameStateSchema | None]],
+        poll_interval: float | None = None,
+    ) -> None:
+        """Without changes notifications the state is polled every `poll_interval` seconds while there are viewers"""
+        self._get_state = get_state
+        self._poll_interval = poll_interval
+        self._changed = asyncio.Event()
+        self._state: str | None = None
+        self._subscribers: set[asyncio.Queue[str]] = set()
+
+    def changed(self) -> None:
+        self._changed.set()
+
+    def _publish(self, queue: asyncio.Queue[str], state: str) -> None:
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(state)
+
+    async def _read_state(self) -> str:
+        state = await self._get_state()
+        return "null" if state is None else state.model_dump_json()
+
+    async def run(self) -> None:
+        """Publishes the state after every `changed` call or poll until cancelled"""
+        while True:
+            timeout = self._poll_interval if self._subscribers else None
+            with suppress(TimeoutError):
+                await asyncio.wait_for(self._changed.wait(), timeout=timeout)
+            self._changed.clear()
+            try:
+                state = await self._read_state()
+            except Exception:
+                logging.exception("Draft game state is not read")
+                continue
+            if state == self._state:
+                continue
+            self._state = state
+            for queue in self._subscribers:
+                self._publish(queue, state)
+
+    @asynccontextmanager
+    async def subscribe(self) -> AsyncIterator[asyncio.Queue[str]]:
+        """Queue of states, starting with the current one"""
+        queue: asyncio.Queue[str] = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self._publish(queue, await self._read_state())
+        self._subscribers.add(queue)
+        if self._poll_interval is not None:
+            # polling waits for the first subscriber
+            self.changed()
+        try:
+            yield queue
+        finally:
+            self._subscribers.discard(queue)
@@ -1,15 +1,78 @@
-from fastapi import FastAPI
+import asyncio
+import datetime
+import secrets
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, HTTPException, Header, Query
 from starlette.requests import Request
-from starlette.responses import HTMLResponse
+from starlette.responses import HTMLResponse, Response, StreamingResponse
 from starlette.staticfiles import StaticFiles
 from starlette.templating import Jinja2Templates
 
-from dependencies import container
-from usecases import GetGamesUseCase
+import core
+from api.draft_game_events import DraftGameEvents
+from config import get_settings
+from core import LeaderboardCategories, StatsPeriods
+from dependencies import container, db_engine
+from repositories.db.dialects import POSTGRESQL
+from repositories.db.engine import create_schema, get_pool_metrics
+from repositories.db.notifications import GamesChangesListener
+from usecases import (
+    GetGamesUseCase,
+    GetLeaderboardUseCase,
+    GetPlayerPairsUseCase,
+    GetPlayerStatsUseCase,
+    GetSeatsStatsUseCase,
+)
+from usecases.errors import NotFoundError
+from usecases.schemas import (
+    DBPoolMetricsSchema,
+    GameSchema,
+    GameStateSchema,
+    GameVersionSchema,
+    LeaderboardCursorSchema,
+    LeaderboardPageSchema,
+    PlayerPairStatsSchema,
+    PlayerStatsSchema,
+    SeatStatsSchema,
+)
+
+DRAFT_GAME_POLL_INTERVAL = 1.0  # for databases without changes notifications
+EVENTS_KEEPALIVE_INTERVAL = 15.0  # proxies close idle connections
+
+
+async def _get_draft_game_state() -> GameStateSchema | None:
+    uc: GetGamesUseCase = container.resolve(GetGamesUseCase)
+    return await uc.get_draft_game_state()
+
 
-app = FastAPI(title="MafiaAPI")
+draft_game_events = DraftGameEvents(
+    _get_draft_game_state,
+    poll_interval=None if db_engine.dialect.name == POSTGRESQL else DRAFT_GAME_POLL_INTERVAL,
+)
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    await create_schema(db_engine)
+    tasks = [asyncio.create_task(draft_game_events.run())]
+    if db_engine.dialect.name == POSTGRESQL:
+        tasks.append(asyncio.create_task(GamesChangesListener(db_engine, draft_game_events.changed).run()))
+    yield
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    await db_engine.dispose()
+
+
+app = FastAPI(title="MafiaAPI", lifespan=lifespan)
 app.mount("/static", StaticFiles(directory="api/static"), name="static")
 templates = Jinja2Templates(directory="api/templates")
+PERIOD_QUERY = Query(
+    default=StatsPeriods.ALL_TIME,
+    description="all time, current season or current month, seasons start at SEASON_START_MONTH setting",
+)
 
 
 @app.get("/players", description="returns last game in draft info")
@@ -17,3 +80,182 @@ async def get_players(request: Request) -> HTMLResponse:
     uc: GetGamesUseCase = container.resolve(GetGamesUseCase)
     game = await uc.get_last_game_in_draft()
     return templates.TemplateResponse(request=request, name="main.html", context={"game": game})
+
+
+@app.get(
+    "/games/draft/events",
+    description="server-sent events with state of the draft game, sent on connection and after every change",
+    response_class=StreamingResponse,
+)
+async def get_draft_game_events() -> StreamingResponse:
+    async def _events() -> AsyncIterator[str]:
+        sent_state = None
+        async with draft_game_events.subscribe() as states:
+            while True:
+                try:
+                    state = await asyncio.wait_for(states.get(), timeout=EVENTS_KEEPALIVE_INTERVAL)
+                except TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if state != sent_state:
+                    sent_state = state
+                    yield f"data: {state}\n\n"
+
+    return StreamingResponse(
+        _events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get(
+    "/games/export",
+    description="streams ended games created in [since, until) oldest first as NDJSON, one game per line",
+    response_class=StreamingResponse,
+)
+async def export_games(
+    since: datetime.datetime | None = Query(default=None, description="moscow time if timezone is not given"),
+    until: datetime.datetime | None = Query(default=None, description="moscow time if timezone is not given"),
+) -> StreamingResponse:
+    uc: GetGamesUseCase = container.resolve(GetGamesUseCase)
+
+    async def _lines() -> AsyncIterator[str]:
+        async for game in uc.iter_ended_games(since=since, until=until):
+            yield game.model_dump_json() + "\n"
+
+    return StreamingResponse(_lines(), media_type="application/x-ndjson")
+
+
+def _game_headers(version: GameVersionSchema) -> dict[str, str]:
+    """
+    Strong ETag changes with every change of the game. Clients revalidate every game, ended ones too,
+    since they change when their players are renamed or deleted
+    """
+    return {"ETag": f'"{version.id}-{version.version}"', "Cache-Control": "no-cache"}
+
+
+def _is_not_modified(request: Request, headers: dict[str, str]) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is None:
+        return False
+    etags = {etag.strip().removeprefix("W/") for etag in if_none_match.split(",")}
+    return "*" in etags or headers["ETag"] in etags
+
+
+def _game_response(game: GameSchema, response: Response) -> GameSchema:
+    response.headers.update(_game_headers(GameVersionSchema(id=game.id, version=game.version, status=game.status)))
+    return game
+
+
+@app.get("/games/draft", description="returns last game in draft, answers 304 if it matches If-None-Match")
+async def get_draft_game(request: Request, response: Response) -> GameSchema:
+    uc: GetGamesUseCase = container.resolve(GetGamesUseCase)
+    version = await uc.get_draft_game_version()
+    if version is not None and _is_not_modified(request, headers := _game_headers(version)):
+        return Response(status_code=304, headers=headers)
+    game = await uc.get_last_game_in_draft()
+    if game is None:
+        raise HTTPException(status_code=404, detail="No game in draft")
+    return _game_response(game, response)
+
+
+@app.get("/games/{game_id}", description="returns game, answers 304 if it matches If-None-Match")
+async def get_game(game_id: int, request: Request, response: Response) -> GameSchema:
+    uc: GetGamesUseCase = container.resolve(GetGamesUseCase)
+    try:
+        version = await uc.get_game_version(game_id)
+        if _is_not_modified(request, headers := _game_headers(version)):
+            return Response(status_code=304, headers=headers)
+        game = await uc.get_game(game_id)
+    except NotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e)) from e
+    return _game_response(game, response)
+
+
+def _validate_metrics_token(authorization: str | None) -> None:
+    token = get_settings().METRICS_TOKEN
+    if token is None:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    if authorization is None or not secrets.compare_digest(authorization, f"Bearer {token}"):
+        raise HTTPException(status_code=401, detail="Invalid metrics token", headers={"WWW-Authenticate": "Bearer"})
+
+
+@app.get(
+    "/metrics/db-pool",
+    description="returns database connection pool metrics of api process, requires METRICS_TOKEN bearer token",
+)
+async def get_db_pool_metrics(authorization: str | None = Header(default=None)) -> DBPoolMetricsSchema:
+    _validate_metrics_token(authorization)
+    return get_pool_metrics(db_engine)
+
+
+@app.get("/leaderboard/{category}", description="returns page of players ranked by win rate in category")
+async def get_leaderboard(
+    category: LeaderboardCategories,
+    limit: int = Query(default=20, gt=0, le=100),
+    min_games: int | None = Query(default=None, ge=1, description="LEADERBOARD_MIN_GAMES setting by default"),
+    cursor_win_rate: float | None = None,
+    cursor_games_count: int | None = None,
+    cursor_player_id: int | None = None,
+    backward: bool = False,
+    period: StatsPeriods = PERIOD_QUERY,
+) -> LeaderboardPageSchema:
+    uc: GetLeaderboardUseCase = container.resolve(GetLeaderboardUseCase)
+    since, until = core.get_current_period_bounds(period, get_settings().SEASON_START_MONTH)
+    cursor = None
+    if cursor_win_rate is not None and cursor_games_count is not None and cursor_player_id is not None:
+        cursor = LeaderboardCursorSchema(
+            win_rate=cursor_win_rate,
+            games_count=cursor_games_count,
+            player_id=cursor_player_id,
+            backward=backward,
+        )
+    return await uc.get_leaderboard_page(
+        category=category,
+        min_games=get_settings().LEADERBOARD_MIN_GAMES if min_games is None else min_games,
+        limit=limit,
+        cursor=cursor,
+        since=since,
+        until=until,
+    )
+
+
+@app.get("/players/{player_id}/stats", description="returns player's stats of ended games in period")
+async def get_player_stats(player_id: int, period: StatsPeriods = PERIOD_QUERY) -> PlayerStatsSchema:
+    uc: GetPlayerStatsUseCase = container.resolve(GetPlayerStatsUseCase)
+    since, until = core.get_current_period_bounds(period, get_settings().SEASON_START_MONTH)
+    try:
+        return await uc.get_player_stats(player_id, since=since, until=until)
+    except NotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e)) from e
+
+
+@app.get("/players/{player_id}/pairs", description="returns stats of player with every player met in games")
+async def get_player_pairs(player_id: int) -> list[PlayerPairStatsSchema]:
+    uc: GetPlayerPairsUseCase = container.resolve(GetPlayerPairsUseCase)
+    try:
+        return await uc.get_player_pairs(player_id)
+    except NotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e)) from e
+
+
+@app.get(
+    "/players/{player_id}/pairs/{other_player_id}",
+    description="returns games of two players in one team and against each other",
+)
+async def get_pair_stats(player_id: int, other_player_id: int) -> PlayerPairStatsSchema:
+    uc: GetPlayerPairsUseCase = container.resolve(GetPlayerPairsUseCase)
+    try:
+        return await uc.get_pair_stats(player_id, other_player_id)
+    except NotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e)) from e
+
+
+@app.get("/seats", description="returns win rates by seat number and role of the player or of the whole club")
+async def get_seats_stats(player_id: int | None = None, period: StatsPeriods = PERIOD_QUERY) -> list[SeatStatsSchema]:
+    uc: GetSeatsStatsUseCase = container.resolve(GetSeatsStatsUseCase)
+    since, until = core.get_current_period_bounds(period, get_settings().SEASON_START_MONTH)
+    try:
+        return await uc.get_seats_stats(player_id=player_id, since=since, until=until)
+    except NotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e)) from e
@@ -3,8 +3,8 @@ from usecases.errors import ForbiddenError
 
 
 def validate_admin(user_id: int):
-    if not user_id == get_settings().ADMIN_ID:
+    if user_id not in get_settings().admin_ids:
         raise ForbiddenError("Not allowed")
 
 def is_admin(user_id: int):
-    return user_id == get_settings().ADMIN_ID
+    return user_id in get_settings().admin_ids
@@ -53,16 +53,31 @@ class EndGameCallbackFactory(CallbackData, prefix="end"):
 
 class GamesDetailPageCallbackFactory(CallbackData, prefix="game"):
     game_id: int
-    page: int
+    cursor_created_at: str | None = None
+    cursor_id: int | None = None
+    backward: bool = False
 
 
 class GamesCurrentPageCallbackFactory(CallbackData, prefix="game"):
-    page: int
+    cursor_created_at: str | None = None
+    cursor_id: int | None = None
+    backward: bool = False
 
 
 class PlayerCallbackFactory(CallbackData, prefix="player"):
     player_id: int
     page: int
+    period: core.StatsPeriods = core.StatsPeriods.ALL_TIME
+
+
+class PlayerPairsCallbackFactory(CallbackData, prefix="player_pairs"):
+    player_id: int
+    page: int
+
+
+class PlayerSeatsCallbackFactory(CallbackData, prefix="player_seats"):
+    player_id: int
+    page: int
 
 
 class DeletePlayerCallbackFactory(CallbackData, prefix="delete_player"):
@@ -94,3 +109,11 @@ class PlayersCurrentPageCallbackFactory(CallbackData, prefix="players"):
 class GetSeatCallbackFactory(CallbackData, prefix="seats"):
     allowed_seats: str | None
     timestamp: str = str(time.time() * 1000)
+
+
+class LeaderboardPageCallbackFactory(CallbackData, prefix="leaders"):
+    category: core.LeaderboardCategories
+    cursor_win_rate: float | None = None
+    cursor_games_count: int | None = None
+    cursor_player_id: int | None = None
+    backward: bool = False
@@ -3,6 +3,7 @@ from aiogram.types import KeyboardButton, ReplyKeyboardMarkup
 admin_kb = ReplyKeyboardMarkup(
     keyboard=[
         [KeyboardButton(text="Список игроков"), KeyboardButton(text="Список игр")],
+        [KeyboardButton(text="Лидеры"), KeyboardButton(text="Места")],
         [KeyboardButton(text="Сгенерировать рассадку")],
         [KeyboardButton(text="Создать игрока"), KeyboardButton(text="Создать игру")],
     ],
@@ -12,6 +13,7 @@ admin_kb = ReplyKeyboardMarkup(
 user_kb = ReplyKeyboardMarkup(
     keyboard=[
         [KeyboardButton(text="Список игроков"), KeyboardButton(text="Список игр")],
+        [KeyboardButton(text="Лидеры"), KeyboardButton(text="Места")],
     ],
     resize_keyboard=True,
 )
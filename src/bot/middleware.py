@@ -1,28 +1,79 @@
 from collections.abc import Callable
 
-from aiogram import BaseMiddleware
+from aiogram import BaseMiddleware, Bot
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware, NextRequestMiddlewareType
+from aiogram.methods import TelegramMethod
+from aiogram.methods.base import TelegramType
 from aiogram.types import TelegramObject, User
+from sqlalchemy.ext.asyncio import async_sessionmaker
 
 from config import get_settings
 from dependencies import container
+from repositories.db import UnitOfWork, get_current_unit_of_work, without_unit_of_work
 from usecases import UsersUseCase
 from usecases.schemas import UserSchema
 
 
+class UnitOfWorkMiddleware(BaseMiddleware):
+    """
+    Shares one database session between all use cases handling an update. Changes are committed when the update
+    is handled and before Telegram API calls, see `CommitUnitOfWorkRequestMiddleware`
+    """
+
+    def __init__(self, session_factory: async_sessionmaker) -> None:
+        self._session_factory = session_factory
+
+    async def __call__(self, handler: Callable, event: TelegramObject, data: dict):
+        async with UnitOfWork(self._session_factory):
+            return await handler(event, data)
+
+
+class CommitUnitOfWorkRequestMiddleware(BaseRequestMiddleware):
+    """
+    Commits unit of work of the update before every Telegram API call, so replies never report changes
+    which are rolled back by a later error and the connection is not held while waiting for Telegram
+    """
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ):
+        unit_of_work = get_current_unit_of_work()
+        if unit_of_work is not None:
+            await unit_of_work.commit()
+        return await make_request(bot, method)
+
+
 class SaveUserMiddleware(BaseMiddleware):
+    """Saves new bot users. Shares known users between all observers it is registered for"""
+
+    def __init__(self) -> None:
+        self._known_users_ids: set[int] = set()
+
+    async def load_known_users(self) -> None:
+        users_uc: UsersUseCase = container.resolve(UsersUseCase)
+        self._known_users_ids = {u.telegram_id for u in await users_uc.get_users()}
+
     async def __call__(self, handler: Callable, event: TelegramObject, data: dict):
         user: User = data["event_from_user"]
-        users_uc: UsersUseCase = container.resolve(UsersUseCase)
-        if user.id not in {u.telegram_id for u in await users_uc.get_users()}:
+        if user.id not in self._known_users_ids:
+            users_uc: UsersUseCase = container.resolve(UsersUseCase)
             user_to_save = UserSchema(
                 telegram_id=user.id,
                 username=user.username,
                 first_name=user.first_name,
                 last_name=user.last_name,
             )
-            await users_uc.save_user(user_to_save)
-            if user.id != get_settings().ADMIN_ID:
-                await event.bot.send_message(get_settings().ADMIN_ID, text=self._get_new_user_message(user_to_save))
+            # committed right away, so the user stays saved if the handler fails and rolls back the update
+            with without_unit_of_work():
+                is_new = await users_uc.save_user_if_new(user_to_save)
+            self._known_users_ids.add(user.id)
+            admin_ids = get_settings().admin_ids
+            if is_new and user.id not in admin_ids:
+                for admin_id in admin_ids:
+                    await event.bot.send_message(admin_id, text=self._get_new_user_message(user_to_save))
         return await handler(event, data)
 
     @staticmethod
@@ -30,4 +81,4 @@ class SaveUserMiddleware(BaseMiddleware):
         return (f"Новый пользователь бота:\n"
                 f"ID: {user.telegram_id}\n"
                 f"Имя: {user.first_name} {user.last_name or ""}"
-                f"\n\n{"" + user.username or ""}")
+                f"\n\n{user.username or ""}")
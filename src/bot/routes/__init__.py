@@ -1,2 +1,4 @@
 from .games import router as games_router
+from .leaderboard import router as leaderboard_router
 from .players import router as players_router
+from .seats import router as seats_router
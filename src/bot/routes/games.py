@@ -34,11 +34,19 @@ from usecases import (
     GetSeatUseCase,
 )
 from usecases.errors import ValidationError
-from usecases.schemas import GameSchema, PlayerInGameSchema, PlayerSchema
+from usecases.schemas import (
+    GameSchema,
+    GameSummarySchema,
+    GamesCursorSchema,
+    GamesPageSchema,
+    PlayerInGameSchema,
+    PlayerSchema,
+)
 
 router = Router()
 PLAYERS_PER_PAGE = 10
 GAMES_PER_PAGE = 5
+CURSOR_DATETIME_FORMAT = "%Y%m%d%H%M%S%f"
 ORDERED_PLAYERS_NUMBERS = [5, 6, 4, 7, 3, 8, 2, 9, 1, 10]
 
 
@@ -63,20 +71,61 @@ def _get_players_builder(players: list[PlayerSchema], seat_number: int, game_id:
     return builder
 
 
-def _get_games_builder(games: list[GameSchema], from_page: int) -> InlineKeyboardBuilder:
+def _get_games_page_callback(cursor: GamesCursorSchema | None) -> GamesCurrentPageCallbackFactory:
+    if cursor is None:
+        return GamesCurrentPageCallbackFactory()
+    return GamesCurrentPageCallbackFactory(
+        cursor_created_at=cursor.created_at.strftime(CURSOR_DATETIME_FORMAT),
+        cursor_id=cursor.id,
+        backward=cursor.backward,
+    )
+
+
+def _get_games_page_cursor(
+    callback_data: GamesCurrentPageCallbackFactory | GamesDetailPageCallbackFactory,
+) -> GamesCursorSchema | None:
+    if callback_data.cursor_created_at is None or callback_data.cursor_id is None:
+        return None
+    return GamesCursorSchema(
+        # packed without offset, naive time is taken as the stored moscow time of the game
+        created_at=datetime.datetime.strptime(callback_data.cursor_created_at, CURSOR_DATETIME_FORMAT),  # noqa: DTZ007
+        id=callback_data.cursor_id,
+        backward=callback_data.backward,
+    )
+
+
+def _get_games_builder(games: list[GameSummarySchema], from_page: GamesCursorSchema | None) -> InlineKeyboardBuilder:
     builder = InlineKeyboardBuilder()
+    page_callback = _get_games_page_callback(from_page)
     for game in games:
         builder.button(
             text=f"{get_team_emoji_by_game_result(game.result)} {game.created_at.strftime("%d.%m.%Y %H:%M")}",
             callback_data=GamesDetailPageCallbackFactory(
                 game_id=game.id,
-                page=from_page,
+                **page_callback.model_dump(),
             ).pack(),
         )
     builder.adjust(2)
     return builder
 
 
+def _get_games_page_keyboard(page: GamesPageSchema, cursor: GamesCursorSchema | None) -> InlineKeyboardMarkup:
+    builder = _get_games_builder(page.games, from_page=cursor)
+    builder.adjust(1)
+    buttons = []
+    if page.previous_page is not None:
+        buttons.append(
+            InlineKeyboardButton(text="⬅️", callback_data=_get_games_page_callback(page.previous_page).pack()),
+        )
+    if page.next_page is not None:
+        buttons.append(
+            InlineKeyboardButton(text="➡️", callback_data=_get_games_page_callback(page.next_page).pack()),
+        )
+    if buttons:
+        builder.row(*buttons)
+    return builder.as_markup()
+
+
 def _get_draft_game_keyboard(game: GameSchema) -> InlineKeyboardMarkup:
     builder = InlineKeyboardBuilder()
     for number in ORDERED_PLAYERS_NUMBERS:
@@ -297,17 +346,11 @@ async def select_game_result(callback_query: types.CallbackQuery, callback_data:
 @router.message(F.text.lower() == "список игр")
 async def games_list(message: types.Message):
     uc: GetGamesUseCase = container.resolve(GetGamesUseCase)
-    games, games_count = await uc.get_ended_games(limit=GAMES_PER_PAGE)
-    builder = _get_games_builder(games, from_page=0)
-    builder.adjust(1)
-    if not games:
-        await message.answer(text="Список игр пуст.", reply_markup=builder.as_markup())
+    page = await uc.get_ended_games_page(limit=GAMES_PER_PAGE)
+    if not page.games:
+        await message.answer(text="Список игр пуст.")
         return
-    if len(games) < games_count:
-        builder.row(
-            InlineKeyboardButton(text="➡️", callback_data=GamesCurrentPageCallbackFactory(page=1).pack()),
-        )
-    await message.answer(text="Игры:", reply_markup=builder.as_markup())
+    await message.answer(text="Игры:", reply_markup=_get_games_page_keyboard(page, cursor=None))
 
 
 @router.callback_query(GamesCurrentPageCallbackFactory.filter())
@@ -315,30 +358,9 @@ async def get_current_page_of_games(
     callback_query: types.CallbackQuery, callback_data: GamesCurrentPageCallbackFactory
 ):
     uc: GetGamesUseCase = container.resolve(GetGamesUseCase)
-    players, players_count = await uc.get_ended_games(
-        limit=GAMES_PER_PAGE,
-        offset=callback_data.page * GAMES_PER_PAGE,
-    )
-    builder = _get_games_builder(players, callback_data.page)
-    builder.adjust(1)
-    buttons = []
-    if callback_data.page > 0:
-        buttons.append(
-            InlineKeyboardButton(
-                text="⬅️",
-                callback_data=GamesCurrentPageCallbackFactory(page=callback_data.page - 1).pack(),
-            ),
-        )
-    if players_count > len(players) + callback_data.page * GAMES_PER_PAGE:
-        buttons.append(
-            InlineKeyboardButton(
-                text="➡️",
-                callback_data=GamesCurrentPageCallbackFactory(page=callback_data.page + 1).pack(),
-            )
-        )
-    if buttons:
-        builder.row(*buttons)
-    await callback_query.message.edit_text(text="Игры:", reply_markup=builder.as_markup())
+    cursor = _get_games_page_cursor(callback_data)
+    page = await uc.get_ended_games_page(limit=GAMES_PER_PAGE, cursor=cursor)
+    await callback_query.message.edit_text(text="Игры:", reply_markup=_get_games_page_keyboard(page, cursor=cursor))
     await callback_query.answer()
 
 
@@ -348,7 +370,10 @@ async def get_game_detail(callback_query: types.CallbackQuery, callback_data: Ga
     game = await get_uc.get_game(callback_data.game_id)
     text, _ = _get_game_text_and_keyboard(game=game)
     builder = InlineKeyboardBuilder()
-    builder.button(text="Назад", callback_data=GamesCurrentPageCallbackFactory(page=callback_data.page).pack())
+    builder.button(
+        text="Назад",
+        callback_data=_get_games_page_callback(_get_games_page_cursor(callback_data)).pack(),
+    )
     await callback_query.message.edit_text(text=text, reply_markup=builder.as_markup())
     await callback_query.answer()
 
@@ -367,14 +392,12 @@ async def create_game(message: types.Message):
 async def assign_player_to_seat(callback_query: types.CallbackQuery, callback_data: GameSeatPlayerRoleCallbackFactory):
     validate_admin(callback_query.from_user.id)
     uc: AssignPlayerToSeatUseCase = container.resolve(AssignPlayerToSeatUseCase)
-    await uc.assign_player_to_seat(
+    game = await uc.assign_player_to_seat(
         game_id=callback_data.game_id,
         seat_number=callback_data.seat_number,
         player_id=callback_data.player_id,
         role=callback_data.role,
     )
-    get_uc: GetGamesUseCase = container.resolve(GetGamesUseCase)
-    game = await get_uc.get_game(callback_data.game_id)
     text, kb = _get_game_text_and_keyboard(game=game)
     await callback_query.message.edit_text(
         text=text,
@@ -0,0 +1,126 @@
+from aiogram import F, Router, types
+from aiogram.types import CallbackQuery, InlineKeyboardButton, InlineKeyboardMarkup
+from aiogram.utils.keyboard import InlineKeyboardBuilder
+
+from bot.filters import LeaderboardPageCallbackFactory
+from bot.utils import get_role_emoji, get_team_emoji
+from config import get_settings
+from core import LeaderboardCategories, Roles, Teams
+from dependencies import container
+from usecases import GetLeaderboardUseCase
+from usecases.schemas import LeaderboardCursorSchema, LeaderboardPageSchema
+
+router = Router()
+LEADERS_PER_PAGE = 10
+
+
+def _get_category_title(category: LeaderboardCategories) -> str:
+    match category:
+        case LeaderboardCategories.OVERALL:
+            return "🏆 Общий"
+        case LeaderboardCategories.RED:
+            return f"{get_team_emoji(Teams.RED)} Красные"
+        case LeaderboardCategories.BLACK:
+            return f"{get_team_emoji(Teams.BLACK)} Черные"
+        case LeaderboardCategories.CIVILIAN:
+            return f"{get_role_emoji(Roles.CIVILIAN)} Мирные"
+        case LeaderboardCategories.MAFIA:
+            return f"{get_role_emoji(Roles.MAFIA)} Мафия"
+        case LeaderboardCategories.DON:
+            return f"{get_role_emoji(Roles.DON)} Дон"
+        case LeaderboardCategories.SHERIFF:
+            return f"{get_role_emoji(Roles.SHERIFF)} Шериф"
+        case _:
+            raise Exception(f"Unknown leaderboard category <{category}>")
+
+
+def _get_leaderboard_page_callback(
+    category: LeaderboardCategories,
+    cursor: LeaderboardCursorSchema | None,
+) -> LeaderboardPageCallbackFactory:
+    if cursor is None:
+        return LeaderboardPageCallbackFactory(category=category)
+    return LeaderboardPageCallbackFactory(
+        category=category,
+        cursor_win_rate=cursor.win_rate,
+        cursor_games_count=cursor.games_count,
+        cursor_player_id=cursor.player_id,
+        backward=cursor.backward,
+    )
+
+
+def _get_leaderboard_page_cursor(callback_data: LeaderboardPageCallbackFactory) -> LeaderboardCursorSchema | None:
+    if callback_data.cursor_win_rate is None or callback_data.cursor_player_id is None:
+        return None
+    return LeaderboardCursorSchema(
+        win_rate=callback_data.cursor_win_rate,
+        games_count=callback_data.cursor_games_count,
+        player_id=callback_data.cursor_player_id,
+        backward=callback_data.backward,
+    )
+
+
+def _get_leaderboard_text(page: LeaderboardPageSchema) -> str:
+    text = f"Лидеры: {_get_category_title(page.category)}\nНе меньше {page.min_games} игр\n\n"
+    if not page.entries:
+        return text + "Пока никто не сыграл столько игр."
+    return text + "\n".join(
+        f"{entry.nickname} — {entry.win_percent}% ({entry.won_games_count} / {entry.games_count})"
+        for entry in page.entries
+    )
+
+
+def _get_leaderboard_keyboard(page: LeaderboardPageSchema) -> InlineKeyboardMarkup:
+    builder = InlineKeyboardBuilder()
+    for category in LeaderboardCategories:
+        if category != page.category:
+            builder.button(
+                text=_get_category_title(category),
+                callback_data=_get_leaderboard_page_callback(category, cursor=None).pack(),
+            )
+    builder.adjust(3)
+    buttons = []
+    if page.previous_page is not None:
+        buttons.append(
+            InlineKeyboardButton(
+                text="⬅️",
+                callback_data=_get_leaderboard_page_callback(page.category, page.previous_page).pack(),
+            ),
+        )
+    if page.next_page is not None:
+        buttons.append(
+            InlineKeyboardButton(
+                text="➡️",
+                callback_data=_get_leaderboard_page_callback(page.category, page.next_page).pack(),
+            ),
+        )
+    if buttons:
+        builder.row(*buttons)
+    return builder.as_markup()
+
+
+@router.message(F.text.lower() == "лидеры")
+async def leaderboard(message: types.Message):
+    uc: GetLeaderboardUseCase = container.resolve(GetLeaderboardUseCase)
+    page = await uc.get_leaderboard_page(
+        category=LeaderboardCategories.OVERALL,
+        min_games=get_settings().LEADERBOARD_MIN_GAMES,
+        limit=LEADERS_PER_PAGE,
+    )
+    await message.answer(text=_get_leaderboard_text(page), reply_markup=_get_leaderboard_keyboard(page))
+
+
+@router.callback_query(LeaderboardPageCallbackFactory.filter())
+async def get_leaderboard_page(callback_query: CallbackQuery, callback_data: LeaderboardPageCallbackFactory):
+    uc: GetLeaderboardUseCase = container.resolve(GetLeaderboardUseCase)
+    page = await uc.get_leaderboard_page(
+        category=callback_data.category,
+        min_games=get_settings().LEADERBOARD_MIN_GAMES,
+        limit=LEADERS_PER_PAGE,
+        cursor=_get_leaderboard_page_cursor(callback_data),
+    )
+    await callback_query.message.edit_text(
+        text=_get_leaderboard_text(page),
+        reply_markup=_get_leaderboard_keyboard(page),
+    )
+    await callback_query.answer()
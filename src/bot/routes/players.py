@@ -1,7 +1,5 @@
-import asyncio
 import logging
 import math
-from contextlib import suppress
 from io import BytesIO
 
 from aiogram import F, Router, types
@@ -16,27 +14,40 @@ from bot.filters import (
     ClearStatePlayerDetailCallbackFactory,
     DeletePlayerCallbackFactory,
     PlayerCallbackFactory,
+    PlayerPairsCallbackFactory,
+    PlayerSeatsCallbackFactory,
     PlayersCurrentPageCallbackFactory,
     SetPlayerAvatarCallbackFactory,
     SetPlayerNicknameCallbackFactory,
 )
 from bot.states import CreatePlayerStates, UpdatePlayerStates
-from bot.utils import get_role_emoji, get_team_emoji
-from core import Roles, Teams
+from bot.utils import (
+    delete_message_later,
+    get_period_button_text,
+    get_period_text,
+    get_role_emoji,
+    get_seats_stats_text,
+    get_team_emoji,
+)
+from config import get_settings
+from core import Roles, StatsPeriods, Teams, get_current_period_bounds
 from dependencies import container
 from usecases import (
     CreatePlayerUseCase,
     DeletePlayerUseCase,
+    GetPlayerPairsUseCase,
     GetPlayerStatsUseCase,
     GetPlayersUseCase,
+    GetSeatsStatsUseCase,
     SetPlayerAvatarUseCase,
     SetPlayerNicknameUseCase,
 )
 from usecases.errors import ValidationError
-from usecases.schemas import CreatePlayerSchema, PlayerSchema, PlayerStatsSchema
+from usecases.schemas import CreatePlayerSchema, PlayerPairStatsSchema, PlayerSchema, PlayerStatsSchema
 
 router = Router()
 PLAYERS_PER_PAGE = 10
+PAIRS_PER_SECTION = 5
 
 
 def _get_players_builder(players: list[PlayerSchema], from_page: int) -> InlineKeyboardBuilder:
@@ -54,8 +65,19 @@ def _get_player_detail_keyboard(
         back_button_page: int,
         player_id: int,
         player_detail_message_id: int,
+        period: StatsPeriods = StatsPeriods.ALL_TIME,
 ) -> InlineKeyboardMarkup:
     builder = InlineKeyboardBuilder()
+    builder.row(
+        *[
+            InlineKeyboardButton(
+                text=get_period_button_text(p),
+                callback_data=PlayerCallbackFactory(player_id=player_id, page=back_button_page, period=p).pack(),
+            )
+            for p in StatsPeriods
+            if p != period
+        ]
+    )
     if is_admin(user_id=current_user_id):
         builder.row(
             InlineKeyboardButton(
@@ -84,6 +106,16 @@ def _get_player_detail_keyboard(
                 ).pack(),
             ),
         )
+    builder.row(
+        InlineKeyboardButton(
+            text="🤝 Партнеры и соперники",
+            callback_data=PlayerPairsCallbackFactory(player_id=player_id, page=back_button_page).pack(),
+        ),
+        InlineKeyboardButton(
+            text="🪑 Места",
+            callback_data=PlayerSeatsCallbackFactory(player_id=player_id, page=back_button_page).pack(),
+        ),
+    )
     builder.row(
         InlineKeyboardButton(
             text="Назад",
@@ -145,7 +177,7 @@ async def get_current_page_of_players(callback_query: CallbackQuery, callback_da
     await callback_query.answer()
 
 
-def _get_player_stats_text(player: PlayerStatsSchema) -> str:
+def _get_player_stats_text(player: PlayerStatsSchema, period_text: str = "За все время") -> str:
     games_count_total_text = f"{player.games_count_total}"
     win_percent_general_text = f"{player.win_percent_general}%" if player.win_percent_general is not None else "--"
     win_percent_black_team_text = (
@@ -176,6 +208,8 @@ def _get_player_stats_text(player: PlayerStatsSchema) -> str:
     return (
         f"*{player.nickname}*\n"
         f"{player.fio}\n\n"
+        f"Рейтинг: {round(player.rating)}\n\n"
+        f"_{period_text}_\n"
         f"Всего игр: {games_count_total_text}\n"
         f"Убит в первую ночь: {player.first_killed_count}\n"
         f"Общий процент побед: "
@@ -199,20 +233,81 @@ def _get_player_stats_text(player: PlayerStatsSchema) -> str:
 @router.callback_query(PlayerCallbackFactory.filter())
 async def player_detail(callback_query: CallbackQuery, callback_data: PlayerCallbackFactory):
     uc: GetPlayerStatsUseCase = container.resolve(GetPlayerStatsUseCase)
-    player_stats = await uc.get_player_stats(player_id=callback_data.player_id)
+    since, until = get_current_period_bounds(callback_data.period, get_settings().SEASON_START_MONTH)
+    player_stats = await uc.get_player_stats(player_id=callback_data.player_id, since=since, until=until)
     await callback_query.message.edit_text(
-        text=_get_player_stats_text(player_stats),
+        text=_get_player_stats_text(player_stats, period_text=get_period_text(since, until)),
         reply_markup=_get_player_detail_keyboard(
             current_user_id=callback_query.from_user.id,
             player_id=callback_data.player_id,
             back_button_page=callback_data.page,
             player_detail_message_id=callback_query.message.message_id,
+            period=callback_data.period,
         ),
         parse_mode=ParseMode.MARKDOWN,
     )
     await callback_query.answer()
 
 
+def _get_player_pairs_text(pairs: list[PlayerPairStatsSchema]) -> str:
+    if not pairs:
+        return "Игрок еще не сыграл ни одной игры."
+    partners = sorted(
+        (p for p in pairs if p.together_games_count),
+        key=lambda p: (p.together_games_count, p.together_won_games_count),
+        reverse=True,
+    )[:PAIRS_PER_SECTION]
+    rivals = sorted(
+        (p for p in pairs if p.against_games_count),
+        key=lambda p: (p.against_games_count, p.against_won_games_count),
+        reverse=True,
+    )[:PAIRS_PER_SECTION]
+    partners_text = "\n".join(
+        f"{p.nickname} — {p.together_win_percent}% ({p.together_won_games_count} / {p.together_games_count})"
+        for p in partners
+    )
+    rivals_text = "\n".join(
+        f"{p.nickname} — {p.against_win_percent}% ({p.against_won_games_count} / {p.against_games_count})"
+        for p in rivals
+    )
+    return f"Чаще всего в одной команде:\n{partners_text or '--'}\n\nЧаще всего против:\n{rivals_text or '--'}"
+
+
+def _get_back_to_player_detail_keyboard(player_id: int, page: int) -> InlineKeyboardMarkup:
+    return InlineKeyboardMarkup(
+        inline_keyboard=[
+            [
+                InlineKeyboardButton(
+                    text="Назад",
+                    callback_data=PlayerCallbackFactory(player_id=player_id, page=page).pack(),
+                )
+            ]
+        ]
+    )
+
+
+@router.callback_query(PlayerPairsCallbackFactory.filter())
+async def player_pairs(callback_query: CallbackQuery, callback_data: PlayerPairsCallbackFactory):
+    uc: GetPlayerPairsUseCase = container.resolve(GetPlayerPairsUseCase)
+    pairs = await uc.get_player_pairs(player_id=callback_data.player_id)
+    await callback_query.message.edit_text(
+        text=_get_player_pairs_text(pairs),
+        reply_markup=_get_back_to_player_detail_keyboard(callback_data.player_id, callback_data.page),
+    )
+    await callback_query.answer()
+
+
+@router.callback_query(PlayerSeatsCallbackFactory.filter())
+async def player_seats(callback_query: CallbackQuery, callback_data: PlayerSeatsCallbackFactory):
+    uc: GetSeatsStatsUseCase = container.resolve(GetSeatsStatsUseCase)
+    seats = await uc.get_seats_stats(player_id=callback_data.player_id)
+    await callback_query.message.edit_text(
+        text=f"Процент побед по местам:\n\n{get_seats_stats_text(seats)}",
+        reply_markup=_get_back_to_player_detail_keyboard(callback_data.player_id, callback_data.page),
+    )
+    await callback_query.answer()
+
+
 @router.callback_query(DeletePlayerCallbackFactory.filter())
 async def delete_player(callback_query: CallbackQuery, callback_data: DeletePlayerCallbackFactory):
     validate_admin(callback_query.from_user.id)
@@ -328,9 +423,7 @@ async def set_player_avatar(message: types.Message, state: FSMContext):
         ),
         parse_mode=ParseMode.MARKDOWN,
     )
-    await asyncio.sleep(3)
-    with suppress(Exception):
-        await answer.delete()
+    delete_message_later(answer, delay=3)
 
 @router.callback_query(ClearStatePlayerDetailCallbackFactory.filter())
 async def clear_state(
@@ -366,9 +459,7 @@ async def set_player_nickname(message: types.Message, state: FSMContext):
         ),
         parse_mode=ParseMode.MARKDOWN,
     )
-    await asyncio.sleep(3)
-    with suppress(Exception):
-        await answer.delete()
+    delete_message_later(answer, delay=3)
 
 
 @router.message(F.text.lower() == "создать игрока")
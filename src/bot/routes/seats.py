@@ -0,0 +1,14 @@
+from aiogram import F, Router, types
+
+from bot.utils import get_seats_stats_text
+from dependencies import container
+from usecases import GetSeatsStatsUseCase
+
+router = Router()
+
+
+@router.message(F.text.lower() == "места")
+async def seats_stats(message: types.Message):
+    uc: GetSeatsStatsUseCase = container.resolve(GetSeatsStatsUseCase)
+    seats = await uc.get_seats_stats()
+    await message.answer(text=f"Процент побед по местам во всех играх клуба:\n\n{get_seats_stats_text(seats)}")
@@ -1,4 +1,14 @@
+import asyncio
+import datetime
+from contextlib import suppress
+
+from aiogram.types import Message
+
 import core
+from repositories.db import without_unit_of_work
+from usecases.schemas import SeatStatsSchema
+
+_background_tasks: set[asyncio.Task] = set()
 
 
 def get_role_emoji(role: core.Roles) -> str:
@@ -36,3 +46,49 @@ def get_team_emoji_by_game_result(result: core.GameResults) -> str:
             return "⚪"
         case _:
             raise Exception(f"Unknown game result <{result}>")
+
+
+async def _delete_message_after(message: Message, delay: float) -> None:
+    await asyncio.sleep(delay)
+    with suppress(Exception):
+        await message.delete()
+
+
+def delete_message_later(message: Message, delay: float) -> None:
+    """Deletes the message in background, so the handler and its unit of work end without waiting"""
+    with without_unit_of_work():
+        task = asyncio.create_task(_delete_message_after(message, delay))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+def get_seats_stats_text(seats: list[SeatStatsSchema]) -> str:
+    """Win percent on every seat in total and by role, "--" if there were no games"""
+    lines = []
+    for seat in seats:
+        roles_text = "  ".join(
+            f"{get_role_emoji(r.role)} {r.win_percent if r.win_percent is not None else '--'}" for r in seat.roles
+        )
+        seat_percent_text = f"{seat.win_percent}%" if seat.win_percent is not None else "--"
+        lines.append(
+            f"{seat.number}. {seat_percent_text} ({seat.won_games_count} / {seat.games_count})\n    {roles_text}"
+        )
+    return "\n".join(lines)
+
+
+def get_period_button_text(period: core.StatsPeriods) -> str:
+    match period:
+        case core.StatsPeriods.ALL_TIME:
+            return "📊 За все время"
+        case core.StatsPeriods.SEASON:
+            return "🏆 За сезон"
+        case core.StatsPeriods.MONTH:
+            return "📅 За месяц"
+        case _:
+            raise Exception(f"Unknown stats period <{period}>")
+
+
+def get_period_text(since: datetime.datetime | None, until: datetime.datetime | None) -> str:
+    if since is None or until is None:
+        return "За все время"
+    return f"С {since:%d.%m.%Y} по {until - datetime.timedelta(days=1):%d.%m.%Y}"
@@ -1,22 +1,64 @@
-from pydantic_settings import BaseSettings
+from functools import cached_property, lru_cache
+from typing import Literal, Self
+
+from pydantic import Field, model_validator
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class DBConfig(BaseSettings):
-    DB_HOST: str
-    DB_NAME: str
-    DB_USER: str
-    DB_PASSWORD: str
-    DB_PORT: int
+    model_config = SettingsConfigDict(frozen=True)
+
+    DB_BACKEND: Literal["postgresql", "sqlite"] = "postgresql"
+    DB_HOST: str | None = None
+    DB_NAME: str | None = None
+    DB_USER: str | None = None
+    DB_PASSWORD: str | None = None
+    DB_PORT: int | None = None
+    DB_PATH: str = "mafia.sqlite3"  # database file for sqlite backend
+    DB_POOL_SIZE: int = 7
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30
+
+    @model_validator(mode="after")
+    def _validate_postgresql_settings(self) -> Self:
+        if self.DB_BACKEND == "postgresql":
+            required = ("DB_HOST", "DB_NAME", "DB_USER", "DB_PASSWORD", "DB_PORT")
+            missing = [name for name in required if getattr(self, name) is None]
+            if missing:
+                raise ValueError(f"{', '.join(missing)} must be set for postgresql backend")
+        return self
 
     @property
     def db_url(self) -> str:
+        if self.DB_BACKEND == "sqlite":
+            return f"sqlite+aiosqlite:///{self.DB_PATH}"
         return f"postgresql+asyncpg://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
 
 
 class Settings(BaseSettings):
-    db_config: DBConfig = DBConfig()
+    model_config = SettingsConfigDict(frozen=True)
+
+    db_config: DBConfig = Field(default_factory=DBConfig)
     TELEGRAM_BOT_TOKEN: str
-    ADMIN_ID: int
+    ADMIN_ID: int | None = None
+    ADMIN_IDS: frozenset[int] = frozenset()
+    LEADERBOARD_MIN_GAMES: int = 10  # players with fewer ended games are not ranked
+    SEASON_START_MONTH: int = Field(default=1, ge=1, le=12)  # stats seasons are years starting at this month
+    METRICS_TOKEN: str | None = None  # bearer token of API metrics, they are not served without it
 
-def get_settings():
+    @cached_property
+    def admin_ids(self) -> frozenset[int]:
+        if self.ADMIN_ID is None:
+            return self.ADMIN_IDS
+        return self.ADMIN_IDS | {self.ADMIN_ID}
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Settings are read from environment once per process, use reload_settings to read them again"""
     return Settings()
+
+
+def reload_settings() -> Settings:
+    get_settings.cache_clear()
+    return get_settings()
@@ -1,11 +1,17 @@
 from .games import (
+    BLACK_ROLES,
     MAX_PLAYERS,
     MIN_PLAYERS,
+    RED_ROLES,
     GameResults,
     GameStatuses,
+    LeaderboardCategories,
     Roles,
     RolesQuantity,
     Teams,
     get_result_text,
     get_win_result_by_player_role,
 )
+from .pairs import PairsStats
+from .periods import StatsPeriods, get_current_period_bounds, get_period_bounds
+from .ratings import INITIAL_RATING, RATING_K_FACTOR, rate_game, replay_games
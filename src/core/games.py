@@ -34,6 +34,20 @@ class Teams(StrEnum):
     BLACK = "black"
 
 
+class LeaderboardCategories(StrEnum):
+    OVERALL = "overall"
+    RED = Teams.RED.value
+    BLACK = Teams.BLACK.value
+    CIVILIAN = Roles.CIVILIAN.value
+    MAFIA = Roles.MAFIA.value
+    DON = Roles.DON.value
+    SHERIFF = Roles.SHERIFF.value
+
+
+RED_ROLES = (Roles.CIVILIAN, Roles.SHERIFF)
+BLACK_ROLES = (Roles.MAFIA, Roles.DON)
+
+
 def get_result_text(result: GameResults) -> str:
     match result:
         case GameResults.MAFIA_WON:
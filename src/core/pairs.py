@@ -0,0 +1,136 @@
+"""
+Statistics of players pairs: games played and won together in one team and against each other.
+
+Pairs are stored sparsely as sorted keys `player_id << PAIR_KEY_SHIFT | other_player_id` with a row of counters
+per key, both orders of every pair are stored. Counters of (player, other player) are
+- games played in one team and games won by that team
+- games played in different teams and games won by the player
+"""
+
+import numpy as np
+
+from .games import MAX_PLAYERS, RED_ROLES, GameResults, Roles
+
+PAIR_KEY_SHIFT = 32
+TOGETHER_GAMES, TOGETHER_WON, AGAINST_GAMES, AGAINST_WON = range(4)
+PAIR_COUNTERS = 4
+PAIRS_MERGE_SIZE = 50_000  # pairs rows of new games kept apart from the main arrays
+
+
+def _get_pairs_counters(
+    players_ids: np.ndarray,
+    other_players_ids: np.ndarray,
+    is_same_team: np.ndarray,
+    is_won: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """returns not aggregated keys and counters of pairs (player, other player), is_won is player's result"""
+    keys = players_ids.astype(np.int64) << PAIR_KEY_SHIFT | other_players_ids.astype(np.int64)
+    counters = np.zeros((len(keys), PAIR_COUNTERS), dtype=np.int64)
+    counters[:, TOGETHER_GAMES] = is_same_team
+    counters[:, TOGETHER_WON] = is_same_team & is_won
+    counters[:, AGAINST_GAMES] = ~is_same_team
+    counters[:, AGAINST_WON] = ~is_same_team & is_won
+    return keys, counters
+
+
+def aggregate_pairs(keys: np.ndarray, counters: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """sums counters of equal keys, returns sorted unique keys and their counters"""
+    order = np.argsort(keys)
+    keys, counters = keys[order], counters[order]
+    groups_starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1]))) if len(keys) else order
+    return keys[groups_starts], np.add.reduceat(counters, groups_starts) if len(keys) else counters
+
+
+def count_pairs_arrays(
+    games_ids: np.ndarray,
+    players_ids: np.ndarray,
+    is_red: np.ndarray,
+    is_won: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Arguments are arrays with a row per game participant, participants of one game are adjacent.
+    returns sorted unique pairs keys and their counters
+    """
+    # every pair of a game is a pair of rows at distance less than MAX_PLAYERS with the same game
+    keys, counters = [np.empty(0, dtype=np.int64)], [np.empty((0, PAIR_COUNTERS), dtype=np.int64)]
+    for distance in range(1, MAX_PLAYERS):
+        is_pair = games_ids[:-distance] == games_ids[distance:]
+        first = np.flatnonzero(is_pair)
+        second = first + distance
+        is_same_team = is_red[first] == is_red[second]
+        for player, other_player in ((first, second), (second, first)):
+            pair_keys, pair_counters = _get_pairs_counters(
+                players_ids[player], players_ids[other_player], is_same_team, is_won[player]
+            )
+            keys.append(pair_keys)
+            counters.append(pair_counters)
+    return aggregate_pairs(np.concatenate(keys), np.concatenate(counters))
+
+
+def count_pairs(participants: list[tuple[int, int, Roles, GameResults]]) -> tuple[np.ndarray, np.ndarray]:
+    """participants are (game_id, player_id, role, game result) rows, see `count_pairs_arrays`"""
+    games_ids, players_ids, roles, results = zip(*participants, strict=True) if participants else ((), (), (), ())
+    is_red = np.array([role in RED_ROLES for role in roles], dtype=bool)
+    is_civilians_won = np.array([result == GameResults.CIVILIANS_WON for result in results], dtype=bool)
+    is_mafia_won = np.array([result == GameResults.MAFIA_WON for result in results], dtype=bool)
+    return count_pairs_arrays(
+        np.array(games_ids, dtype=np.int64),
+        np.array(players_ids, dtype=np.int64),
+        is_red,
+        np.where(is_red, is_civilians_won, is_mafia_won),
+    )
+
+
+def get_player_pairs(keys: np.ndarray, counters: np.ndarray, player_id: int) -> tuple[np.ndarray, np.ndarray]:
+    """returns ids of players who played with the player and counters of these pairs"""
+    start, end = np.searchsorted(keys, [player_id << PAIR_KEY_SHIFT, (player_id + 1) << PAIR_KEY_SHIFT])
+    return keys[start:end] & ((1 << PAIR_KEY_SHIFT) - 1), counters[start:end]
+
+
+class PairsStats:
+    """
+    Pairs counters of ended games. Pairs of added games are kept in a small buffer
+    which is merged into the main arrays when it grows over merge_size rows.
+    """
+
+    def __init__(self, merge_size: int = PAIRS_MERGE_SIZE) -> None:
+        self._merge_size = merge_size
+        self.clear()
+
+    @property
+    def games_ids(self) -> set[int]:
+        return self._games_ids
+
+    def clear(self) -> None:
+        self._games_ids: set[int] = set()
+        self._keys, self._counters = count_pairs([])
+        self._new_keys, self._new_counters = count_pairs([])
+
+    def add_games(self, participants: list[tuple[int, int, Roles, GameResults]]) -> None:
+        """participants are (game_id, player_id, role, game result) rows, already added games are skipped"""
+        participants = [row for row in participants if row[0] not in self._games_ids]
+        self._games_ids.update(row[0] for row in participants)
+        keys, counters = count_pairs(participants)
+        if len(self._new_keys) + len(keys) < self._merge_size:
+            self._new_keys, self._new_counters = aggregate_pairs(
+                np.concatenate((self._new_keys, keys)), np.concatenate((self._new_counters, counters))
+            )
+        elif len(self._keys) + len(self._new_keys):
+            self._keys, self._counters = aggregate_pairs(
+                np.concatenate((self._keys, self._new_keys, keys)),
+                np.concatenate((self._counters, self._new_counters, counters)),
+            )
+            self._new_keys, self._new_counters = count_pairs([])
+        else:
+            self._keys, self._counters = keys, counters
+
+    def get_player_pairs(self, player_id: int) -> list[tuple[int, list[int]]]:
+        """returns (other player id, pair counters) of every player who played with the player"""
+        (keys, counters), (new_keys, new_counters) = (
+            get_player_pairs(self._keys, self._counters, player_id),
+            get_player_pairs(self._new_keys, self._new_counters, player_id),
+        )
+        other_players_ids, counters = aggregate_pairs(
+            np.concatenate((keys, new_keys)), np.concatenate((counters, new_counters))
+        )
+        return list(zip(other_players_ids.tolist(), counters.tolist(), strict=True))
@@ -0,0 +1,45 @@
+"""
+Time windows of statistics. Season is a year starting at the configured month,
+bounds are naive local datetimes like stored games times: since inclusive, until exclusive.
+"""
+
+import datetime
+from enum import StrEnum
+
+
+class StatsPeriods(StrEnum):
+    ALL_TIME = "all_time"
+    SEASON = "season"
+    MONTH = "month"
+
+
+def _add_months(date: datetime.datetime, months: int) -> datetime.datetime:
+    year, month = divmod(date.month - 1 + months, 12)
+    return date.replace(year=date.year + year, month=month + 1)
+
+
+def get_period_bounds(
+    period: StatsPeriods,
+    now: datetime.datetime,
+    season_start_month: int = 1,
+) -> tuple[datetime.datetime | None, datetime.datetime | None]:
+    """returns (since, until) of the period containing `now`, both are None for all time"""
+    month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    match period:
+        case StatsPeriods.ALL_TIME:
+            return None, None
+        case StatsPeriods.MONTH:
+            return month_start, _add_months(month_start, 1)
+        case StatsPeriods.SEASON:
+            season_start = _add_months(month_start, -((now.month - season_start_month) % 12))
+            return season_start, _add_months(season_start, 12)
+        case _:
+            raise Exception(f"Stats period <{period}> is invalid")
+
+
+def get_current_period_bounds(
+    period: StatsPeriods,
+    season_start_month: int,
+) -> tuple[datetime.datetime | None, datetime.datetime | None]:
+    """(since, until) of the period containing the current local time"""
+    return get_period_bounds(period, datetime.datetime.now(), season_start_month)
@@ -0,0 +1,167 @@
+"""
+Elo-style ratings of players.
+
+Team strength is the mean rating of its players weighted by role, expected score of red team is
+1 / (1 + 10 ** ((black - red) / 400)). After the game every player gets
+K * role weight * (actual team score - expected team score).
+"""
+
+import numpy as np
+
+from .games import MAX_PLAYERS, RED_ROLES, GameResults, Roles
+
+INITIAL_RATING = 1500.0
+RATING_K_FACTOR = 24.0
+ROLES_WEIGHTS = {
+    Roles.CIVILIAN: 1.0,
+    Roles.SHERIFF: 1.5,
+    Roles.MAFIA: 1.0,
+    Roles.DON: 1.5,
+}
+RED_TEAM_SCORES = {
+    GameResults.CIVILIANS_WON: 1.0,
+    GameResults.DRAW: 0.5,
+    GameResults.MAFIA_WON: 0.0,
+}
+ROLES_CODES = {role: code for code, role in enumerate(Roles)}
+NO_ROLE = -1  # code of empty seat
+
+_WEIGHTS_BY_CODE = np.array([ROLES_WEIGHTS[role] for role in Roles])
+_RED_CODES = np.array([ROLES_CODES[role] for role in RED_ROLES])
+
+
+def _get_games_weights(roles_codes: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    returns (games, MAX_PLAYERS) arrays of
+    - players role weights, negative for black team, zero for empty seats
+    - the same weights divided by team weights sum, so summing their products with ratings gives
+      difference between red and black teams ratings
+    """
+    is_taken = roles_codes != NO_ROLE
+    weights = np.where(is_taken, _WEIGHTS_BY_CODE[np.where(is_taken, roles_codes, 0)], 0.0)
+    signed_weights = np.where(np.isin(roles_codes, _RED_CODES), weights, -weights)
+    red_weights_sum = np.where(signed_weights > 0, signed_weights, 0).sum(axis=1, keepdims=True)
+    black_weights_sum = np.where(signed_weights < 0, -signed_weights, 0).sum(axis=1, keepdims=True)
+    team_weights_sum = np.where(signed_weights > 0, red_weights_sum, black_weights_sum)
+    return signed_weights, signed_weights / team_weights_sum
+
+
+def _get_ratings_deltas(
+    ratings: np.ndarray,
+    signed_weights: np.ndarray,
+    team_weights: np.ndarray,
+    red_team_scores: np.ndarray,
+    k_factor: float,
+) -> np.ndarray:
+    ratings_difference = (ratings * team_weights).sum(axis=1)
+    red_expected_score = 1 / (1 + 10 ** (-ratings_difference / 400))
+    return k_factor * signed_weights * (red_team_scores - red_expected_score)[:, np.newaxis]
+
+
+def get_ratings_deltas(
+    ratings: np.ndarray,
+    roles_codes: np.ndarray,
+    red_team_scores: np.ndarray,
+    k_factor: float = RATING_K_FACTOR,
+) -> np.ndarray:
+    """
+    ratings and roles_codes are (games, MAX_PLAYERS) arrays of players ratings before games and their roles,
+    red_team_scores is (games,) array of red team results: 1 won, 0.5 draw, 0 lost.
+    returns (games, MAX_PLAYERS) array of ratings changes, zero for empty seats
+    """
+    signed_weights, team_weights = _get_games_weights(roles_codes)
+    return _get_ratings_deltas(ratings, signed_weights, team_weights, red_team_scores, k_factor)
+
+
+def rate_game(
+    ratings: list[float],
+    roles: list[Roles],
+    result: GameResults,
+    k_factor: float = RATING_K_FACTOR,
+) -> list[float]:
+    """returns ratings of game players after the game"""
+    deltas = get_ratings_deltas(
+        np.array([ratings]),
+        np.array([[ROLES_CODES[role] for role in roles]]),
+        np.array([RED_TEAM_SCORES[result]]),
+        k_factor=k_factor,
+    )
+    return (np.array(ratings) + deltas[0]).tolist()
+
+
+def replay_games_arrays(
+    games_ids: np.ndarray,
+    players_ids: np.ndarray,
+    roles_codes: np.ndarray,
+    red_team_scores: np.ndarray,
+    k_factor: float = RATING_K_FACTOR,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Rates all games from the initial ratings.
+    Arguments are arrays with a row per game participant, participants of one game are adjacent
+    and games are in chronological order.
+    returns arrays of players ids, their ratings and rated games counts
+    """
+    unique_players_ids, players_indexes = np.unique(players_ids, return_inverse=True)
+    ratings = np.full(len(unique_players_ids), INITIAL_RATING)
+    if not len(games_ids):
+        return unique_players_ids, ratings, np.zeros(len(unique_players_ids), dtype=int)
+
+    # participants rows are spread to (games, MAX_PLAYERS) matrices
+    is_game_start = np.concatenate(([True], games_ids[1:] != games_ids[:-1]))
+    game_number = np.cumsum(is_game_start) - 1
+    games_starts = np.flatnonzero(is_game_start)
+    seat = np.arange(len(games_ids)) - games_starts[game_number]
+    games_players = np.full((len(games_starts), MAX_PLAYERS), -1)
+    games_players[game_number, seat] = players_indexes
+    games_roles = np.full((len(games_starts), MAX_PLAYERS), NO_ROLE)
+    games_roles[game_number, seat] = roles_codes
+    games_signed_weights, games_team_weights = _get_games_weights(games_roles)
+    games_red_team_scores = red_team_scores[games_starts]
+
+    # Game depends only on previous games of its players, so games without common players are rated
+    # together. Every game goes to the wave after the last wave of its players.
+    players_last_wave = [-1] * len(unique_players_ids)
+    games_waves = []
+    for game_players in games_players.tolist():
+        wave = max(players_last_wave[p] for p in game_players if p >= 0) + 1
+        for p in game_players:
+            if p >= 0:
+                players_last_wave[p] = wave
+        games_waves.append(wave)
+    games_order = np.argsort(games_waves, kind="stable")
+    waves_starts = np.flatnonzero(np.diff(np.asarray(games_waves)[games_order])) + 1
+
+    # empty seats point to extra rating, its weight is zero
+    games_players[games_players < 0] = len(unique_players_ids)
+    ratings = np.append(ratings, 0.0)
+    for wave_games in np.split(games_order, waves_starts):
+        wave_players = games_players[wave_games]
+        ratings[wave_players] += _get_ratings_deltas(
+            ratings[wave_players],
+            games_signed_weights[wave_games],
+            games_team_weights[wave_games],
+            games_red_team_scores[wave_games],
+            k_factor,
+        )
+    ratings = ratings[:-1]
+    return unique_players_ids, ratings, np.bincount(players_indexes, minlength=len(unique_players_ids))
+
+
+def replay_games(
+    participants: list[tuple[int, int, Roles, GameResults]],
+    k_factor: float = RATING_K_FACTOR,
+) -> list[tuple[int, float, int]]:
+    """
+    participants are (game_id, player_id, role, game result) rows, see `replay_games_arrays`.
+    returns (player_id, rating, rated games count) of every player
+    """
+    games_ids, players_ids, roles, results = zip(*participants, strict=True) if participants else ((), (), (), ())
+    players_ids, ratings, games_counts = replay_games_arrays(
+        np.array(games_ids, dtype=int),
+        np.array(players_ids, dtype=int),
+        np.array([ROLES_CODES[role] for role in roles], dtype=int),
+        np.array([RED_TEAM_SCORES[result] for result in results], dtype=float),
+        k_factor=k_factor,
+    )
+    return list(zip(players_ids.tolist(), ratings.tolist(), games_counts.tolist(), strict=True))
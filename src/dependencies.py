@@ -1,9 +1,9 @@
 from punq import Container
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
 from config import DBConfig
 from repositories.avatars import AvatarsRepository
 from repositories.db import DBRepository
+from repositories.db.engine import create_engine, create_session_factory
 from usecases import (
     AddToBestMoveUseCase,
     AssignAsFirstKilledUseCase,
@@ -13,9 +13,15 @@ from usecases import (
     DeletePlayerUseCase,
     EndGameUseCase,
     GetGamesUseCase,
+    GetLeaderboardUseCase,
+    GetPlayerPairsUseCase,
     GetPlayerStatsUseCase,
     GetPlayersUseCase,
     GetSeatUseCase,
+    GetSeatsStatsUseCase,
+    HistoryTransferUseCase,
+    PlayerStatsProjectionUseCase,
+    RatingsUseCase,
     SetPlayerAvatarUseCase,
     SetPlayerNicknameUseCase,
     UsersUseCase,
@@ -24,32 +30,29 @@ from usecases.interfaces import AvatarsRepositoryInterface, DBRepositoryInterfac
 
 container = Container()
 
-def get_db_session_factory(config: DBConfig = DBConfig()):
-    engine = create_async_engine(
-        config.db_url,
-        echo=False,
-        pool_size=7,
-        max_overflow=20,
-        pool_pre_ping=True,
-    )
+db_engine = create_engine(DBConfig())
+db_session_factory = create_session_factory(db_engine)
 
-    return async_sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-
-container.register(DBRepositoryInterface, factory=DBRepository, session_factory=get_db_session_factory())
-container.register(DBRepository, factory=DBRepository, session_factory=get_db_session_factory())
+container.register(DBRepositoryInterface, factory=DBRepository, session_factory=db_session_factory)
+container.register(DBRepository, factory=DBRepository, session_factory=db_session_factory)
 container.register(AvatarsRepositoryInterface, factory=AvatarsRepository)
 container.register(CreatePlayerUseCase)
 container.register(GetPlayersUseCase)
 container.register(CreateGameUseCase)
 container.register(GetGamesUseCase)
+container.register(GetLeaderboardUseCase)
+container.register(GetPlayerPairsUseCase)
 container.register(EndGameUseCase)
 container.register(AssignPlayerToSeatUseCase)
 container.register(GetPlayerStatsUseCase)
 container.register(GetSeatUseCase)
+container.register(GetSeatsStatsUseCase)
 container.register(UsersUseCase)
 container.register(AssignAsFirstKilledUseCase)
 container.register(AddToBestMoveUseCase)
 container.register(DeletePlayerUseCase)
 container.register(SetPlayerNicknameUseCase)
 container.register(SetPlayerAvatarUseCase)
+container.register(PlayerStatsProjectionUseCase)
+container.register(RatingsUseCase)
+container.register(HistoryTransferUseCase)
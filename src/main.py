@@ -7,9 +7,11 @@ from aiogram.types import Message
 
 from bot.auth import validate_admin
 from bot.keyboards import admin_kb, user_kb
-from bot.middleware import SaveUserMiddleware
-from bot.routes import games_router, players_router
+from bot.middleware import CommitUnitOfWorkRequestMiddleware, SaveUserMiddleware, UnitOfWorkMiddleware
+from bot.routes import games_router, leaderboard_router, players_router, seats_router
 from config import get_settings
+from dependencies import db_engine, db_session_factory
+from repositories.db.engine import create_schema, get_pool_metrics
 from usecases.errors import ForbiddenError
 
 logging.basicConfig(level=logging.INFO)
@@ -32,11 +34,31 @@ async def cmd_start(message: Message):
             reply_markup=user_kb,
         )
 
+
+@dp.message(Command("db_pool"))
+async def cmd_db_pool(message: Message):
+    validate_admin(message.from_user.id)
+    metrics = get_pool_metrics(db_engine)
+    await message.answer(
+        text=(
+            f"Соединения: {metrics.checked_out} занято, {metrics.checked_in} свободно, "
+            f"{metrics.overflow} сверх пула (максимум {metrics.max_connections})\n"
+            f"Ожидание соединения: среднее {metrics.checkout_wait_avg * 1000:.1f} мс, "
+            f"максимальное {metrics.checkout_wait_max * 1000:.1f} мс\n"
+            f"Выдано соединений: {metrics.checkouts_count}, таймаутов: {metrics.checkout_timeouts_count}"
+        ),
+    )
+
 async def main():
     await bot.delete_webhook(drop_pending_updates=True)
-    dp.message.middleware(SaveUserMiddleware())
-    dp.callback_query.middleware(SaveUserMiddleware())
-    dp.include_routers(games_router, players_router)
+    await create_schema(db_engine)
+    save_user_middleware = SaveUserMiddleware()
+    await save_user_middleware.load_known_users()
+    dp.update.middleware(UnitOfWorkMiddleware(db_session_factory))
+    bot.session.middleware(CommitUnitOfWorkRequestMiddleware())
+    dp.message.middleware(save_user_middleware)
+    dp.callback_query.middleware(save_user_middleware)
+    dp.include_routers(games_router, players_router, leaderboard_router, seats_router)
     await dp.start_polling(bot)
 
 
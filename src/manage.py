@@ -0,0 +1,119 @@
+import argparse
+import asyncio
+import logging
+import sys
+from contextlib import AsyncExitStack
+from pathlib import Path
+
+import aiofiles
+
+import core
+from dependencies import container
+from usecases import HistoryTransferUseCase, PlayerStatsProjectionUseCase, RatingsUseCase
+from usecases.errors import ValidationError
+from usecases.history_transfer import IMPORT_BATCH_SIZE
+
+logging.basicConfig(level=logging.INFO)
+HISTORY_FILES = ("players.csv", "games.csv", "participants.csv")
+
+
+async def rebuild_player_stats(_: argparse.Namespace) -> int:
+    uc: PlayerStatsProjectionUseCase = container.resolve(PlayerStatsProjectionUseCase)
+    await uc.rebuild()
+    logging.info("Player stats and leaderboard rebuilt")
+    return 0
+
+
+async def check_player_stats(_: argparse.Namespace) -> int:
+    uc: PlayerStatsProjectionUseCase = container.resolve(PlayerStatsProjectionUseCase)
+    players_ids = await uc.get_inconsistent_players_ids()
+    if players_ids:
+        logging.error("Player stats are inconsistent for players %s", players_ids)
+        return 1
+    logging.info("Player stats are consistent")
+    return 0
+
+
+async def rebuild_ratings(args: argparse.Namespace) -> int:
+    uc: RatingsUseCase = container.resolve(RatingsUseCase)
+    players_count = await uc.recompute(k_factor=args.k_factor)
+    logging.info("Ratings of %s players rebuilt with K-factor %s", players_count, args.k_factor)
+    return 0
+
+
+async def export_history(args: argparse.Namespace) -> int:
+    uc: HistoryTransferUseCase = container.resolve(HistoryTransferUseCase)
+    args.directory.mkdir(parents=True, exist_ok=True)
+    async with AsyncExitStack() as stack:
+        files = [await stack.enter_async_context(aiofiles.open(args.directory / name, "wb")) for name in HISTORY_FILES]
+        try:
+            await uc.export_history(*(f.write for f in files))
+        except ValidationError as e:
+            logging.error("History is not exported: %s", e)
+            return 1
+    logging.info("History exported to %s", args.directory)
+    return 0
+
+
+async def import_history(args: argparse.Namespace) -> int:
+    uc: HistoryTransferUseCase = container.resolve(HistoryTransferUseCase)
+    with (
+        open(args.directory / HISTORY_FILES[0], newline="") as players,  # noqa: ASYNC230 files are read line by line
+        open(args.directory / HISTORY_FILES[1], newline="") as games,  # noqa: ASYNC230
+        open(args.directory / HISTORY_FILES[2], newline="") as participants,  # noqa: ASYNC230
+    ):
+        try:
+            players_count, games_count = await uc.import_history(players, games, participants, args.batch_size)
+        except ValidationError as e:
+            logging.error("Import stopped, batches before the invalid one are imported: %s", e)
+            return 1
+    logging.info("Imported %s players and %s games", players_count, games_count)
+    return 0
+
+
+def get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Mafia Helper maintenance commands")
+    commands = parser.add_subparsers(required=True)
+    commands.add_parser(
+        "rebuild-player-stats",
+        help="recompute stored player stats and leaderboard from games history",
+    ).set_defaults(handler=rebuild_player_stats)
+    commands.add_parser(
+        "check-player-stats",
+        help="compare stored player stats with games history",
+    ).set_defaults(handler=check_player_stats)
+    rebuild_ratings_parser = commands.add_parser(
+        "rebuild-ratings",
+        help="replay all ended games and replace stored player ratings",
+    )
+    rebuild_ratings_parser.add_argument(
+        "--k-factor",
+        type=float,
+        default=core.RATING_K_FACTOR,
+        help=f"maximum rating change per game for role weight 1 (default: {core.RATING_K_FACTOR})",
+    )
+    rebuild_ratings_parser.set_defaults(handler=rebuild_ratings)
+    export_history_parser = commands.add_parser(
+        "export-history",
+        help=f"write players, ended games and their participants to {', '.join(HISTORY_FILES)} in directory",
+    )
+    export_history_parser.add_argument("directory", type=Path)
+    export_history_parser.set_defaults(handler=export_history)
+    import_history_parser = commands.add_parser(
+        "import-history",
+        help="import players and ended games exported by export-history, their ids must not be taken",
+    )
+    import_history_parser.add_argument("directory", type=Path)
+    import_history_parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=IMPORT_BATCH_SIZE,
+        help=f"rows imported in one transaction (default: {IMPORT_BATCH_SIZE})",
+    )
+    import_history_parser.set_defaults(handler=import_history)
+    return parser
+
+
+if __name__ == "__main__":
+    args = get_parser().parse_args()
+    sys.exit(asyncio.run(args.handler(args)))
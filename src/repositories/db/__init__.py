@@ -1 +1,2 @@
 from .db_repository import DBRepository
+from .unit_of_work import UnitOfWork, get_current_unit_of_work, without_unit_of_work
@@ -0,0 +1,106 @@
+import time
+from collections import OrderedDict
+
+from core import GameStatuses
+from usecases.schemas import GameSchema
+
+# Bot and API are separate processes, the API learns about changes made by the bot from notifications.
+# TTL bounds how long it can serve a stale game when notifications are not available.
+DRAFT_GAME_CACHE_TTL = 1.0
+GAMES_CACHE_SIZE = 512
+
+
+class DraftGameCache:
+    """Last game in draft shared by all repositories of the process"""
+
+    def __init__(self, ttl: float) -> None:
+        self._ttl = ttl
+        self._game: GameSchema | None = None
+        self._expires_at = 0.0
+
+    def get(self) -> tuple[bool, GameSchema | None]:
+        """returns (is cached, game)"""
+        if time.monotonic() >= self._expires_at:
+            return False, None
+        return True, self._game
+
+    def set(self, game: GameSchema | None) -> None:
+        self._game = game
+        self._expires_at = time.monotonic() + self._ttl
+
+    def invalidate(self) -> None:
+        self._game = None
+        self._expires_at = 0.0
+
+
+class GamesCache:
+    """
+    Formatted games by id with LRU eviction.
+    Ended games never change, other games are valid only while their version in database is the same.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self._maxsize = maxsize
+        self._games: OrderedDict[int, GameSchema] = OrderedDict()
+
+    def get(self, game_id: int) -> GameSchema | None:
+        game = self._games.get(game_id)
+        if game is not None:
+            self._games.move_to_end(game_id)
+        return game
+
+    def set(self, game: GameSchema) -> None:
+        self._games[game.id] = game
+        self._games.move_to_end(game.id)
+        if len(self._games) > self._maxsize:
+            self._games.popitem(last=False)
+
+    def invalidate(self, game_id: int) -> None:
+        self._games.pop(game_id, None)
+
+    def clear(self) -> None:
+        self._games.clear()
+
+    @staticmethod
+    def is_immutable(game: GameSchema) -> bool:
+        return game.status == GameStatuses.ENDED
+
+
+class ChangedCaches:
+    """
+    Cached data changed in a transaction. Caches are invalidated right after the change
+    and once more when transaction ends, so games read inside the transaction are not served after it
+    """
+
+    def __init__(self) -> None:
+        self.draft_game = False
+        self.games_ids: set[int] = set()
+        self.all_games = False
+
+    def game_changed(self, game_id: int) -> None:
+        self.draft_game = True
+        self.games_ids.add(game_id)
+        self.invalidate()
+
+    def players_changed(self) -> None:
+        """Players are shown in games, so all games are changed"""
+        self.draft_game = True
+        self.all_games = True
+        self.invalidate()
+
+    def merge(self, other: "ChangedCaches") -> None:
+        self.draft_game |= other.draft_game
+        self.games_ids |= other.games_ids
+        self.all_games |= other.all_games
+
+    def invalidate(self) -> None:
+        if self.draft_game:
+            draft_game_cache.invalidate()
+        if self.all_games:
+            games_cache.clear()
+        for game_id in self.games_ids:
+            games_cache.invalidate(game_id)
+
+
+draft_game_cache = DraftGameCache(ttl=DRAFT_GAME_CACHE_TTL)
+games_cache = GamesCache(maxsize=GAMES_CACHE_SIZE)
@@ -1,27 +1,96 @@
+import datetime
+import operator
+from collections.abc import AsyncIterator, Callable
+from functools import reduce
 from typing import Self
 
+import asyncpg
 import pytz
-from sqlalchemy import Row, and_, case, delete, desc, func, or_, select, update
-from sqlalchemy.ext.asyncio import async_sessionmaker
-from sqlalchemy.orm import joinedload
+from sqlalchemy import (
+    ColumnElement,
+    CompoundSelect,
+    Float,
+    Row,
+    ScalarSelect,
+    Select,
+    and_,
+    case,
+    cast,
+    delete,
+    desc,
+    exists,
+    false,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    tuple_,
+    union_all,
+    update,
+)
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+from sqlalchemy.orm import aliased, joinedload, selectinload
 
 import core
-from core import GameResults, GameStatuses, Roles
-from usecases.errors import NotFoundError
-from usecases.interfaces import DBRepositoryInterface
+from core import GameResults, GameStatuses, LeaderboardCategories, Roles
+from usecases.errors import NotFoundError, ValidationError
+from usecases.interfaces import (
+    GAMES_CSV_COLUMNS,
+    PARTICIPANTS_CSV_COLUMNS,
+    PLAYERS_CSV_COLUMNS,
+    DBRepositoryInterface,
+    GamesFetchStrategy,
+    HistoryOutput,
+)
 from usecases.schemas import (
     CreateGameSchema,
     CreatePlayerSchema,
     GameSchema,
+    GameSummarySchema,
+    GameVersionSchema,
+    GamesCursorSchema,
+    LeaderboardCursorSchema,
+    LeaderboardEntrySchema,
     PlayerInGameSchema,
+    PlayerRatingSchema,
     PlayerSchema,
+    PlayerStatsCountersSchema,
     RawGameSchema,
+    SeatRoleStatsSchema,
     UpdateGameSchema,
     UpdatePlayerSchema,
     UserSchema,
 )
 
-from .models import Game, Player, PlayerGame, User
+from .cache import ChangedCaches, draft_game_cache, games_cache
+from .dialects import POSTGRESQL, json_objects_agg, supports_modifying_cte, upsert
+from .models import Game, LeaderboardEntry, Player, PlayerGame, PlayerRating, PlayerStats, User
+from .notifications import notify_changes
+from .unit_of_work import get_current_unit_of_work
+
+MOSCOW_TZ = pytz.timezone("Europe/Moscow")
+# Suffixes of PlayerStats counters summed up for leaderboard category
+LEADERBOARD_COUNTERS = {
+    LeaderboardCategories.OVERALL: ("total",),
+    LeaderboardCategories.RED: tuple(f"as_{role.value}" for role in core.RED_ROLES),
+    LeaderboardCategories.BLACK: tuple(f"as_{role.value}" for role in core.BLACK_ROLES),
+    **{LeaderboardCategories(role.value): (f"as_{role.value}",) for role in Roles},
+}
+# Roles of participants counted in leaderboard category
+LEADERBOARD_ROLES = {
+    LeaderboardCategories.OVERALL: tuple(Roles),
+    LeaderboardCategories.RED: core.RED_ROLES,
+    LeaderboardCategories.BLACK: core.BLACK_ROLES,
+    **{LeaderboardCategories(role.value): (role,) for role in Roles},
+}
+# Rows fetched from server-side cursor at once by streaming methods
+STREAM_BATCH_SIZE = 500
+# Whether participant won the game, for queries joining PlayerGame and Game
+IS_WON = or_(
+    and_(PlayerGame.role.in_(core.RED_ROLES), Game.result == GameResults.CIVILIANS_WON),
+    and_(PlayerGame.role.in_(core.BLACK_ROLES), Game.result == GameResults.MAFIA_WON),
+)
 
 
 class DBRepository(DBRepositoryInterface):
@@ -29,17 +98,47 @@ class DBRepository(DBRepositoryInterface):
         self._session_maker = session_factory
 
     async def __aenter__(self) -> Self:
-        self._session = self._session_maker()
+        self._unit_of_work = get_current_unit_of_work()
+        if self._unit_of_work is None:
+            self._session = self._session_maker()
+        else:
+            self._session = self._unit_of_work.session
+        self._dialect = self._session.bind.dialect.name
+        self._changed_caches = ChangedCaches()
+        self._commit_callbacks: list[Callable[[], None]] = []
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        if self._unit_of_work is not None:
+            if exc_type is None:
+                await self._session.flush()
+            self._session.expire_all()
+            self._unit_of_work.changed_caches.merge(self._changed_caches)
+            return
         try:
+            if exc_type is None:
+                await notify_changes(self._session, self._changed_caches)
             await self._session.commit()
         except Exception as e:
             await self._session.rollback()
             raise e
         finally:
             await self._session.close()
+        self._changed_caches.invalidate()
+        if exc_type is None:
+            for callback in self._commit_callbacks:
+                callback()
+
+    def on_commit(self, callback: Callable[[], None]) -> None:
+        if self._unit_of_work is not None:
+            self._unit_of_work.on_commit(callback)
+        else:
+            self._commit_callbacks.append(callback)
+
+    async def _bump_game_version(self, game_id: int) -> None:
+        """Must be called by every method changing the game or its participants"""
+        self._changed_caches.game_changed(game_id)
+        await self._session.execute(update(Game).where(Game.id == game_id).values(version=Game.version + 1))
 
     async def create_player(self, player: CreatePlayerSchema) -> None:
         new_user = Player(fio=player.fio, nickname=player.nickname)
@@ -50,17 +149,40 @@ class DBRepository(DBRepositoryInterface):
         self._session.add(User(**user.model_dump()))
         await self._session.flush()
 
+    async def create_user_if_not_exists(self, user: UserSchema) -> bool:
+        query = (
+            upsert(self._dialect, User)
+            .values(**user.model_dump())
+            .on_conflict_do_nothing(index_elements=[User.telegram_id])
+            .returning(User.telegram_id)
+        )
+        return await self._session.scalar(query) is not None
+
+    async def _bump_player_games_versions(self, player_id: int) -> None:
+        """Players are shown in games, so games of the changed player are changed too"""
+        await self._session.execute(
+            update(Game)
+            .where(Game.id.in_(select(PlayerGame.game_id).where(PlayerGame.player_id == player_id)))
+            .values(version=Game.version + 1)
+        )
+
     async def delete_player(self, player_id: int) -> None:
+        self._changed_caches.players_changed()
         player = await self._session.get(Player, player_id)
         if not player:
             raise NotFoundError(f"Player id={player_id} not found")
+        await self._bump_player_games_versions(player_id)
         await self._session.delete(player)
 
     async def update_player(self, player_id: int, data: UpdatePlayerSchema) -> None:
+        self._changed_caches.players_changed()
         player = await self._session.get(Player, player_id)
         if not player:
             raise NotFoundError(f"Player id={player_id} not found")
-        for key, value in data.model_dump(exclude_unset=True).items():
+        changes = data.model_dump(exclude_unset=True)
+        if changes:
+            await self._bump_player_games_versions(player_id)
+        for key, value in changes.items():
             setattr(player, key, value)
         await self._session.flush()
 
@@ -105,9 +227,14 @@ class DBRepository(DBRepositoryInterface):
             raise NotFoundError(f"User id={player_id} not found")
         return PlayerSchema.model_validate(user, from_attributes=True)
 
+    async def get_players_by_ids(self, players_ids: list[int]) -> list[PlayerSchema]:
+        query = select(Player).where(Player.id.in_(players_ids))
+        return [PlayerSchema.model_validate(p, from_attributes=True) for p in await self._session.scalars(query)]
+
     @staticmethod
     def _format_player_by_player_game(p: PlayerGame) -> PlayerInGameSchema:
-        return PlayerInGameSchema(
+        """Row values are already checked by database constraints, so schema is built without validation"""
+        return PlayerInGameSchema.model_construct(
             id=p.player.id,
             fio=p.player.fio,
             nickname=p.player.nickname,
@@ -118,24 +245,509 @@ class DBRepository(DBRepositoryInterface):
 
     @classmethod
     def _format_game(cls, game: Game) -> GameSchema:
-        first_killed = next(filter(lambda p: p.is_first_killed, game.players), None)
-        return GameSchema(
+        """Every participant is formatted once and the same instance is shared by players, best move and first killed"""
+        participants = [(p, cls._format_player_by_player_game(p)) for p in game.players]
+        return GameSchema.model_construct(
             id=game.id,
             comments=game.comments,
             result=GameResults(game.result) if game.result else None,
             status=GameStatuses(game.status),
-            players={cls._format_player_by_player_game(p) for p in game.players},
-            created_at=game.created_at.replace(tzinfo=pytz.timezone("Europe/Moscow")),
-            best_move={cls._format_player_by_player_game(p) for p in game.players if p.in_best_move} or None,
-            first_killed=cls._format_player_by_player_game(first_killed) if first_killed else None,
+            players={player for _, player in participants},
+            created_at=cls._from_stored_time(game.created_at),
+            version=game.version,
+            best_move={player for p, player in participants if p.in_best_move} or None,
+            first_killed=next((player for p, player in participants if p.is_first_killed), None),
+        )
+
+    @staticmethod
+    def _player_stats_counters_query(*where: ColumnElement[bool]) -> Select:
+        """Counters of ended games grouped by player. `where` filters PlayerGame/Game rows"""
+        participant = aliased(PlayerGame)
+        best_move = (
+            select(
+                participant.game_id,
+                func.count().filter(participant.in_best_move).label("best_move_size"),
+                func.count()
+                .filter(and_(participant.in_best_move, participant.role.in_(core.BLACK_ROLES)))
+                .label("black_in_best_move"),
+            )
+            .where(
+                participant.game_id.in_(
+                    select(PlayerGame.game_id)
+                    .join(Game, PlayerGame.game_id == Game.id)
+                    .where(PlayerGame.is_first_killed, Game.status == GameStatuses.ENDED, *where)
+                )
+            )
+            .group_by(participant.game_id)
+            .subquery()
+        )
+        is_first_killed = and_(PlayerGame.is_first_killed, PlayerGame.role.in_(core.RED_ROLES))
+        has_best_move = and_(is_first_killed, best_move.c.best_move_size > 0)
+        return (
+            select(
+                PlayerGame.player_id,
+                func.count().label("games_count_total"),
+                func.count().filter(IS_WON).label("won_games_count_total"),
+                *[func.count().filter(PlayerGame.role == role).label(f"games_count_as_{role.value}") for role in Roles],
+                *[
+                    func.count().filter(and_(PlayerGame.role == role, IS_WON)).label(f"won_games_count_as_{role.value}")
+                    for role in Roles
+                ],
+                func.count().filter(is_first_killed).label("first_killed_count"),
+                func.count().filter(has_best_move).label("best_move_count_total"),
+                *[
+                    func.count()
+                    .filter(and_(has_best_move, best_move.c.black_in_best_move == black_count))
+                    .label(f"{prefix}_mafia_best_move_count")
+                    for black_count, prefix in enumerate(("zero", "one", "two", "three"))
+                ],
+            )
+            .select_from(PlayerGame)
+            .join(Game, PlayerGame.game_id == Game.id)
+            .outerjoin(best_move, best_move.c.game_id == PlayerGame.game_id)
+            .where(Game.status == GameStatuses.ENDED, *where)
+            .group_by(PlayerGame.player_id)
+        )
+
+    @classmethod
+    def _created_at_where(
+        cls,
+        since: datetime.datetime | None,
+        until: datetime.datetime | None,
+    ) -> list[ColumnElement[bool]]:
+        """Filters of games created in [since, until)"""
+        where = []
+        if since is not None:
+            where.append(Game.created_at >= cls._to_stored_time(since))
+        if until is not None:
+            where.append(Game.created_at < cls._to_stored_time(until))
+        return where
+
+    @staticmethod
+    def _to_stored_time(value: datetime.datetime) -> datetime.datetime:
+        """Games are stored with naive moscow time, naive values are considered to be in it already"""
+        return value.astimezone(MOSCOW_TZ).replace(tzinfo=None) if value.tzinfo is not None else value
+
+    @staticmethod
+    def _from_stored_time(value: datetime.datetime) -> datetime.datetime:
+        # pytz timezone passed as tzinfo has local mean time offset +02:30, localize picks the actual one
+        return MOSCOW_TZ.localize(value)
+
+    async def get_player_stats_counters(
+        self,
+        player_id: int,
+        since: datetime.datetime | None = None,
+        until: datetime.datetime | None = None,
+    ) -> PlayerStatsCountersSchema:
+        if since is None and until is None:
+            stats = await self._session.get(PlayerStats, player_id)
+        else:
+            # Stored counters are all-time, counters of the period are computed from its games
+            query = self._player_stats_counters_query(
+                PlayerGame.player_id == player_id, *self._created_at_where(since, until)
+            )
+            stats = (await self._session.execute(query)).one_or_none()
+        if not stats:
+            return PlayerStatsCountersSchema.model_validate(PlayerStats.empty(player_id), from_attributes=True)
+        return PlayerStatsCountersSchema.model_validate(stats, from_attributes=True)
+
+    async def get_seats_stats(
+        self,
+        player_id: int | None = None,
+        since: datetime.datetime | None = None,
+        until: datetime.datetime | None = None,
+    ) -> list[SeatRoleStatsSchema]:
+        query = (
+            select(
+                PlayerGame.number,
+                PlayerGame.role,
+                func.count().label("games_count"),
+                func.count().filter(IS_WON).label("won_games_count"),
+            )
+            .join(Game, PlayerGame.game_id == Game.id)
+            .where(Game.status == GameStatuses.ENDED, *self._created_at_where(since, until))
+            .group_by(PlayerGame.number, PlayerGame.role)
+            .order_by(PlayerGame.number, PlayerGame.role)
+        )
+        if player_id is not None:
+            query = query.where(PlayerGame.player_id == player_id)
+        return [
+            SeatRoleStatsSchema.model_validate(row, from_attributes=True) for row in await self._session.execute(query)
+        ]
+
+    async def apply_game_to_player_stats(self, game_id: int) -> None:
+        counters = self._player_stats_counters_query(PlayerGame.game_id == game_id)
+        query = upsert(self._dialect, PlayerStats).from_select([c.key for c in counters.selected_columns], counters)
+        query = query.on_conflict_do_update(
+            index_elements=[PlayerStats.player_id],
+            set_={name: getattr(PlayerStats, name) + query.excluded[name] for name in PlayerStats.counters()},
+        )
+        await self._session.execute(query)
+        await self._session.flush()
+
+    async def rebuild_player_stats(self) -> None:
+        counters = self._player_stats_counters_query()
+        await self._session.execute(delete(PlayerStats))
+        await self._session.execute(
+            insert(PlayerStats).from_select([c.key for c in counters.selected_columns], counters)
+        )
+        await self._session.flush()
+
+    async def get_inconsistent_player_stats(self) -> list[int]:
+        actual = {row.player_id: row for row in await self._session.execute(self._player_stats_counters_query())}
+        stored = {row.player_id: row for row in await self._session.scalars(select(PlayerStats))}
+        inconsistent = []
+        for player_id in actual.keys() | stored.keys():
+            actual_counters = actual.get(player_id) or PlayerStats.empty(player_id)
+            stored_counters = stored.get(player_id) or PlayerStats.empty(player_id)
+            if any(getattr(actual_counters, c) != getattr(stored_counters, c) for c in PlayerStats.counters()):
+                inconsistent.append(player_id)
+        return sorted(inconsistent)
+
+    @staticmethod
+    def _leaderboard_query(*where: ColumnElement[bool]) -> CompoundSelect:
+        """Leaderboard entries of players in all categories computed from stored counters"""
+        queries = []
+        for category, suffixes in LEADERBOARD_COUNTERS.items():
+            games_count = reduce(operator.add, (getattr(PlayerStats, f"games_count_{suffix}") for suffix in suffixes))
+            won_games_count = reduce(
+                operator.add, (getattr(PlayerStats, f"won_games_count_{suffix}") for suffix in suffixes)
+            )
+            queries.append(
+                select(
+                    literal(category.value).label("category"),
+                    PlayerStats.player_id,
+                    games_count.label("games_count"),
+                    won_games_count.label("won_games_count"),
+                    (cast(won_games_count, Float) / games_count).label("win_rate"),
+                ).where(games_count > 0, *where)
+            )
+        return union_all(*queries)
+
+    async def apply_game_to_leaderboard(self, game_id: int) -> None:
+        entries = self._leaderboard_query(
+            PlayerStats.player_id.in_(select(PlayerGame.player_id).where(PlayerGame.game_id == game_id))
+        )
+        query = upsert(self._dialect, LeaderboardEntry).from_select([c.key for c in entries.selected_columns], entries)
+        query = query.on_conflict_do_update(
+            index_elements=[LeaderboardEntry.category, LeaderboardEntry.player_id],
+            set_={name: query.excluded[name] for name in ("games_count", "won_games_count", "win_rate")},
+        )
+        await self._session.execute(query)
+        await self._session.flush()
+
+    async def rebuild_leaderboard(self) -> None:
+        entries = self._leaderboard_query()
+        await self._session.execute(delete(LeaderboardEntry))
+        await self._session.execute(
+            insert(LeaderboardEntry).from_select([c.key for c in entries.selected_columns], entries)
+        )
+        await self._session.flush()
+
+    @staticmethod
+    def _period_leaderboard_query(category: LeaderboardCategories, *where: ColumnElement[bool]) -> Select:
+        """Leaderboard entries of players in the category computed from ended games, `where` filters games"""
+        games_count = func.count()
+        won_games_count = func.count().filter(IS_WON)
+        return (
+            select(
+                PlayerGame.player_id,
+                games_count.label("games_count"),
+                won_games_count.label("won_games_count"),
+                (cast(won_games_count, Float) / games_count).label("win_rate"),
+            )
+            .join(Game, PlayerGame.game_id == Game.id)
+            .where(Game.status == GameStatuses.ENDED, PlayerGame.role.in_(LEADERBOARD_ROLES[category]), *where)
+            .group_by(PlayerGame.player_id)
+        )
+
+    async def get_leaderboard(
+        self,
+        category: LeaderboardCategories,
+        min_games: int,
+        limit: int,
+        cursor: LeaderboardCursorSchema | None,
+        since: datetime.datetime | None = None,
+        until: datetime.datetime | None = None,
+    ) -> list[LeaderboardEntrySchema]:
+        if since is None and until is None:
+            source = (
+                select(
+                    LeaderboardEntry.player_id,
+                    LeaderboardEntry.games_count,
+                    LeaderboardEntry.won_games_count,
+                    LeaderboardEntry.win_rate,
+                )
+                .where(LeaderboardEntry.category == category)
+                .subquery()
+            )
+        else:
+            source = self._period_leaderboard_query(category, *self._created_at_where(since, until)).subquery()
+        query = (
+            select(
+                source.c.player_id,
+                Player.nickname,
+                source.c.games_count,
+                source.c.won_games_count,
+                source.c.win_rate,
+            )
+            .join(Player, Player.id == source.c.player_id)
+            .where(source.c.games_count >= min_games)
+        )
+        position = tuple_(source.c.win_rate, source.c.games_count, source.c.player_id)
+        if cursor is not None:
+            cursor_position = tuple_(cursor.win_rate, cursor.games_count, cursor.player_id)
+            query = query.where(position > cursor_position if cursor.backward else position < cursor_position)
+        order = (source.c.win_rate, source.c.games_count, source.c.player_id)
+        if cursor is not None and cursor.backward:
+            query = query.order_by(*(c.asc() for c in order))
+        else:
+            query = query.order_by(*(c.desc() for c in order))
+        entries = [
+            LeaderboardEntrySchema.model_validate(row, from_attributes=True)
+            for row in await self._session.execute(query.limit(limit + 1))
+        ]
+        if cursor is not None and cursor.backward:
+            entries.reverse()
+        return entries
+
+    async def get_players_ratings(self, players_ids: list[int]) -> list[PlayerRatingSchema]:
+        query = select(PlayerRating).where(PlayerRating.player_id.in_(players_ids))
+        return [
+            PlayerRatingSchema.model_validate(rating, from_attributes=True)
+            for rating in await self._session.scalars(query)
+        ]
+
+    async def lock_players_ratings(self, players_ids: list[int]) -> list[PlayerRatingSchema]:
+        # rows of new players are inserted first, as missing rows can't be locked
+        await self._session.execute(
+            upsert(self._dialect, PlayerRating)
+            .values([PlayerRatingSchema(player_id=player_id).model_dump() for player_id in players_ids])
+            .on_conflict_do_nothing(index_elements=[PlayerRating.player_id])
+        )
+        # locked in the same order by every transaction to avoid deadlocks
+        query = (
+            select(PlayerRating)
+            .where(PlayerRating.player_id.in_(players_ids))
+            .order_by(PlayerRating.player_id)
+            .with_for_update()
+        )
+        return [
+            PlayerRatingSchema.model_validate(rating, from_attributes=True)
+            for rating in await self._session.scalars(query)
+        ]
+
+    async def save_players_ratings(self, ratings: list[PlayerRatingSchema]) -> None:
+        if not ratings:
+            return
+        query = upsert(self._dialect, PlayerRating).values([rating.model_dump() for rating in ratings])
+        query = query.on_conflict_do_update(
+            index_elements=[PlayerRating.player_id],
+            set_={"rating": query.excluded.rating, "games_count": query.excluded.games_count},
+        )
+        await self._session.execute(query)
+
+    async def replace_players_ratings(self, ratings: list[PlayerRatingSchema]) -> None:
+        await self._session.execute(delete(PlayerRating))
+        if ratings:
+            await self._session.execute(insert(PlayerRating), [rating.model_dump() for rating in ratings])
+
+    async def get_ended_games_participants(
+        self,
+        games_ids: list[int] | None = None,
+    ) -> list[tuple[int, int, core.Roles, core.GameResults]]:
+        query = (
+            select(PlayerGame.game_id, PlayerGame.player_id, PlayerGame.role, Game.result)
+            .join(Game, Game.id == PlayerGame.game_id)
+            .where(Game.status == GameStatuses.ENDED)
+            .order_by(Game.created_at, Game.id, PlayerGame.number)
         )
+        if games_ids is not None:
+            query = query.where(Game.id.in_(games_ids))
+        return [tuple(row) for row in await self._session.execute(query)]
 
-    async def get_game_by_id(self, game_id: int) -> GameSchema:
-        query = select(Game).where(Game.id == game_id).options(joinedload(Game.players).joinedload(PlayerGame.player))
-        game = (await self._session.scalars(query)).first()
-        if not game:
+    async def get_game_by_id(
+        self,
+        game_id: int,
+        strategy: GamesFetchStrategy = GamesFetchStrategy.JOINED,
+    ) -> GameSchema:
+        cached_game = games_cache.get(game_id)
+        if cached_game is not None and (
+            games_cache.is_immutable(cached_game)
+            or await self._session.scalar(select(Game.version).where(Game.id == game_id)) == cached_game.version
+        ):
+            return cached_game
+        games = await self._fetch_games(Game.id == game_id, strategy=strategy)
+        if not games:
             raise NotFoundError(f"Game id={game_id} not found")
-        return self._format_game(game)
+        games_cache.set(games[0])
+        return games[0]
+
+    def _game_participants_json(self) -> ScalarSelect:
+        """Participants of Game as json array, correlated to the outer query"""
+        return (
+            select(
+                json_objects_agg(
+                    self._dialect,
+                    "id",
+                    Player.id,
+                    "fio",
+                    Player.fio,
+                    "nickname",
+                    Player.nickname,
+                    "avatar_path",
+                    Player.avatar_path,
+                    "role",
+                    PlayerGame.role,
+                    "number",
+                    PlayerGame.number,
+                    "is_first_killed",
+                    PlayerGame.is_first_killed,
+                    "in_best_move",
+                    PlayerGame.in_best_move,
+                )
+            )
+            .select_from(PlayerGame)
+            .join(Player, Player.id == PlayerGame.player_id)
+            .where(PlayerGame.game_id == Game.id)
+            .scalar_subquery()
+        )
+
+    @classmethod
+    def _format_game_row(cls, row: Row) -> GameSchema:
+        """Formats row of json_agg strategy query"""
+        participants = [
+            (
+                p,
+                PlayerInGameSchema.model_construct(
+                    id=p["id"],
+                    fio=p["fio"],
+                    nickname=p["nickname"],
+                    role=Roles(p["role"]),
+                    number=p["number"],
+                    avatar_path=p["avatar_path"],
+                ),
+            )
+            for p in row.participants or ()
+        ]
+        return GameSchema.model_construct(
+            id=row.id,
+            comments=row.comments,
+            result=GameResults(row.result) if row.result else None,
+            status=GameStatuses(row.status),
+            players={player for _, player in participants},
+            created_at=cls._from_stored_time(row.created_at),
+            version=row.version,
+            best_move={player for p, player in participants if p["in_best_move"]} or None,
+            first_killed=next((player for p, player in participants if p["is_first_killed"]), None),
+        )
+
+    async def _fetch_games(self, *where: ColumnElement[bool], strategy: GamesFetchStrategy) -> list[GameSchema]:
+        """Games filtered by `where` with their participants, newest first"""
+        match strategy:
+            case GamesFetchStrategy.JOINED:
+                query = select(Game).options(joinedload(Game.players).joinedload(PlayerGame.player))
+                games = (await self._session.scalars(query.where(*where).order_by(Game.created_at.desc()))).unique()
+                return [self._format_game(g) for g in games]
+            case GamesFetchStrategy.SELECTIN:
+                query = select(Game).options(selectinload(Game.players).joinedload(PlayerGame.player))
+                games = await self._session.scalars(query.where(*where).order_by(Game.created_at.desc()))
+                return [self._format_game(g) for g in games]
+            case GamesFetchStrategy.JSON_AGG:
+                query = self._games_json_agg_query().where(*where).order_by(Game.created_at.desc())
+                return [self._format_game_row(row) for row in await self._session.execute(query)]
+
+    def _games_json_agg_query(self) -> Select:
+        """Games with their participants as json array, rows are formatted by `_format_game_row`"""
+        return select(
+            Game.id,
+            Game.comments,
+            Game.result,
+            Game.status,
+            Game.created_at,
+            Game.version,
+            self._game_participants_json().label("participants"),
+        )
+
+    async def iter_ended_games(
+        self,
+        since: datetime.datetime | None = None,
+        until: datetime.datetime | None = None,
+    ) -> AsyncIterator[GameSchema]:
+        query = (
+            self._games_json_agg_query()
+            .where(Game.status == GameStatuses.ENDED, *self._created_at_where(since, until))
+            .order_by(Game.created_at, Game.id)
+            .execution_options(yield_per=STREAM_BATCH_SIZE)
+        )
+        async for row in await self._session.stream(query):
+            yield self._format_game_row(row)
+
+    async def get_ended_games_summaries(
+        self,
+        limit: int,
+        cursor: GamesCursorSchema | None,
+    ) -> list[GameSummarySchema]:
+        query = select(Game.id, Game.result, Game.created_at).where(Game.status == GameStatuses.ENDED)
+        position = tuple_(Game.created_at, Game.id)
+        if cursor is not None:
+            cursor_position = tuple_(self._to_stored_time(cursor.created_at), cursor.id)
+            query = query.where(position > cursor_position if cursor.backward else position < cursor_position)
+        if cursor is not None and cursor.backward:
+            query = query.order_by(Game.created_at.asc(), Game.id.asc())
+        else:
+            query = query.order_by(Game.created_at.desc(), Game.id.desc())
+        games = [
+            GameSummarySchema(
+                id=game_id,
+                result=GameResults(result) if result else None,
+                created_at=self._from_stored_time(created_at),
+            )
+            for game_id, result, created_at in await self._session.execute(query.limit(limit + 1))
+        ]
+        if cursor is not None and cursor.backward:
+            games.reverse()
+        return games
+
+    async def get_game_version(self, game_id: int) -> GameVersionSchema:
+        row = (await self._session.execute(self._game_version_query().where(Game.id == game_id))).first()
+        if row is None:
+            raise NotFoundError(f"Game id={game_id} not found")
+        return self._format_game_version(row)
+
+    async def get_draft_game_version(self) -> GameVersionSchema | None:
+        query = (
+            self._game_version_query()
+            .where(Game.status == GameStatuses.DRAFT)
+            .order_by(Game.created_at.desc())
+            .limit(1)
+        )
+        row = (await self._session.execute(query)).first()
+        return None if row is None else self._format_game_version(row)
+
+    @staticmethod
+    def _game_version_query() -> Select:
+        return select(Game.id, Game.version, Game.status)
+
+    @staticmethod
+    def _format_game_version(row: Row) -> GameVersionSchema:
+        return GameVersionSchema(id=row.id, version=row.version, status=GameStatuses(row.status))
+
+    async def get_last_game_in_draft(self) -> GameSchema | None:
+        is_cached, game = draft_game_cache.get()
+        if is_cached:
+            return game
+        query = (
+            select(Game)
+            .where(Game.status == GameStatuses.DRAFT)
+            .order_by(Game.created_at.desc())
+            .limit(1)
+            .options(joinedload(Game.players).joinedload(PlayerGame.player))
+        )
+        game = (await self._session.scalars(query)).unique().first()
+        game = self._format_game(game) if game else None
+        draft_game_cache.set(game)
+        return game
 
     async def get_games(
             self,
@@ -145,40 +757,33 @@ class DBRepository(DBRepositoryInterface):
             result__in: list[core.GameResults] | None = None,
             status: core.GameStatuses | None = None,
             is_won: bool | None = None,
+            created_at__gte: datetime.datetime | None = None,
+            created_at__lt: datetime.datetime | None = None,
+            strategy: GamesFetchStrategy = GamesFetchStrategy.JOINED,
     ) -> list[GameSchema]:
-        query = (
-            select(Game).join(PlayerGame).join(Player).options(joinedload(Game.players).joinedload(PlayerGame.player))
-        )
+        where = []
+        participant_where = []
         if player_id is not None:
-            query = query.where(PlayerGame.player_id == player_id)
+            participant_where.append(PlayerGame.player_id == player_id)
         if role__in is not None:
-            query = query.where(PlayerGame.role.in_(role__in))
+            participant_where.append(PlayerGame.role.in_(role__in))
         if result__in is not None:
-            query = query.where(Game.result.in_(result__in))
+            where.append(Game.result.in_(result__in))
         if seat_number is not None:
-            query = query.where(PlayerGame.number == seat_number)
+            participant_where.append(PlayerGame.number == seat_number)
         if status is not None:
-            query = query.where(Game.status == status)
+            where.append(Game.status == status)
+        where.extend(self._created_at_where(created_at__gte, created_at__lt))
         if is_won is not None:
             if player_id is None:
                 raise Exception("player_id must be defined to use filter 'is_won'")
-            query = query.where(
-                or_(
-                    and_(
-                        PlayerGame.role.in_([core.Roles.SHERIFF, core.Roles.CIVILIAN]),
-                        Game.result == core.GameResults.CIVILIANS_WON,
-                    ),
-                    and_(
-                        PlayerGame.role.in_([core.Roles.MAFIA, core.Roles.DON]),
-                        Game.result == core.GameResults.MAFIA_WON,
-                    ),
-                )
-            )
-        query = query.order_by(Game.created_at.desc())
-        games = (await self._session.execute(query)).scalars().unique().all()
-        return [self._format_game(g) for g in games]
+            participant_where.append(IS_WON)
+        if participant_where:
+            where.append(exists().where(PlayerGame.game_id == Game.id, *participant_where))
+        return await self._fetch_games(*where, strategy=strategy)
 
     async def add_player(self, game_id: int, player_id: int, seat_number: int, role: core.Roles) -> None:
+        await self._bump_game_version(game_id)
         player_in_game = PlayerGame(
             player_id=player_id,
             number=seat_number,
@@ -188,6 +793,144 @@ class DBRepository(DBRepositoryInterface):
         self._session.add(player_in_game)
         await self._session.flush()
 
+    async def reseat_player(self, game_id: int, player_id: int, seat_number: int, role: core.Roles) -> GameSchema:
+        if not supports_modifying_cte(self._dialect):
+            return await self._reseat_player_sequentially(game_id, player_id, seat_number, role)
+        self._changed_caches.game_changed(game_id)
+        others = and_(PlayerGame.game_id == game_id, PlayerGame.player_id != player_id)
+        # Statements of one WITH query see the same snapshot and must not touch the same rows
+        vacated = (
+            delete(PlayerGame)
+            .where(others, PlayerGame.number == seat_number)
+            .returning(PlayerGame.player_id)
+            .cte("vacated")
+        )
+        moved = (
+            update(PlayerGame)
+            .where(PlayerGame.game_id == game_id, PlayerGame.player_id == player_id)
+            .values(number=seat_number, role=role, is_first_killed=False, in_best_move=False)
+            .returning(PlayerGame.player_id)
+            .cte("moved")
+        )
+        cleared = (
+            update(PlayerGame)
+            .where(others, PlayerGame.number != seat_number, or_(PlayerGame.is_first_killed, PlayerGame.in_best_move))
+            .values(is_first_killed=False, in_best_move=False)
+            .returning(PlayerGame.player_id)
+            .cte("cleared")
+        )
+        bumped = (
+            update(Game).where(Game.id == game_id).values(version=Game.version + 1).returning(Game.id).cte("bumped")
+        )
+        # unknown game is reported as not found instead of foreign key violation of the insert
+        inserted = (
+            insert(PlayerGame)
+            .from_select(
+                ["player_id", "game_id", "role", "number", "is_first_killed", "in_best_move"],
+                select(
+                    literal(player_id),
+                    literal(game_id),
+                    literal(role.value),
+                    literal(seat_number),
+                    false(),
+                    false(),
+                ).where(~exists(moved.select()), exists(bumped.select())),
+            )
+            .returning(PlayerGame.player_id)
+            .cte("inserted")
+        )
+        seats = union_all(
+            select(PlayerGame.player_id, PlayerGame.role, PlayerGame.number).where(
+                others, PlayerGame.number != seat_number
+            ),
+            select(
+                literal(player_id).label("player_id"),
+                literal(role.value).label("role"),
+                literal(seat_number).label("number"),
+            ),
+        ).subquery("seats")
+        # Primary query doesn't see changes made by CTEs, so it builds the resulting seats itself
+        query = (
+            select(
+                Game.id,
+                Game.comments,
+                Game.result,
+                Game.status,
+                Game.created_at,
+                (Game.version + 1).label("version"),
+                Player.id.label("player_id"),
+                Player.fio,
+                Player.nickname,
+                Player.avatar_path,
+                seats.c.role,
+                seats.c.number,
+            )
+            .select_from(seats)
+            .join(Player, Player.id == seats.c.player_id)
+            .join(Game, Game.id == game_id)
+            .add_cte(vacated, moved, cleared, inserted, bumped)
+        )
+        rows = (await self._session.execute(query)).all()
+        if not rows:
+            raise NotFoundError(f"Game id={game_id} not found")
+        game = rows[0]
+        return GameSchema.model_construct(
+            id=game.id,
+            comments=game.comments,
+            result=GameResults(game.result) if game.result else None,
+            status=GameStatuses(game.status),
+            players={
+                PlayerInGameSchema.model_construct(
+                    id=row.player_id,
+                    fio=row.fio,
+                    nickname=row.nickname,
+                    role=Roles(row.role),
+                    number=row.number,
+                    avatar_path=row.avatar_path,
+                )
+                for row in rows
+            },
+            created_at=self._from_stored_time(game.created_at),
+            version=game.version,
+            best_move=None,
+            first_killed=None,
+        )
+
+    async def _reseat_player_sequentially(
+        self,
+        game_id: int,
+        player_id: int,
+        seat_number: int,
+        role: core.Roles,
+    ) -> GameSchema:
+        """Same as `reseat_player` for databases without data-modifying statements in WITH"""
+        self._changed_caches.game_changed(game_id)
+        bumped = await self._session.scalar(
+            update(Game).where(Game.id == game_id).values(version=Game.version + 1).returning(Game.id)
+        )
+        if bumped is None:
+            raise NotFoundError(f"Game id={game_id} not found")
+        others = and_(PlayerGame.game_id == game_id, PlayerGame.player_id != player_id)
+        await self._session.execute(delete(PlayerGame).where(others, PlayerGame.number == seat_number))
+        await self._session.execute(
+            update(PlayerGame)
+            .where(others, or_(PlayerGame.is_first_killed, PlayerGame.in_best_move))
+            .values(is_first_killed=False, in_best_move=False)
+        )
+        moved = await self._session.scalar(
+            update(PlayerGame)
+            .where(PlayerGame.game_id == game_id, PlayerGame.player_id == player_id)
+            .values(number=seat_number, role=role, is_first_killed=False, in_best_move=False)
+            .returning(PlayerGame.player_id)
+        )
+        if moved is None:
+            await self._session.execute(
+                insert(PlayerGame).values(player_id=player_id, game_id=game_id, role=role, number=seat_number)
+            )
+        self._session.expire_all()
+        games = await self._fetch_games(Game.id == game_id, strategy=GamesFetchStrategy.JOINED)
+        return games[0]
+
     async def get_players_count(self) -> int:
         query = select(func.count(Player.id))
         return await self._session.scalar(query)
@@ -196,12 +939,18 @@ class DBRepository(DBRepositoryInterface):
         query = select(func.count(Game.id)).where(Game.status == GameStatuses.ENDED)
         return await self._session.scalar(query)
 
+    async def get_ended_games_ids(self) -> list[int]:
+        query = select(Game.id).where(Game.status == GameStatuses.ENDED)
+        return list(await self._session.scalars(query))
+
     async def remove_player_from_game(self, game_id: int, player_id: int) -> None:
+        await self._bump_game_version(game_id)
         query = delete(PlayerGame).where(and_(PlayerGame.player_id == player_id, PlayerGame.game_id == game_id))
         await self._session.execute(query)
         await self._session.flush()
 
     async def remove_player_on_seat(self, game_id: int, seat_number: int) -> None:
+        await self._bump_game_version(game_id)
         query = delete(PlayerGame).where(and_(PlayerGame.number == seat_number, PlayerGame.game_id == game_id))
         await self._session.execute(query)
         await self._session.flush()
@@ -218,6 +967,7 @@ class DBRepository(DBRepositoryInterface):
         return PlayerSchema.model_validate(player_game.player, from_attributes=True)
 
     async def assign_player_as_first_killed(self, game_id: int, player_number: int) -> None:
+        await self._bump_game_version(game_id)
         query = (
             update(PlayerGame)
             .where(and_(PlayerGame.number == player_number, PlayerGame.game_id == game_id))
@@ -227,6 +977,7 @@ class DBRepository(DBRepositoryInterface):
         await self._session.flush()
 
     async def clear_game_first_killed_and_best_move(self, game_id: int) -> None:
+        await self._bump_game_version(game_id)
         query = (
             update(PlayerGame)
             .where(PlayerGame.game_id == game_id)
@@ -236,6 +987,7 @@ class DBRepository(DBRepositoryInterface):
         await self._session.flush()
 
     async def set_game_best_move(self, players_numbers: set[int], game_id: int) -> None:
+        await self._bump_game_version(game_id)
         query = (
             update(PlayerGame)
             .where(and_(PlayerGame.number.in_(players_numbers), PlayerGame.game_id == game_id))
@@ -245,10 +997,23 @@ class DBRepository(DBRepositoryInterface):
         await self._session.flush()
 
     async def update_game(self, game_id: int, data: UpdateGameSchema) -> None:
+        await self._bump_game_version(game_id)
         query = update(Game).where(Game.id == game_id).values(**data.model_dump(exclude_none=True))
         await self._session.execute(query)
         await self._session.flush()
 
+    async def end_game(self, game_id: int, result: GameResults) -> bool:
+        query = (
+            update(Game)
+            .where(Game.id == game_id, Game.status == GameStatuses.DRAFT)
+            .values(status=GameStatuses.ENDED, result=result, version=Game.version + 1)
+            .returning(Game.id)
+        )
+        if await self._session.scalar(query) is None:
+            return False
+        self._changed_caches.game_changed(game_id)
+        return True
+
     async def create_game(self, data: CreateGameSchema) -> RawGameSchema:
         game = Game(
             created_at=data.created_at,
@@ -258,6 +1023,7 @@ class DBRepository(DBRepositoryInterface):
         )
         self._session.add(game)
         await self._session.flush()
+        self._changed_caches.game_changed(game.id)
         players = []
         for p in data.players:
             player_in_game = PlayerGame(game_id=game.id, player_id=p.id, role=p.role, number=p.number)
@@ -276,3 +1042,80 @@ class DBRepository(DBRepositoryInterface):
             result=GameResults(game.result) if game.result else None,
             comments=game.comments,
         )
+
+    async def _get_copy_connection(self) -> asyncpg.Connection:
+        """asyncpg connection of the session transaction, COPY is not available through SQLAlchemy"""
+        if self._dialect != POSTGRESQL:
+            raise ValidationError("History import and export use COPY and require PostgreSQL backend")
+        connection = await self._session.connection()
+        # asyncpg transaction is begun lazily by the first statement executed through SQLAlchemy
+        await connection.execute(select(literal(1)))
+        return (await connection.get_raw_connection()).driver_connection
+
+    async def export_history(
+        self,
+        players_output: HistoryOutput,
+        games_output: HistoryOutput,
+        participants_output: HistoryOutput,
+    ) -> None:
+        if self._dialect == POSTGRESQL and self._unit_of_work is None and isinstance(self._session.bind, AsyncEngine):
+            # all files are read from one snapshot, otherwise isolation of the outer transaction is kept
+            await self._session.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+        copy_connection = await self._get_copy_connection()
+        is_ended = Game.status == GameStatuses.ENDED
+        queries = (
+            (players_output, select(*(getattr(Player, c) for c in PLAYERS_CSV_COLUMNS)).order_by(Player.id)),
+            (games_output, select(*(getattr(Game, c) for c in GAMES_CSV_COLUMNS)).where(is_ended).order_by(Game.id)),
+            (
+                participants_output,
+                select(*(getattr(PlayerGame, c) for c in PARTICIPANTS_CSV_COLUMNS))
+                .join(Game, PlayerGame.game_id == Game.id)
+                .where(is_ended)
+                .order_by(PlayerGame.game_id, PlayerGame.number),
+            ),
+        )
+        for output, query in queries:
+            statement = query.compile(dialect=self._session.bind.dialect, compile_kwargs={"literal_binds": True})
+            await copy_connection.copy_from_query(str(statement), output=output, format="csv", header=True)
+
+    async def import_players(self, players: list[PlayerSchema]) -> None:
+        copy_connection = await self._get_copy_connection()
+        try:
+            await copy_connection.copy_records_to_table(
+                Player.__tablename__,
+                records=[(p.id, p.fio, p.nickname, p.avatar_path) for p in players],
+                columns=["id", "fio", "nickname", "avatar_path"],
+            )
+        except asyncpg.IntegrityConstraintViolationError as e:
+            raise ValidationError(f"Players are not imported: {e}") from e
+
+    async def import_games(self, games: list[GameSchema]) -> None:
+        copy_connection = await self._get_copy_connection()
+        first_killed = {g.id: g.first_killed.id for g in games if g.first_killed}
+        best_move = {(g.id, p.id) for g in games for p in g.best_move or ()}
+        try:
+            await copy_connection.copy_records_to_table(
+                Game.__tablename__,
+                records=[
+                    (g.id, g.result, GameStatuses.ENDED, g.comments, self._to_stored_time(g.created_at)) for g in games
+                ],
+                columns=["id", "result", "status", "comments", "created_at"],
+            )
+            await copy_connection.copy_records_to_table(
+                PlayerGame.__tablename__,
+                records=[
+                    (p.id, g.id, p.role, p.number, (g.id, p.id) in best_move, first_killed.get(g.id) == p.id)
+                    for g in games
+                    for p in sorted(g.players, key=lambda p: p.number)
+                ],
+                columns=["player_id", "game_id", "role", "number", "in_best_move", "is_first_killed"],
+            )
+        except asyncpg.IntegrityConstraintViolationError as e:
+            raise ValidationError(f"Games are not imported: {e}") from e
+
+    async def reset_ids_sequences(self) -> None:
+        if self._dialect != POSTGRESQL:
+            return  # sqlite takes ids after the largest stored ones by itself
+        for model in (Player, Game):
+            sequence = func.pg_get_serial_sequence(model.__tablename__, "id")
+            await self._session.execute(select(func.setval(sequence, select(func.max(model.id)).scalar_subquery())))
@@ -0,0 +1,29 @@
+"""Parts of queries which differ between PostgreSQL and SQLite"""
+
+from sqlalchemy import JSON, Insert, Table, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.sql.functions import Function
+
+POSTGRESQL = "postgresql"
+SQLITE = "sqlite"
+
+
+def upsert(dialect_name: str, table: type[DeclarativeBase] | Table) -> Insert:
+    """Insert supporting `on_conflict_do_nothing` and `on_conflict_do_update`"""
+    if dialect_name == SQLITE:
+        return sqlite_insert(table)
+    return pg_insert(table)
+
+
+def json_objects_agg(dialect_name: str, *keys_and_values) -> Function:
+    """Aggregates rows into json array of objects built from key, value pairs"""
+    if dialect_name == SQLITE:
+        return func.json_group_array(func.json_object(*keys_and_values), type_=JSON)
+    return func.json_agg(func.json_build_object(*keys_and_values), type_=JSON)
+
+
+def supports_modifying_cte(dialect_name: str) -> bool:
+    """Whether INSERT, UPDATE and DELETE may be used in WITH clause"""
+    return dialect_name == POSTGRESQL
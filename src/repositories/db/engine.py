@@ -0,0 +1,87 @@
+import time
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from config import DBConfig
+from usecases.schemas import DBPoolMetricsSchema
+
+from .dialects import SQLITE
+from .models import Base
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """Queue pool which measures how long connection checkout waits, including opening new connections"""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.checkouts_count = 0
+        self.checkout_timeouts_count = 0
+        self.checkout_wait_total = 0.0
+        self.checkout_wait_max = 0.0
+
+    def _do_get(self):
+        started_at = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.checkout_timeouts_count += 1
+            raise
+        finally:
+            wait = time.perf_counter() - started_at
+            self.checkouts_count += 1
+            self.checkout_wait_total += wait
+            self.checkout_wait_max = max(self.checkout_wait_max, wait)
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:  # noqa: ARG001
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys = ON")
+    cursor.execute("PRAGMA journal_mode = WAL")
+    cursor.execute("PRAGMA busy_timeout = 5000")
+    cursor.close()
+
+
+def create_engine(config: DBConfig) -> AsyncEngine:
+    engine = create_async_engine(
+        config.db_url,
+        echo=False,
+        poolclass=InstrumentedAsyncPool,
+        pool_size=config.DB_POOL_SIZE,
+        max_overflow=config.DB_MAX_OVERFLOW,
+        pool_timeout=config.DB_POOL_TIMEOUT,
+        pool_pre_ping=True,
+    )
+    if engine.dialect.name == SQLITE:
+        event.listen(engine.sync_engine, "connect", _set_sqlite_pragmas)
+    return engine
+
+
+async def create_schema(engine: AsyncEngine) -> None:
+    """Creates tables of embedded database, PostgreSQL schema is managed by alembic migrations"""
+    if engine.dialect.name != SQLITE:
+        return
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+
+def create_session_factory(engine: AsyncEngine) -> async_sessionmaker:
+    return async_sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def get_pool_metrics(engine: AsyncEngine) -> DBPoolMetricsSchema:
+    pool: InstrumentedAsyncPool = engine.pool
+    return DBPoolMetricsSchema(
+        pool_size=pool.size(),
+        max_overflow=pool._max_overflow,
+        checked_in=pool.checkedin(),
+        checked_out=pool.checkedout(),
+        # negative while the pool has not opened pool_size connections yet
+        overflow=max(pool.overflow(), 0),
+        checkouts_count=pool.checkouts_count,
+        checkout_timeouts_count=pool.checkout_timeouts_count,
+        checkout_wait_total=pool.checkout_wait_total,
+        checkout_wait_max=pool.checkout_wait_max,
+    )
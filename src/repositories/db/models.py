@@ -1,6 +1,6 @@
 import datetime
 
-from sqlalchemy import BigInteger, ForeignKey
+from sqlalchemy import BigInteger, ForeignKey, Index, text
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
@@ -9,6 +9,10 @@ class Base(DeclarativeBase): ...
 
 class PlayerGame(Base):
     __tablename__ = "players_games"
+    __table_args__ = (
+        Index("ix_players_games_player_id_role", "player_id", "role"),
+        Index("ix_players_games_game_id_number", "game_id", "number"),
+    )
     player_id: Mapped[int] = mapped_column(ForeignKey("players.id"), primary_key=True)
     game_id: Mapped[int] = mapped_column(ForeignKey("games.id"), primary_key=True)
     role: Mapped[str] = mapped_column(nullable=False)
@@ -45,12 +49,17 @@ class Player(Base):
 
 class Game(Base):
     __tablename__ = "games"
+    __table_args__ = (
+        Index("ix_games_status_created_at", "status", text("created_at DESC")),
+        Index("ix_games_draft_created_at", text("created_at DESC"), postgresql_where=text("status = 'draft'")),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     result: Mapped[str] = mapped_column(nullable=True)
     status: Mapped[str] = mapped_column(nullable=False)
     comments: Mapped[str] = mapped_column(nullable=False, default="")
     created_at: Mapped[datetime.datetime] = mapped_column(nullable=False)
+    version: Mapped[int] = mapped_column(nullable=False, default=1, server_default="1")
 
     players: Mapped[list["PlayerGame"]] = relationship(back_populates="game")
 
@@ -68,3 +77,75 @@ class User(Base):
 
     def __repr__(self) -> str:
         return f"<Player id={self.telegram_id} username={self.username}>"
+
+
+class PlayerStats(Base):
+    """Counters of player's ended games. Updated on game end"""
+
+    __tablename__ = "player_stats"
+
+    player_id: Mapped[int] = mapped_column(ForeignKey("players.id", ondelete="CASCADE"), primary_key=True)
+    games_count_total: Mapped[int] = mapped_column(default=0, server_default="0")
+    won_games_count_total: Mapped[int] = mapped_column(default=0, server_default="0")
+    games_count_as_civilian: Mapped[int] = mapped_column(default=0, server_default="0")
+    won_games_count_as_civilian: Mapped[int] = mapped_column(default=0, server_default="0")
+    games_count_as_mafia: Mapped[int] = mapped_column(default=0, server_default="0")
+    won_games_count_as_mafia: Mapped[int] = mapped_column(default=0, server_default="0")
+    games_count_as_don: Mapped[int] = mapped_column(default=0, server_default="0")
+    won_games_count_as_don: Mapped[int] = mapped_column(default=0, server_default="0")
+    games_count_as_sheriff: Mapped[int] = mapped_column(default=0, server_default="0")
+    won_games_count_as_sheriff: Mapped[int] = mapped_column(default=0, server_default="0")
+    first_killed_count: Mapped[int] = mapped_column(default=0, server_default="0")
+    best_move_count_total: Mapped[int] = mapped_column(default=0, server_default="0")
+    zero_mafia_best_move_count: Mapped[int] = mapped_column(default=0, server_default="0")
+    one_mafia_best_move_count: Mapped[int] = mapped_column(default=0, server_default="0")
+    two_mafia_best_move_count: Mapped[int] = mapped_column(default=0, server_default="0")
+    three_mafia_best_move_count: Mapped[int] = mapped_column(default=0, server_default="0")
+
+    @classmethod
+    def counters(cls) -> list[str]:
+        return [c.key for c in cls.__table__.columns if c.key != "player_id"]
+
+    @classmethod
+    def empty(cls, player_id: int) -> "PlayerStats":
+        return cls(player_id=player_id, **dict.fromkeys(cls.counters(), 0))
+
+    def __repr__(self) -> str:
+        return f"<PlayerStats player_id={self.player_id} games_count_total={self.games_count_total}>"
+
+
+class LeaderboardEntry(Base):
+    """Player's win rate in leaderboard category. Updated on game end from player stats"""
+
+    __tablename__ = "leaderboard"
+    __table_args__ = (
+        Index(
+            "ix_leaderboard_category_win_rate",
+            "category",
+            text("win_rate DESC"),
+            text("games_count DESC"),
+            text("player_id DESC"),
+        ),
+    )
+
+    category: Mapped[str] = mapped_column(primary_key=True)
+    player_id: Mapped[int] = mapped_column(ForeignKey("players.id", ondelete="CASCADE"), primary_key=True)
+    games_count: Mapped[int] = mapped_column(nullable=False)
+    won_games_count: Mapped[int] = mapped_column(nullable=False)
+    win_rate: Mapped[float] = mapped_column(nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<LeaderboardEntry category={self.category} player_id={self.player_id} win_rate={self.win_rate}>"
+
+
+class PlayerRating(Base):
+    """Player's rating. Updated on game end, recomputed by replaying games history"""
+
+    __tablename__ = "players_ratings"
+
+    player_id: Mapped[int] = mapped_column(ForeignKey("players.id", ondelete="CASCADE"), primary_key=True)
+    rating: Mapped[float] = mapped_column(nullable=False)
+    games_count: Mapped[int] = mapped_column(nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<PlayerRating player_id={self.player_id} rating={self.rating}>"
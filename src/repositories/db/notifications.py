@@ -0,0 +1,77 @@
+"""
+Changes of games are published with PostgreSQL NOTIFY, so other processes learn about them
+without waiting for caches TTL or polling the database
+"""
+
+import asyncio
+import logging
+from collections.abc import Callable
+
+import asyncpg
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from .cache import ChangedCaches
+from .dialects import POSTGRESQL
+
+GAMES_CHANGES_CHANNEL = "games_changes"
+ALL_GAMES = "*"  # payload sent when players are changed, players are shown in all games
+LISTENER_RECONNECT_DELAY = 5.0
+
+
+async def notify_changes(session: AsyncSession, changed_caches: ChangedCaches) -> None:
+    """Must be called before commit, PostgreSQL delivers notifications when the transaction is committed"""
+    if session.bind.dialect.name != POSTGRESQL:
+        return
+    payloads = [ALL_GAMES] if changed_caches.all_games else [str(game_id) for game_id in changed_caches.games_ids]
+    for payload in payloads:
+        await session.execute(select(func.pg_notify(GAMES_CHANGES_CHANNEL, payload)))
+
+
+def _changed_caches_of(payload: str) -> ChangedCaches:
+    changed_caches = ChangedCaches()
+    if payload == ALL_GAMES:
+        changed_caches.players_changed()
+    else:
+        changed_caches.game_changed(int(payload))
+    return changed_caches
+
+
+class GamesChangesListener:
+    """
+    Listens to games changes on a single connection, invalidates caches of the process and calls `on_change`.
+    `on_change` is also called after every (re)connection, since changes made while not listening are missed.
+    """
+
+    def __init__(self, engine: AsyncEngine, on_change: Callable[[], None]) -> None:
+        self._engine = engine
+        self._on_change = on_change
+
+    def _on_notification(self, _connection: asyncpg.Connection, _pid: int, _channel: str, payload: str) -> None:
+        _changed_caches_of(payload)
+        self._on_change()
+
+    async def _listen(self) -> None:
+        """Listens until connection is lost"""
+        async with self._engine.connect() as conn:
+            connection: asyncpg.Connection = (await conn.get_raw_connection()).driver_connection
+            terminated = asyncio.Event()
+            connection.add_termination_listener(lambda _: terminated.set())
+            await connection.add_listener(GAMES_CHANGES_CHANNEL, self._on_notification)
+            _changed_caches_of(ALL_GAMES)
+            self._on_change()
+            try:
+                await terminated.wait()
+            finally:
+                if not connection.is_closed():
+                    await connection.remove_listener(GAMES_CHANGES_CHANNEL, self._on_notification)
+
+    async def run(self) -> None:
+        """Listens until cancelled, reconnecting after connection errors"""
+        while True:
+            try:
+                await self._listen()
+                logging.warning("Games changes listener connection is lost")
+            except Exception:
+                logging.exception("Games changes listener connection failed")
+            await asyncio.sleep(LISTENER_RECONNECT_DELAY)
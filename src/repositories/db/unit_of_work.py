@@ -0,0 +1,73 @@
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Self
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from .cache import ChangedCaches
+from .notifications import notify_changes
+
+_current_unit_of_work: ContextVar["UnitOfWork | None"] = ContextVar("current_unit_of_work", default=None)
+
+
+class UnitOfWork:
+    """
+    Session shared by all DBRepository instances entered while unit of work is active in current context.
+    Repositories only flush, the transaction is committed once on exit or rolled back if exception is raised.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker) -> None:
+        self._session_maker = session_factory
+        self.changed_caches = ChangedCaches()
+
+    async def __aenter__(self) -> Self:
+        self.session: AsyncSession = self._session_maker()
+        self.changed_caches = ChangedCaches()
+        self._commit_callbacks: list[Callable[[], None]] = []
+        self._token = _current_unit_of_work.set(self)
+        return self
+
+    def on_commit(self, callback: Callable[[], None]) -> None:
+        self._commit_callbacks.append(callback)
+
+    async def commit(self) -> None:
+        """Commits changes made so far, repositories entered later continue in a new transaction of the session"""
+        callbacks, self._commit_callbacks = self._commit_callbacks, []
+        try:
+            await notify_changes(self.session, self.changed_caches)
+            await self.session.commit()
+        except Exception as e:
+            await self.session.rollback()
+            raise e
+        finally:
+            self.changed_caches.invalidate()
+            self.changed_caches = ChangedCaches()
+        for callback in callbacks:
+            callback()
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        _current_unit_of_work.reset(self._token)
+        try:
+            if exc_type is None:
+                await self.commit()
+            else:
+                await self.session.rollback()
+                self.changed_caches.invalidate()
+                self._commit_callbacks.clear()
+        finally:
+            await self.session.close()
+
+
+def get_current_unit_of_work() -> UnitOfWork | None:
+    return _current_unit_of_work.get()
+
+
+@contextmanager
+def without_unit_of_work() -> Iterator[None]:
+    """Repositories entered inside use their own sessions and commit on exit, even if unit of work is active"""
+    token = _current_unit_of_work.set(None)
+    try:
+        yield
+    finally:
+        _current_unit_of_work.reset(token)
@@ -6,9 +6,15 @@ from .create_player import CreatePlayerUseCase
 from .delete_player import DeletePlayerUseCase
 from .end_game import EndGameUseCase
 from .get_games import GetGamesUseCase
+from .get_leaderboard import GetLeaderboardUseCase
+from .get_player_pairs import GetPlayerPairsUseCase
 from .get_player_stats import GetPlayerStatsUseCase
 from .get_players import GetPlayersUseCase
 from .get_seat import GetSeatUseCase
+from .get_seats_stats import GetSeatsStatsUseCase
+from .history_transfer import HistoryTransferUseCase
+from .player_stats_projection import PlayerStatsProjectionUseCase
+from .ratings import RatingsUseCase
 from .set_player_avatar import SetPlayerAvatarUseCase
 from .set_player_nickname import SetPlayerNicknameUseCase
 from .users import UsersUseCase
@@ -1,6 +1,7 @@
 import core
 from usecases.errors import ValidationError
 from usecases.interfaces import DBRepositoryInterface
+from usecases.schemas import GameSchema
 
 
 class AssignPlayerToSeatUseCase:
@@ -20,19 +21,17 @@ class AssignPlayerToSeatUseCase:
         player_id: int,
         seat_number: int,
         role: core.Roles,
-    ) -> None:
+    ) -> GameSchema:
         """
         If player is already in game, remove him from game seat.
         If seat is already taken, remove player from seat.
         Clear game first killed and best move.
         Add player to game.
+        Returns updated game.
         """
         self._validate_seat_number(seat_number=seat_number)
         async with self._db as db:
-            await db.remove_player_from_game(game_id, player_id)
-            await db.remove_player_on_seat(game_id, seat_number=seat_number)
-            await db.clear_game_first_killed_and_best_move(game_id=game_id)
-            await db.add_player(
+            return await db.reseat_player(
                 game_id=game_id,
                 player_id=player_id,
                 seat_number=seat_number,
@@ -1,8 +1,9 @@
 import core
 from core.games import RolesQuantity
 from usecases.errors import ValidationError
+from usecases.get_player_pairs import pairs_stats
 from usecases.interfaces import DBRepositoryInterface
-from usecases.schemas import PlayerInGameSchema, UpdateGameSchema
+from usecases.schemas import GameSchema, PlayerInGameSchema, PlayerRatingSchema
 
 
 class EndGameUseCase:
@@ -52,14 +53,43 @@ class EndGameUseCase:
         if best_move is not None and len(best_move) != (expected := RolesQuantity.MAFIA + RolesQuantity.DON):
             raise ValidationError(f"Wrong best move players count. got {len(best_move)} != {expected} expected")
 
+    @staticmethod
+    def _validate_game_status(status: core.GameStatuses) -> None:
+        if status != core.GameStatuses.DRAFT:
+            raise ValidationError("Game is already ended")
+
+    @staticmethod
+    async def _rate_game(db: DBRepositoryInterface, game: GameSchema, result: core.GameResults) -> None:
+        players = sorted(game.players, key=lambda p: p.number)
+        locked_ratings = {r.player_id: r for r in await db.lock_players_ratings([p.id for p in players])}
+        ratings = [locked_ratings[p.id] for p in players]
+        new_ratings = core.rate_game([r.rating for r in ratings], [p.role for p in players], result)
+        await db.save_players_ratings(
+            [
+                PlayerRatingSchema(player_id=r.player_id, rating=new_rating, games_count=r.games_count + 1)
+                for r, new_rating in zip(ratings, new_ratings, strict=True)
+            ]
+        )
+
+    @classmethod
+    def validate_game(cls, game: GameSchema, result: core.GameResults | None) -> None:
+        """Checks that game may end with the result, raises ValidationError otherwise"""
+        cls._validate_game_result(result)
+        cls._validate_players_numbers(game.players)
+        cls._validate_best_move(game.best_move, game.first_killed)
+        cls._validate_players_quantity(game.players)
+        cls._validate_roles_quantity(game.players)
+
     async def end_game(self, game_id: int, result: core.GameResults) -> None:
         async with self._db as db:
             game = await db.get_game_by_id(game_id)
-            self._validate_players_numbers(game.players)
-            self._validate_best_move(game.best_move, game.first_killed)
-            self._validate_players_quantity(game.players)
-            self._validate_roles_quantity(game.players)
-            await self._db.update_game(
-                game_id=game_id,
-                data=UpdateGameSchema(result=result, status=core.GameStatuses.ENDED),
-            )
+            self._validate_game_status(game.status)
+            self.validate_game(game, result)
+            # status is checked again by the update, so the game is applied to projections once
+            if not await db.end_game(game_id, result):
+                raise ValidationError("Game is already ended")
+            await db.apply_game_to_player_stats(game_id=game_id)
+            await db.apply_game_to_leaderboard(game_id=game_id)
+            await self._rate_game(db, game, result)
+            # pairs are kept in memory of the process, so the game is added only if it is ended in the database
+            db.on_commit(lambda: pairs_stats.add_games([(game_id, p.id, p.role, result) for p in game.players]))
@@ -1,6 +1,15 @@
-from core import GameStatuses
-from usecases.interfaces import DBRepositoryInterface
-from usecases.schemas import GameSchema
+import datetime
+from collections.abc import AsyncIterator
+
+from usecases.interfaces import DBRepositoryInterface, GamesFetchStrategy
+from usecases.schemas import (
+    GameSchema,
+    GameStateSchema,
+    GameStateSeatSchema,
+    GameVersionSchema,
+    GamesCursorSchema,
+    GamesPageSchema,
+)
 
 
 class GetGamesUseCase:
@@ -9,32 +18,72 @@ class GetGamesUseCase:
 
     async def get_game(self, game_id: int) -> GameSchema:
         async with self._db as db:
-            return await db.get_game_by_id(game_id)
+            return await db.get_game_by_id(game_id, strategy=GamesFetchStrategy.JSON_AGG)
 
-    async def get_ended_games(
+    async def iter_ended_games(
         self,
-        limit: int | None = None,
-        offset: int | None = None,
-    ) -> tuple[list[GameSchema], int]:
+        since: datetime.datetime | None = None,
+        until: datetime.datetime | None = None,
+    ) -> AsyncIterator[GameSchema]:
+        """Ended games created in [since, until) oldest first, fetched from the database while iterated"""
+        async with self._db as db:
+            async for game in db.iter_ended_games(since=since, until=until):
+                yield game
+
+    async def get_ended_games_page(self, limit: int, cursor: GamesCursorSchema | None = None) -> GamesPageSchema:
         async with self._db as db:
-            games = await db.get_games(
-                status=GameStatuses.ENDED,
-            )
-            count = await db.get_ended_games_count()
-            match limit, offset:
-                case None, None:
-                    ...
-                case _, None:
-                    games = games[:limit]
-                case None, _:
-                    games = games[offset:]
-                case _, _:
-                    games = games[offset:limit + offset]
-            return games, count
+            games = await db.get_ended_games_summaries(limit=limit, cursor=cursor)
+            if cursor is not None and cursor.backward and len(games) <= limit:
+                # Reached the newest games, so the first page is shown
+                cursor = None
+                games = await db.get_ended_games_summaries(limit=limit, cursor=cursor)
+
+        if cursor is not None and cursor.backward:
+            has_newer, has_older = True, True
+            games = games[-limit:]
+        else:
+            has_newer, has_older = cursor is not None, len(games) > limit
+            games = games[:limit]
+        return GamesPageSchema(
+            games=games,
+            previous_page=(
+                GamesCursorSchema(created_at=games[0].created_at, id=games[0].id, backward=True)
+                if games and has_newer
+                else None
+            ),
+            next_page=GamesCursorSchema(created_at=games[-1].created_at, id=games[-1].id) if has_older else None,
+        )
 
     async def get_last_game_in_draft(self) -> GameSchema | None:
         async with self._db as db:
-            games = await db.get_games(status=GameStatuses.DRAFT)
-            if not games:
-                return None
-            return sorted(games, key=lambda g: g.created_at)[-1]
+            return await db.get_last_game_in_draft()
+
+    async def get_game_version(self, game_id: int) -> GameVersionSchema:
+        async with self._db as db:
+            return await db.get_game_version(game_id)
+
+    async def get_draft_game_version(self) -> GameVersionSchema | None:
+        async with self._db as db:
+            return await db.get_draft_game_version()
+
+    async def get_draft_game_state(self) -> GameStateSchema | None:
+        game = await self.get_last_game_in_draft()
+        if game is None:
+            return None
+        return GameStateSchema(
+            id=game.id,
+            version=game.version,
+            status=game.status,
+            seats=[
+                GameStateSeatSchema(
+                    number=p.number,
+                    player_id=p.id,
+                    nickname=p.nickname,
+                    avatar_path=p.avatar_path,
+                    role=p.role,
+                )
+                for p in sorted(game.players, key=lambda p: p.number)
+            ],
+            first_killed=game.first_killed.number if game.first_killed else None,
+            best_move=sorted(p.number for p in game.best_move or ()),
+        )
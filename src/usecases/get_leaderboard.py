@@ -0,0 +1,50 @@
+import datetime
+
+import core
+from usecases.interfaces import DBRepositoryInterface
+from usecases.schemas import LeaderboardCursorSchema, LeaderboardEntrySchema, LeaderboardPageSchema
+
+
+class GetLeaderboardUseCase:
+    def __init__(self, db: DBRepositoryInterface) -> None:
+        self._db = db
+
+    @staticmethod
+    def _get_cursor(entry: LeaderboardEntrySchema, backward: bool = False) -> LeaderboardCursorSchema:
+        return LeaderboardCursorSchema(
+            win_rate=entry.win_rate,
+            games_count=entry.games_count,
+            player_id=entry.player_id,
+            backward=backward,
+        )
+
+    async def get_leaderboard_page(
+        self,
+        category: core.LeaderboardCategories,
+        min_games: int,
+        limit: int,
+        cursor: LeaderboardCursorSchema | None = None,
+        since: datetime.datetime | None = None,
+        until: datetime.datetime | None = None,
+    ) -> LeaderboardPageSchema:
+        filters = {"category": category, "min_games": min_games, "limit": limit, "since": since, "until": until}
+        async with self._db as db:
+            entries = await db.get_leaderboard(**filters, cursor=cursor)
+            if cursor is not None and cursor.backward and len(entries) <= limit:
+                # Reached the top of leaderboard, so the first page is shown
+                cursor = None
+                entries = await db.get_leaderboard(**filters, cursor=cursor)
+
+        if cursor is not None and cursor.backward:
+            has_higher, has_lower = True, True
+            entries = entries[-limit:]
+        else:
+            has_higher, has_lower = cursor is not None, len(entries) > limit
+            entries = entries[:limit]
+        return LeaderboardPageSchema(
+            category=category,
+            min_games=min_games,
+            entries=entries,
+            previous_page=self._get_cursor(entries[0], backward=True) if entries and has_higher else None,
+            next_page=self._get_cursor(entries[-1]) if has_lower else None,
+        )
@@ -0,0 +1,65 @@
+import core
+from usecases.interfaces import DBRepositoryInterface
+from usecases.schemas import PlayerPairStatsSchema
+
+# Pairs of ended games are kept in memory of the process. Ended games never change, so games ended
+# by other processes are found by ids and added, games ended by this process are added by EndGameUseCase
+# once they are committed.
+pairs_stats = core.PairsStats()
+MAX_ADDED_GAMES = 1000  # whole history is reloaded if more games were ended since the last sync
+
+
+async def sync_pairs_stats(db: DBRepositoryInterface) -> None:
+    if await db.get_ended_games_count() == len(pairs_stats.games_ids):
+        return
+    ended_games_ids = set(await db.get_ended_games_ids())
+    new_games_ids = ended_games_ids - pairs_stats.games_ids
+    if pairs_stats.games_ids <= ended_games_ids and len(new_games_ids) <= MAX_ADDED_GAMES:
+        pairs_stats.add_games(await db.get_ended_games_participants(games_ids=list(new_games_ids)))
+    else:
+        pairs_stats.clear()
+        pairs_stats.add_games(await db.get_ended_games_participants())
+
+
+class GetPlayerPairsUseCase:
+    def __init__(self, db: DBRepositoryInterface) -> None:
+        self._db = db
+
+    @staticmethod
+    def _get_pair_stats(other_player_id: int, nickname: str | None, counters: list[int]) -> PlayerPairStatsSchema:
+        together_games_count, together_won_games_count, against_games_count, against_won_games_count = counters
+        return PlayerPairStatsSchema(
+            player_id=other_player_id,
+            nickname=nickname,
+            together_games_count=together_games_count,
+            together_won_games_count=together_won_games_count,
+            against_games_count=against_games_count,
+            against_won_games_count=against_won_games_count,
+        )
+
+    async def get_player_pairs(self, player_id: int) -> list[PlayerPairStatsSchema]:
+        """returns stats of the player with everyone who played with them, most frequent pairs first"""
+        async with self._db as db:
+            await db.get_player_by_id(player_id)
+            await sync_pairs_stats(db)
+            pairs = pairs_stats.get_player_pairs(player_id)
+            players = {p.id: p for p in await db.get_players_by_ids([other_player_id for other_player_id, _ in pairs])}
+        entries = [
+            self._get_pair_stats(
+                other_player_id,
+                players[other_player_id].nickname if other_player_id in players else None,
+                counters,
+            )
+            for other_player_id, counters in pairs
+        ]
+        entries.sort(key=lambda e: (e.together_games_count + e.against_games_count, e.player_id), reverse=True)
+        return entries
+
+    async def get_pair_stats(self, player_id: int, other_player_id: int) -> PlayerPairStatsSchema:
+        """returns stats of the player with the other player, zeros if they never played together"""
+        async with self._db as db:
+            await db.get_player_by_id(player_id)
+            other_player = await db.get_player_by_id(other_player_id)
+            await sync_pairs_stats(db)
+        counters = dict(pairs_stats.get_player_pairs(player_id)).get(other_player_id, [0, 0, 0, 0])
+        return self._get_pair_stats(other_player_id, other_player.nickname, counters)
@@ -0,0 +1,46 @@
+import datetime
+
+import core
+from usecases.interfaces import DBRepositoryInterface
+from usecases.schemas import SeatRoleStatsSchema, SeatStatsSchema
+
+
+class GetSeatsStatsUseCase:
+    def __init__(self, db: DBRepositoryInterface) -> None:
+        self._db = db
+
+    async def get_seats_stats(
+        self,
+        player_id: int | None = None,
+        since: datetime.datetime | None = None,
+        until: datetime.datetime | None = None,
+    ) -> list[SeatStatsSchema]:
+        """
+        returns stats of every seat of the player or of the whole club, ordered by seat number.
+        Only games created in [since, until) are counted
+        """
+        async with self._db as db:
+            if player_id is not None:
+                await db.get_player_by_id(player_id)
+            rows = {
+                (row.number, row.role): row
+                for row in await db.get_seats_stats(player_id=player_id, since=since, until=until)
+            }
+        seats = []
+        for number in range(1, core.MAX_PLAYERS + 1):
+            roles = [
+                rows.get(
+                    (number, role),
+                    SeatRoleStatsSchema(number=number, role=role, games_count=0, won_games_count=0),
+                )
+                for role in core.Roles
+            ]
+            seats.append(
+                SeatStatsSchema(
+                    number=number,
+                    games_count=sum(r.games_count for r in roles),
+                    won_games_count=sum(r.won_games_count for r in roles),
+                    roles=roles,
+                )
+            )
+        return seats
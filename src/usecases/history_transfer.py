@@ -0,0 +1,115 @@
+import csv
+import datetime
+from collections.abc import Iterable, Iterator
+from itertools import batched, groupby
+
+import core
+from usecases.end_game import EndGameUseCase
+from usecases.errors import ValidationError
+from usecases.interfaces import DBRepositoryInterface, HistoryOutput
+from usecases.ratings import RatingsUseCase
+from usecases.schemas import GameSchema, PlayerInGameSchema, PlayerSchema
+
+IMPORT_BATCH_SIZE = 1000
+TRUE_VALUES = ("t", "true", "1")  # COPY writes booleans as t and f
+
+
+def _read_players(lines: Iterable[str]) -> Iterator[PlayerSchema]:
+    for row in csv.DictReader(lines):
+        try:
+            yield PlayerSchema(id=int(row["id"]), fio=row["fio"] or None, nickname=row["nickname"] or None)
+        except (KeyError, ValueError) as e:
+            raise ValidationError(f"Player row {row} is not valid: {e}") from e
+
+
+def _read_game(row: dict[str, str], participants_rows: list[dict[str, str]]) -> GameSchema:
+    participants = [
+        (
+            PlayerInGameSchema(
+                id=int(p["player_id"]),
+                fio=None,
+                nickname=None,
+                role=core.Roles(p["role"]),
+                number=int(p["number"]),
+            ),
+            p,
+        )
+        for p in participants_rows
+    ]
+    return GameSchema(
+        id=int(row["id"]),
+        comments=row["comments"],
+        result=core.GameResults(row["result"]) if row["result"] else None,
+        status=core.GameStatuses.ENDED,
+        created_at=datetime.datetime.fromisoformat(row["created_at"]),
+        players={player for player, _ in participants},
+        best_move={player for player, p in participants if p["in_best_move"].lower() in TRUE_VALUES} or None,
+        first_killed=next((player for player, p in participants if p["is_first_killed"].lower() in TRUE_VALUES), None),
+    )
+
+
+def _read_games(games_lines: Iterable[str], participants_lines: Iterable[str]) -> Iterator[GameSchema]:
+    """Participants of a game are adjacent and games go in the same order in both files"""
+    participants = groupby(csv.DictReader(participants_lines), key=lambda p: p["game_id"])
+    for row in csv.DictReader(games_lines):
+        game_id, participants_rows = next(participants, (None, ()))
+        if game_id != row["id"]:
+            raise ValidationError(f"Participants of game {row['id']} must follow the order of games")
+        try:
+            yield _read_game(row, list(participants_rows))
+        except (KeyError, ValueError) as e:
+            raise ValidationError(f"Game {row['id']} is not valid: {e}") from e
+    if (rest := next(participants, None)) is not None:
+        raise ValidationError(f"Participants of game {rest[0]} are given, but the game is not")
+
+
+class HistoryTransferUseCase:
+    """Moves players and ended games between instances as CSV files, see `DBRepositoryInterface.export_history`"""
+
+    def __init__(self, db: DBRepositoryInterface) -> None:
+        self._db = db
+
+    async def export_history(
+        self,
+        players_output: HistoryOutput,
+        games_output: HistoryOutput,
+        participants_output: HistoryOutput,
+    ) -> None:
+        async with self._db as db:
+            await db.export_history(players_output, games_output, participants_output)
+
+    async def import_history(
+        self,
+        players_lines: Iterable[str],
+        games_lines: Iterable[str],
+        participants_lines: Iterable[str],
+        batch_size: int = IMPORT_BATCH_SIZE,
+    ) -> tuple[int, int]:
+        """
+        Imports CSV lines of players, games and participants keeping their ids and returns counts of imported
+        players and games. Every batch is validated and inserted in its own transaction, so batches before
+        an invalid one stay imported. Stats, leaderboard and ratings are rebuilt in any case
+        """
+        players_count = games_count = 0
+        try:
+            for players in batched(_read_players(players_lines), batch_size, strict=False):
+                async with self._db as db:
+                    await db.import_players(list(players))
+                players_count += len(players)
+            for games in batched(_read_games(games_lines, participants_lines), batch_size, strict=False):
+                for game in games:
+                    try:
+                        EndGameUseCase.validate_game(game, game.result)
+                    except ValidationError as e:
+                        raise ValidationError(f"Game {game.id} is not valid: {e}") from e
+                async with self._db as db:
+                    await db.import_games(list(games))
+                games_count += len(games)
+        finally:
+            if players_count or games_count:
+                async with self._db as db:
+                    await db.reset_ids_sequences()
+                    await db.rebuild_player_stats()
+                    await db.rebuild_leaderboard()
+                await RatingsUseCase(self._db).recompute()
+        return players_count, games_count
@@ -1,2 +1,9 @@
 from .avatars_repository import AvatarsRepositoryInterface
-from .db import DBRepositoryInterface
+from .db import (
+    GAMES_CSV_COLUMNS,
+    PARTICIPANTS_CSV_COLUMNS,
+    PLAYERS_CSV_COLUMNS,
+    DBRepositoryInterface,
+    GamesFetchStrategy,
+    HistoryOutput,
+)
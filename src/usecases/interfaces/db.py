@@ -1,4 +1,7 @@
+import datetime
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Awaitable, Callable
+from enum import StrEnum
 from typing import Self
 
 import core
@@ -6,14 +9,38 @@ from usecases.schemas import (
     CreateGameSchema,
     CreatePlayerSchema,
     GameSchema,
+    GameSummarySchema,
+    GameVersionSchema,
+    GamesCursorSchema,
+    LeaderboardCursorSchema,
+    LeaderboardEntrySchema,
+    PlayerRatingSchema,
     PlayerSchema,
+    PlayerStatsCountersSchema,
     RawGameSchema,
+    SeatRoleStatsSchema,
     UpdateGameSchema,
     UpdatePlayerSchema,
     UserSchema,
 )
 
 
+class GamesFetchStrategy(StrEnum):
+    """How participants of games are loaded"""
+
+    JOINED = "joined"  # one row per participant, deduplicated by ORM
+    SELECTIN = "selectin"  # second query for participants of all loaded games
+    JSON_AGG = "json_agg"  # one row per game with participants aggregated by database
+
+
+# Columns of history CSV files written by `export_history`, the first line of a file is header
+PLAYERS_CSV_COLUMNS = ("id", "fio", "nickname")
+GAMES_CSV_COLUMNS = ("id", "result", "comments", "created_at")
+PARTICIPANTS_CSV_COLUMNS = ("game_id", "player_id", "role", "number", "in_best_move", "is_first_killed")
+# Receives exported data chunk by chunk
+HistoryOutput = Callable[[bytes], Awaitable[None]]
+
+
 class DBRepositoryInterface(ABC):
     @abstractmethod
     async def __aenter__(self) -> Self: ...
@@ -21,12 +48,20 @@ class DBRepositoryInterface(ABC):
     @abstractmethod
     async def __aexit__(self, exc_type, exc_val, exc_tb) -> None: ...
 
+    @abstractmethod
+    def on_commit(self, callback: Callable[[], None]) -> None:
+        """Calls callback once changes of the repository are committed, it is dropped if they are rolled back"""
+
     @abstractmethod
     async def create_player(self, player: CreatePlayerSchema) -> None: ...
 
     @abstractmethod
     async def create_user(self, user: UserSchema) -> None: ...
 
+    @abstractmethod
+    async def create_user_if_not_exists(self, user: UserSchema) -> bool:
+        """returns True if user was created"""
+
     @abstractmethod
     async def get_players(
         self,
@@ -46,9 +81,20 @@ class DBRepositoryInterface(ABC):
     @abstractmethod
     async def get_player_by_id(self, player_id: int) -> PlayerSchema: ...
 
+    @abstractmethod
+    async def get_players_by_ids(self, players_ids: list[int]) -> list[PlayerSchema]:
+        """returns existing players of the given ids in any order"""
+
     @abstractmethod
     async def add_player(self, game_id: int, player_id: int, seat_number: int, role: core.Roles) -> None: ...
 
+    @abstractmethod
+    async def reseat_player(self, game_id: int, player_id: int, seat_number: int, role: core.Roles) -> GameSchema:
+        """
+        Puts player on seat with role in one statement: removes player from his previous seat and the other
+        player from this seat, clears game first killed and best move. Returns updated game
+        """
+
     @abstractmethod
     async def get_players_count(self) -> int: ...
 
@@ -64,6 +110,10 @@ class DBRepositoryInterface(ABC):
     @abstractmethod
     async def update_game(self, game_id: int, data: UpdateGameSchema) -> None: ...
 
+    @abstractmethod
+    async def end_game(self, game_id: int, result: core.GameResults) -> bool:
+        """Atomically ends the game if it is in draft, returns False if it is not, e.g. was ended concurrently"""
+
     @abstractmethod
     async def assign_player_as_first_killed(self, game_id: int, player_number: int) -> None: ...
 
@@ -77,11 +127,51 @@ class DBRepositoryInterface(ABC):
     async def get_player_by_number(self, game_id: int, player_number: int) -> PlayerSchema: ...
 
     @abstractmethod
-    async def get_game_by_id(self, game_id: int) -> GameSchema: ...
+    async def get_game_by_id(
+        self,
+        game_id: int,
+        strategy: GamesFetchStrategy = GamesFetchStrategy.JOINED,
+    ) -> GameSchema: ...
 
     @abstractmethod
     async def get_ended_games_count(self) -> int: ...
 
+    @abstractmethod
+    async def get_ended_games_ids(self) -> list[int]: ...
+
+    @abstractmethod
+    async def get_game_version(self, game_id: int) -> GameVersionSchema:
+        """Version of the game without loading its participants, raises NotFoundError"""
+
+    @abstractmethod
+    async def get_draft_game_version(self) -> GameVersionSchema | None:
+        """Version of the last game in draft without loading its participants"""
+
+    @abstractmethod
+    async def get_last_game_in_draft(self) -> GameSchema | None: ...
+
+    @abstractmethod
+    async def get_ended_games_summaries(
+        self,
+        limit: int,
+        cursor: GamesCursorSchema | None,
+    ) -> list[GameSummarySchema]:
+        """
+        returns summaries of up to `limit` + 1 ended games next to cursor ordered by (created_at, id) descending.
+        Extra game is the last one for forward cursor and the first one for backward cursor.
+        """
+
+    @abstractmethod
+    def iter_ended_games(
+        self,
+        since: datetime.datetime | None = None,
+        until: datetime.datetime | None = None,
+    ) -> AsyncIterator[GameSchema]:
+        """
+        yields ended games created in [since, until) with their participants ordered by (created_at, id).
+        Games are fetched in batches while iterated, so iteration must end before the repository context exits.
+        """
+
     @abstractmethod
     async def get_games(
         self,
@@ -91,4 +181,120 @@ class DBRepositoryInterface(ABC):
         result__in: list[core.GameResults] | None = None,
         status: core.GameStatuses | None = None,
         is_won: bool | None = None,
+        created_at__gte: datetime.datetime | None = None,
+        created_at__lt: datetime.datetime | None = None,
+        strategy: GamesFetchStrategy = GamesFetchStrategy.JOINED,
     ) -> list[GameSchema]: ...
+
+    @abstractmethod
+    async def get_player_stats_counters(
+        self,
+        player_id: int,
+        since: datetime.datetime | None = None,
+        until: datetime.datetime | None = None,
+    ) -> PlayerStatsCountersSchema:
+        """Counters of player's ended games created in [since, until), bounds are optional"""
+
+    @abstractmethod
+    async def get_seats_stats(
+        self,
+        player_id: int | None = None,
+        since: datetime.datetime | None = None,
+        until: datetime.datetime | None = None,
+    ) -> list[SeatRoleStatsSchema]:
+        """
+        returns counters of ended games created in [since, until) grouped by seat number and role,
+        of the player or of all players. Pairs of seat number and role without games are skipped
+        """
+
+    @abstractmethod
+    async def apply_game_to_player_stats(self, game_id: int) -> None:
+        """Adds ended game to its players' stored counters"""
+
+    @abstractmethod
+    async def rebuild_player_stats(self) -> None:
+        """Recomputes stored counters of all players from games history"""
+
+    @abstractmethod
+    async def get_inconsistent_player_stats(self) -> list[int]:
+        """returns ids of players whose stored counters differ from games history"""
+
+    @abstractmethod
+    async def apply_game_to_leaderboard(self, game_id: int) -> None:
+        """Updates leaderboard entries of ended game players from their stored counters"""
+
+    @abstractmethod
+    async def rebuild_leaderboard(self) -> None:
+        """Recomputes leaderboard entries of all players from stored counters"""
+
+    @abstractmethod
+    async def get_leaderboard(
+        self,
+        category: core.LeaderboardCategories,
+        min_games: int,
+        limit: int,
+        cursor: LeaderboardCursorSchema | None,
+        since: datetime.datetime | None = None,
+        until: datetime.datetime | None = None,
+    ) -> list[LeaderboardEntrySchema]:
+        """
+        returns up to `limit` + 1 entries of players with at least `min_games` games next to cursor
+        ordered by (win_rate, games_count, player_id) descending.
+        Extra entry is the last one for forward cursor and the first one for backward cursor.
+        With `since` or `until` only ended games created in [since, until) are counted.
+        """
+
+    @abstractmethod
+    async def get_players_ratings(self, players_ids: list[int]) -> list[PlayerRatingSchema]:
+        """returns stored ratings of players, players who were never rated are skipped"""
+
+    @abstractmethod
+    async def lock_players_ratings(self, players_ids: list[int]) -> list[PlayerRatingSchema]:
+        """
+        returns ratings of all the players locked until the end of transaction, so concurrently ended games
+        sharing players are rated one after another. Players who were never rated get the initial rating
+        """
+
+    @abstractmethod
+    async def save_players_ratings(self, ratings: list[PlayerRatingSchema]) -> None: ...
+
+    @abstractmethod
+    async def replace_players_ratings(self, ratings: list[PlayerRatingSchema]) -> None:
+        """Removes all stored ratings and saves the given ones"""
+
+    @abstractmethod
+    async def get_ended_games_participants(
+        self,
+        games_ids: list[int] | None = None,
+    ) -> list[tuple[int, int, core.Roles, core.GameResults]]:
+        """
+        returns (game_id, player_id, role, game result) of every participant of ended games, all games by default.
+        Games are ordered by (created_at, id), participants of one game are adjacent
+        """
+
+    @abstractmethod
+    async def export_history(
+        self,
+        players_output: HistoryOutput,
+        games_output: HistoryOutput,
+        participants_output: HistoryOutput,
+    ) -> None:
+        """
+        Streams CSV of all players, ended games and their participants to outputs, see `*_CSV_COLUMNS`.
+        Players and games are ordered by id, participants by (game_id, number)
+        """
+
+    @abstractmethod
+    async def import_players(self, players: list[PlayerSchema]) -> None:
+        """Inserts players keeping their ids, raises ValidationError if an id is taken"""
+
+    @abstractmethod
+    async def import_games(self, games: list[GameSchema]) -> None:
+        """
+        Inserts ended games and their participants keeping games ids,
+        raises ValidationError if an id is taken or a player doesn't exist
+        """
+
+    @abstractmethod
+    async def reset_ids_sequences(self) -> None:
+        """Makes new players and games get ids after the largest stored ones"""
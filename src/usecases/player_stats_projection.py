@@ -0,0 +1,15 @@
+from usecases.interfaces import DBRepositoryInterface
+
+
+class PlayerStatsProjectionUseCase:
+    def __init__(self, db: DBRepositoryInterface) -> None:
+        self._db = db
+
+    async def rebuild(self) -> None:
+        async with self._db as db:
+            await db.rebuild_player_stats()
+            await db.rebuild_leaderboard()
+
+    async def get_inconsistent_players_ids(self) -> list[int]:
+        async with self._db as db:
+            return await db.get_inconsistent_player_stats()
@@ -0,0 +1,19 @@
+import core
+from usecases.interfaces import DBRepositoryInterface
+from usecases.schemas import PlayerRatingSchema
+
+
+class RatingsUseCase:
+    def __init__(self, db: DBRepositoryInterface) -> None:
+        self._db = db
+
+    async def recompute(self, k_factor: float = core.RATING_K_FACTOR) -> int:
+        """Replays all ended games from initial ratings, returns count of rated players"""
+        async with self._db as db:
+            participants = await db.get_ended_games_participants()
+            ratings = [
+                PlayerRatingSchema(player_id=player_id, rating=rating, games_count=games_count)
+                for player_id, rating, games_count in core.replay_games(participants, k_factor=k_factor)
+            ]
+            await db.replace_players_ratings(ratings)
+        return len(ratings)
@@ -1,8 +1,26 @@
 from .games import (
     CreateGameSchema,
     GameSchema,
+    GameStateSchema,
+    GameStateSeatSchema,
+    GameSummarySchema,
+    GameVersionSchema,
+    GamesCursorSchema,
+    GamesPageSchema,
     PlayerInGameSchema,
     RawGameSchema,
     UpdateGameSchema,
 )
-from .users import CreatePlayerSchema, PlayerSchema, PlayerStatsSchema, UpdatePlayerSchema, UserSchema
+from .leaderboard import LeaderboardCursorSchema, LeaderboardEntrySchema, LeaderboardPageSchema
+from .metrics import DBPoolMetricsSchema
+from .pairs import PlayerPairStatsSchema
+from .seats import SeatRoleStatsSchema, SeatStatsSchema
+from .users import (
+    CreatePlayerSchema,
+    PlayerRatingSchema,
+    PlayerSchema,
+    PlayerStatsCountersSchema,
+    PlayerStatsSchema,
+    UpdatePlayerSchema,
+    UserSchema,
+)
@@ -27,6 +27,13 @@ class RawGameSchema(BaseEntity):
     created_at: datetime.datetime
 
 
+class GameSummarySchema(BaseEntity):
+    """Game fields shown in games lists"""
+
+    result: core.GameResults | None
+    created_at: datetime.datetime
+
+
 class GameSchema(BaseEntity):
     """Fulfilled Game"""
 
@@ -37,6 +44,34 @@ class GameSchema(BaseEntity):
     created_at: datetime.datetime
     best_move: set[PlayerInGameSchema] | None
     first_killed: PlayerInGameSchema | None
+    version: int = 1  # increased by every change of the game
+
+
+class GameVersionSchema(BaseModel):
+    """Enough to check whether a client has the current game"""
+
+    id: int
+    version: int
+    status: core.GameStatuses
+
+
+class GameStateSeatSchema(BaseModel):
+    number: int
+    player_id: int
+    nickname: str | None
+    avatar_path: str | None
+    role: core.Roles
+
+
+class GameStateSchema(BaseModel):
+    """Compact game pushed to live overlay"""
+
+    id: int
+    version: int
+    status: core.GameStatuses
+    seats: list[GameStateSeatSchema]  # ordered by number
+    first_killed: int | None  # seat number
+    best_move: list[int]  # seats numbers
 
 
 class CreateGameSchema(BaseModel):
@@ -47,3 +82,17 @@ class CreateGameSchema(BaseModel):
     created_at: datetime.datetime
     best_move: set[PlayerInGameSchema] | None
     first_killed: PlayerInGameSchema | None
+
+
+class GamesCursorSchema(BaseModel):
+    """Position in games list ordered by (created_at, id) descending"""
+
+    created_at: datetime.datetime
+    id: int
+    backward: bool = False  # games newer than position if True, older otherwise
+
+
+class GamesPageSchema(BaseModel):
+    games: list[GameSummarySchema]
+    previous_page: GamesCursorSchema | None
+    next_page: GamesCursorSchema | None
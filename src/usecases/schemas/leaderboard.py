@@ -0,0 +1,32 @@
+from pydantic import BaseModel
+
+import core
+
+
+class LeaderboardEntrySchema(BaseModel):
+    player_id: int
+    nickname: str | None
+    games_count: int
+    won_games_count: int
+    win_rate: float
+
+    @property
+    def win_percent(self) -> float:
+        return round(self.win_rate * 100, 2)
+
+
+class LeaderboardCursorSchema(BaseModel):
+    """Position in leaderboard ordered by (win_rate, games_count, player_id) descending"""
+
+    win_rate: float
+    games_count: int
+    player_id: int
+    backward: bool = False  # entries above position if True, below otherwise
+
+
+class LeaderboardPageSchema(BaseModel):
+    category: core.LeaderboardCategories
+    min_games: int
+    entries: list[LeaderboardEntrySchema]
+    previous_page: LeaderboardCursorSchema | None
+    next_page: LeaderboardCursorSchema | None
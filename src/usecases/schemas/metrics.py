@@ -0,0 +1,21 @@
+from pydantic import BaseModel
+
+
+class DBPoolMetricsSchema(BaseModel):
+    pool_size: int
+    max_overflow: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    checkouts_count: int
+    checkout_timeouts_count: int
+    checkout_wait_total: float
+    checkout_wait_max: float
+
+    @property
+    def max_connections(self) -> int:
+        return self.pool_size + self.max_overflow
+
+    @property
+    def checkout_wait_avg(self) -> float:
+        return self.checkout_wait_total / self.checkouts_count if self.checkouts_count else 0.0
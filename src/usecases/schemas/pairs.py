@@ -0,0 +1,24 @@
+from pydantic import BaseModel
+
+
+class PlayerPairStatsSchema(BaseModel):
+    """Games of a player with the other player: in one team and against each other"""
+
+    player_id: int  # the other player
+    nickname: str | None
+    together_games_count: int
+    together_won_games_count: int
+    against_games_count: int
+    against_won_games_count: int  # won by the player
+
+    @property
+    def together_win_percent(self) -> float | None:
+        if not self.together_games_count:
+            return None
+        return round(self.together_won_games_count / self.together_games_count * 100, 2)
+
+    @property
+    def against_win_percent(self) -> float | None:
+        if not self.against_games_count:
+            return None
+        return round(self.against_won_games_count / self.against_games_count * 100, 2)
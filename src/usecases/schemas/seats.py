@@ -0,0 +1,27 @@
+from pydantic import BaseModel
+
+import core
+
+
+class SeatRoleStatsSchema(BaseModel):
+    """Ended games played on seat number in role"""
+
+    number: int
+    role: core.Roles
+    games_count: int
+    won_games_count: int
+
+    @property
+    def win_percent(self) -> float | None:
+        return round(self.won_games_count / self.games_count * 100, 2) if self.games_count else None
+
+
+class SeatStatsSchema(BaseModel):
+    number: int
+    games_count: int
+    won_games_count: int
+    roles: list[SeatRoleStatsSchema]  # every role, in order of core.Roles
+
+    @property
+    def win_percent(self) -> float | None:
+        return round(self.won_games_count / self.games_count * 100, 2) if self.games_count else None
@@ -1,5 +1,6 @@
 from pydantic import BaseModel
 
+import core
 from usecases.schemas.base import BaseEntity
 
 
@@ -63,3 +64,37 @@ class PlayerStatsSchema(BaseModel):
     one_mafia_best_move_count: int
     two_mafia_best_move_count: int
     three_mafia_best_move_count: int
+
+    rating: float = core.INITIAL_RATING
+
+
+class PlayerStatsCountersSchema(BaseModel):
+    """Raw counters of player's ended games. Team counters are derived from role counters"""
+
+    games_count_total: int
+    won_games_count_total: int
+
+    games_count_as_civilian: int
+    won_games_count_as_civilian: int
+
+    games_count_as_mafia: int
+    won_games_count_as_mafia: int
+
+    games_count_as_don: int
+    won_games_count_as_don: int
+
+    games_count_as_sheriff: int
+    won_games_count_as_sheriff: int
+
+    first_killed_count: int
+    best_move_count_total: int
+    zero_mafia_best_move_count: int
+    one_mafia_best_move_count: int
+    two_mafia_best_move_count: int
+    three_mafia_best_move_count: int
+
+
+class PlayerRatingSchema(BaseModel):
+    player_id: int
+    rating: float = core.INITIAL_RATING
+    games_count: int = 0  # rated games
@@ -10,6 +10,11 @@ class UsersUseCase:
         async with self._db as db:
             await db.create_user(user)
 
+    async def save_user_if_new(self, user: UserSchema) -> bool:
+        """returns True if user was not saved before"""
+        async with self._db as db:
+            return await db.create_user_if_not_exists(user)
+
     async def get_users(self) -> list[UserSchema]:
         async with self._db as db:
             return await db.get_users()
@@ -0,0 +1,150 @@
+"""
+Times repository methods and use cases on synthetic club history.
+
+Every call runs in a transaction which is rolled back, caches are cleared before it.
+Database is taken from DB_* environment variables, `--seed` drops all its tables and generates data.
+Only databases with "bench" in the name are seeded, others require `--force-seed`.
+
+    PYTHONPATH=src python -m tests.benchmarks --seed --players 5000 --games 200000
+    PYTHONPATH=src python -m tests.benchmarks --compare bench_results/<previous commit>.json
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import logging
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+
+from config import DBConfig
+from repositories.db.cache import draft_game_cache, games_cache
+from tests.benchmarks.cases import CASES, Case, Context
+from tests.benchmarks.seed import seed_database
+
+RESULTS_DIR = Path("bench_results")
+NOT_COUNTED_STATEMENTS = ("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")
+
+
+def _get_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def _run_case(engine: AsyncEngine, case: Case, ctx: Context, repeats: int) -> dict:
+    timings = []
+    queries_counts = []
+    for _ in range(case.repeats or repeats):
+        draft_game_cache.invalidate()
+        games_cache.clear()
+        queries = []
+
+        def _count_query(conn, cursor, statement, parameters, context, executemany) -> None:  # noqa: ARG001
+            if not statement.startswith(NOT_COUNTED_STATEMENTS):
+                queries.append(statement)  # noqa: B023 listener is removed before next iteration
+
+        async with engine.connect() as conn:
+            await conn.begin()
+            maker = async_sessionmaker(bind=conn, autoflush=False, join_transaction_mode="create_savepoint")
+            event.listen(engine.sync_engine, "before_cursor_execute", _count_query)
+            try:
+                started_at = time.perf_counter()
+                await case.call(maker, ctx)
+                timings.append(time.perf_counter() - started_at)
+            finally:
+                event.remove(engine.sync_engine, "before_cursor_execute", _count_query)
+            await conn.rollback()
+        queries_counts.append(len(queries))
+    percentiles = statistics.quantiles(timings, n=20, method="inclusive") if len(timings) > 1 else timings * 19
+    return {
+        "repeats": len(timings),
+        "p50_ms": round(statistics.median(timings) * 1000, 3),
+        "p95_ms": round(percentiles[18] * 1000, 3),
+        "queries": statistics.median(queries_counts),
+    }
+
+
+def _print_results(results: dict[str, dict], previous_results: dict[str, dict]) -> None:
+    sys.stdout.write(f"{'case':<45} {'p50 ms':>10} {'p95 ms':>10} {'queries':>8} {'p50 change':>11}\n")
+    for name, result in results.items():
+        change = ""
+        if name in previous_results and previous_results[name]["p50_ms"]:
+            change = f"{(result['p50_ms'] / previous_results[name]['p50_ms'] - 1) * 100:+.1f}%"
+        sys.stdout.write(
+            f"{name:<45} {result['p50_ms']:>10.2f} {result['p95_ms']:>10.2f} {result['queries']:>8g} {change:>11}\n"
+        )
+
+
+async def main(args: argparse.Namespace) -> int:
+    engine = create_async_engine(DBConfig().db_url)
+    if args.seed:
+        logging.info("Seeding %s players and %s games", args.players, args.games)
+        try:
+            await seed_database(engine, players=args.players, games=args.games, force=args.force_seed)
+        except ValueError as e:
+            logging.error(e)
+            await engine.dispose()
+            return 1
+    async with engine.connect() as conn:
+        ctx = await Context.load(conn)
+    cases = [c for c in CASES if args.filter is None or args.filter in c.name]
+    results = {}
+    for case in cases:
+        logging.info("Running %s", case.name)
+        results[case.name] = await _run_case(engine, case, ctx, repeats=args.repeats)
+    await engine.dispose()
+
+    previous_results = json.loads(args.compare.read_text())["results"] if args.compare else {}
+    _print_results(results, previous_results)
+    commit = _get_commit()
+    output = args.output or RESULTS_DIR / f"{commit}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(
+        json.dumps(
+            {
+                "commit": commit,
+                "created_at": datetime.datetime.now(tz=datetime.UTC).isoformat(),
+                "players": len(ctx.players_ids) + len(ctx.players_without_games_ids),
+                "games": len(ctx.ended_games_ids),
+                "results": results,
+            },
+            indent=2,
+        )
+    )
+    logging.info("Results are saved to %s", output)
+    return 0
+
+
+def get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Mafia Helper repository benchmarks")
+    parser.add_argument("--seed", action="store_true", help="drop all tables and generate data before running")
+    parser.add_argument(
+        "--force-seed",
+        action="store_true",
+        help="allow --seed to drop tables of a database which name does not contain bench",
+    )
+    parser.add_argument("--players", type=int, default=5_000, help="players to generate with --seed")
+    parser.add_argument("--games", type=int, default=200_000, help="games to generate with --seed")
+    parser.add_argument("--repeats", type=int, default=20, help="calls of every case")
+    parser.add_argument("--filter", help="run only cases which names contain this string")
+    parser.add_argument("--output", type=Path, help="results json path, bench_results/<commit>.json by default")
+    parser.add_argument("--compare", type=Path, help="results json of previous run to compare p50 with")
+    return parser
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(asyncio.run(main(get_parser().parse_args())))
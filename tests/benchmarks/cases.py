@@ -0,0 +1,268 @@
+import datetime
+import random
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncConnection, async_sessionmaker
+
+from core import GameResults, GameStatuses, LeaderboardCategories, Roles, StatsPeriods, get_period_bounds
+from repositories.db import DBRepository
+from repositories.db.models import Game, Player, PlayerGame
+from usecases import (
+    CreateGameUseCase,
+    EndGameUseCase,
+    GetGamesUseCase,
+    GetLeaderboardUseCase,
+    GetPlayerPairsUseCase,
+    GetPlayerStatsUseCase,
+    GetPlayersUseCase,
+    RatingsUseCase,
+)
+from usecases.get_player_pairs import pairs_stats, sync_pairs_stats
+from usecases.interfaces import GamesFetchStrategy
+from usecases.schemas import CreatePlayerSchema, UpdateGameSchema, UpdatePlayerSchema, UserSchema
+
+HEAVY_CASE_REPEATS = 3
+# season inside seeded history, see seed.FIRST_GAME_AT
+SEASON_SINCE, SEASON_UNTIL = get_period_bounds(StatsPeriods.SEASON, datetime.datetime(2016, 6, 1))  # noqa: DTZ001
+
+
+@dataclass
+class Context:
+    """Ids of seeded data used by benchmark cases"""
+
+    rng: random.Random
+    players_ids: list[int]
+    players_without_games_ids: list[int]
+    ended_games_ids: list[int]
+    draft_game_id: int
+    draft_players_ids: list[int]
+
+    @classmethod
+    async def load(cls, conn: AsyncConnection, seed: int = 0) -> "Context":
+        players_with_games = select(PlayerGame.player_id)
+        draft_game_id = await conn.scalar(select(func.max(Game.id)).where(Game.status == GameStatuses.DRAFT))
+        return cls(
+            rng=random.Random(seed),
+            players_ids=list(await conn.scalars(select(Player.id).where(Player.id.in_(players_with_games)))),
+            players_without_games_ids=list(
+                await conn.scalars(select(Player.id).where(Player.id.not_in(players_with_games)))
+            ),
+            ended_games_ids=list(await conn.scalars(select(Game.id).where(Game.status == GameStatuses.ENDED))),
+            draft_game_id=draft_game_id,
+            draft_players_ids=list(
+                await conn.scalars(select(PlayerGame.player_id).where(PlayerGame.game_id == draft_game_id))
+            ),
+        )
+
+    def player_id(self) -> int:
+        return self.rng.choice(self.players_ids)
+
+    def player_without_games_id(self) -> int:
+        return self.rng.choice(self.players_without_games_ids)
+
+    def player_not_in_draft_id(self) -> int:
+        while (player_id := self.player_id()) in self.draft_players_ids:
+            pass
+        return player_id
+
+    def draft_player_id(self) -> int:
+        return self.rng.choice(self.draft_players_ids)
+
+    def ended_game_id(self) -> int:
+        return self.rng.choice(self.ended_games_ids)
+
+    def seat_number(self) -> int:
+        return self.rng.randint(1, 10)
+
+
+@dataclass
+class Case:
+    name: str
+    call: Callable[[async_sessionmaker, Context], Awaitable]
+    repeats: int | None = None  # overrides suite repeats for slow cases
+
+
+def repository_case(
+    name: str,
+    call: Callable[[DBRepository, Context], Awaitable],
+    repeats: int | None = None,
+) -> Case:
+    async def _call(maker: async_sessionmaker, ctx: Context) -> None:
+        async with DBRepository(maker) as db:
+            await call(db, ctx)
+
+    return Case(name=name, call=_call, repeats=repeats)
+
+
+async def _consume(games: AsyncIterator) -> None:
+    async for _ in games:
+        pass
+
+
+CASES = [
+    repository_case("create_player", lambda db, _: db.create_player(CreatePlayerSchema(fio="fio", nickname="nick"))),
+    repository_case(
+        "create_user",
+        lambda db, ctx: db.create_user(UserSchema(telegram_id=10**9 + ctx.rng.randint(0, 10**6), first_name="user")),
+    ),
+    repository_case(
+        "create_user_if_not_exists",
+        lambda db, _: db.create_user_if_not_exists(UserSchema(telegram_id=1, first_name="user")),
+    ),
+    repository_case("get_players", lambda db, _: db.get_players(limit=10, offset=0)),
+    repository_case("delete_player", lambda db, ctx: db.delete_player(ctx.player_without_games_id())),
+    repository_case(
+        "update_player",
+        lambda db, ctx: db.update_player(ctx.player_id(), UpdatePlayerSchema(nickname="renamed")),
+    ),
+    repository_case("get_users", lambda db, _: db.get_users()),
+    repository_case("get_player_by_id", lambda db, ctx: db.get_player_by_id(ctx.player_id())),
+    repository_case(
+        "add_player",
+        lambda db, ctx: db.add_player(ctx.draft_game_id, ctx.player_not_in_draft_id(), ctx.seat_number(), Roles.MAFIA),
+    ),
+    repository_case(
+        "reseat_player",
+        lambda db, ctx: db.reseat_player(ctx.draft_game_id, ctx.player_id(), ctx.seat_number(), Roles.SHERIFF),
+    ),
+    repository_case("get_players_count", lambda db, _: db.get_players_count()),
+    repository_case(
+        "remove_player_from_game",
+        lambda db, ctx: db.remove_player_from_game(ctx.draft_game_id, ctx.draft_player_id()),
+    ),
+    repository_case(
+        "remove_player_on_seat",
+        lambda db, ctx: db.remove_player_on_seat(ctx.draft_game_id, ctx.seat_number()),
+    ),
+    repository_case("update_game", lambda db, ctx: db.update_game(ctx.draft_game_id, UpdateGameSchema(comments="!"))),
+    repository_case(
+        "assign_player_as_first_killed",
+        lambda db, ctx: db.assign_player_as_first_killed(ctx.draft_game_id, ctx.seat_number()),
+    ),
+    repository_case(
+        "clear_game_first_killed_and_best_move",
+        lambda db, ctx: db.clear_game_first_killed_and_best_move(ctx.draft_game_id),
+    ),
+    repository_case("set_game_best_move", lambda db, ctx: db.set_game_best_move({1, 2, 3}, ctx.draft_game_id)),
+    repository_case(
+        "get_player_by_number",
+        lambda db, ctx: db.get_player_by_number(ctx.draft_game_id, ctx.seat_number()),
+    ),
+    *[
+        repository_case(
+            f"get_game_by_id[{strategy}]",
+            lambda db, ctx, s=strategy: db.get_game_by_id(ctx.ended_game_id(), strategy=s),
+        )
+        for strategy in GamesFetchStrategy
+    ],
+    repository_case("get_ended_games_count", lambda db, _: db.get_ended_games_count()),
+    repository_case("get_last_game_in_draft", lambda db, _: db.get_last_game_in_draft()),
+    repository_case("get_ended_games_summaries", lambda db, _: db.get_ended_games_summaries(limit=10, cursor=None)),
+    *[
+        repository_case(
+            f"get_games_by_player[{strategy}]",
+            lambda db, ctx, s=strategy: db.get_games(player_id=ctx.player_id(), strategy=s),
+        )
+        for strategy in GamesFetchStrategy
+    ],
+    repository_case(
+        "get_games_ended[json_agg]",
+        lambda db, _: db.get_games(status=GameStatuses.ENDED, strategy=GamesFetchStrategy.JSON_AGG),
+        repeats=HEAVY_CASE_REPEATS,
+    ),
+    repository_case("get_player_stats_counters", lambda db, ctx: db.get_player_stats_counters(ctx.player_id())),
+    repository_case(
+        "get_player_stats_counters[season]",
+        lambda db, ctx: db.get_player_stats_counters(ctx.player_id(), since=SEASON_SINCE, until=SEASON_UNTIL),
+    ),
+    repository_case("get_seats_stats[player]", lambda db, ctx: db.get_seats_stats(player_id=ctx.player_id())),
+    repository_case("get_seats_stats[club]", lambda db, _: db.get_seats_stats(), repeats=HEAVY_CASE_REPEATS),
+    repository_case(
+        "get_seats_stats[club season]",
+        lambda db, _: db.get_seats_stats(since=SEASON_SINCE, until=SEASON_UNTIL),
+    ),
+    repository_case("apply_game_to_player_stats", lambda db, ctx: db.apply_game_to_player_stats(ctx.ended_game_id())),
+    repository_case("rebuild_player_stats", lambda db, _: db.rebuild_player_stats(), repeats=HEAVY_CASE_REPEATS),
+    repository_case(
+        "get_inconsistent_player_stats",
+        lambda db, _: db.get_inconsistent_player_stats(),
+        repeats=HEAVY_CASE_REPEATS,
+    ),
+    repository_case("apply_game_to_leaderboard", lambda db, ctx: db.apply_game_to_leaderboard(ctx.ended_game_id())),
+    repository_case("rebuild_leaderboard", lambda db, _: db.rebuild_leaderboard(), repeats=HEAVY_CASE_REPEATS),
+    repository_case(
+        "get_leaderboard",
+        lambda db, _: db.get_leaderboard(LeaderboardCategories.OVERALL, min_games=10, limit=10, cursor=None),
+    ),
+    repository_case(
+        "get_leaderboard[season]",
+        lambda db, _: db.get_leaderboard(
+            LeaderboardCategories.OVERALL, min_games=10, limit=10, cursor=None, since=SEASON_SINCE, until=SEASON_UNTIL
+        ),
+    ),
+    repository_case(
+        "iter_ended_games[season]",
+        lambda db, _: _consume(db.iter_ended_games(since=SEASON_SINCE, until=SEASON_UNTIL)),
+        repeats=HEAVY_CASE_REPEATS,
+    ),
+    repository_case(
+        "get_players_ratings",
+        lambda db, ctx: db.get_players_ratings([ctx.player_id() for _ in range(10)]),
+    ),
+    repository_case(
+        "get_ended_games_participants",
+        lambda db, _: db.get_ended_games_participants(),
+        repeats=HEAVY_CASE_REPEATS,
+    ),
+    Case(
+        "EndGameUseCase.end_game",
+        lambda maker, ctx: EndGameUseCase(DBRepository(maker)).end_game(ctx.draft_game_id, GameResults.CIVILIANS_WON),
+    ),
+    Case(
+        "RatingsUseCase.recompute",
+        lambda maker, _: RatingsUseCase(DBRepository(maker)).recompute(),
+        repeats=HEAVY_CASE_REPEATS,
+    ),
+    repository_case("get_ended_games_ids", lambda db, _: db.get_ended_games_ids()),
+    repository_case(
+        "sync_pairs_stats[cold]",
+        lambda db, _: pairs_stats.clear() or sync_pairs_stats(db),
+        repeats=HEAVY_CASE_REPEATS,
+    ),
+    Case(
+        "GetPlayerPairsUseCase.get_player_pairs",
+        lambda maker, ctx: GetPlayerPairsUseCase(DBRepository(maker)).get_player_pairs(ctx.player_id()),
+    ),
+    Case(
+        "GetLeaderboardUseCase.get_leaderboard_page",
+        lambda maker, _: GetLeaderboardUseCase(DBRepository(maker)).get_leaderboard_page(
+            LeaderboardCategories.SHERIFF, min_games=10, limit=10
+        ),
+    ),
+    Case(
+        "GetPlayerStatsUseCase.get_player_stats",
+        lambda maker, ctx: GetPlayerStatsUseCase(DBRepository(maker)).get_player_stats(ctx.player_id()),
+    ),
+    Case(
+        "GetPlayersUseCase.get_players",
+        lambda maker, _: GetPlayersUseCase(DBRepository(maker)).get_players(limit=10, offset=0),
+    ),
+    Case(
+        "GetGamesUseCase.get_game",
+        lambda maker, ctx: GetGamesUseCase(DBRepository(maker)).get_game(ctx.ended_game_id()),
+    ),
+    Case(
+        "GetGamesUseCase.get_ended_games_page",
+        lambda maker, _: GetGamesUseCase(DBRepository(maker)).get_ended_games_page(limit=10),
+    ),
+    Case(
+        "GetGamesUseCase.get_last_game_in_draft",
+        lambda maker, _: GetGamesUseCase(DBRepository(maker)).get_last_game_in_draft(),
+    ),
+    Case(
+        "CreateGameUseCase.create_game_in_draft",
+        lambda maker, _: CreateGameUseCase(DBRepository(maker)).create_game_in_draft(datetime.datetime.now()),
+    ),
+]
@@ -0,0 +1,118 @@
+"""
+Games fetch strategies compared on generated games.
+
+Games are inserted into the configured database (DB_* environment variables) inside a transaction
+which is rolled back at the end. Caches are cleared before every repeat, so games are always read from the database.
+
+    PYTHONPATH=src python -m tests.benchmarks.fetch_strategies
+"""
+
+import asyncio
+import datetime
+import sys
+import time
+from collections.abc import Awaitable, Callable
+
+from sqlalchemy import event, insert
+from sqlalchemy.ext.asyncio import AsyncConnection, async_sessionmaker, create_async_engine
+
+from config import DBConfig
+from core import GameResults, GameStatuses, Roles
+from repositories.db import DBRepository
+from repositories.db.cache import draft_game_cache, games_cache
+from repositories.db.models import Game, Player, PlayerGame
+from usecases.interfaces import GamesFetchStrategy
+
+GAMES = 1_000
+PLAYERS = 50
+GAMES_BY_ID = 200
+REPEATS = 5
+ROLES = [Roles.DON, Roles.SHERIFF, Roles.MAFIA, Roles.MAFIA, *[Roles.CIVILIAN] * 6]
+FIRST_ID = 1_000_000
+
+
+async def _seed(conn: AsyncConnection) -> None:
+    await conn.execute(
+        insert(Player),
+        [{"id": FIRST_ID + i, "fio": f"fio {i}", "nickname": f"nickname {i}"} for i in range(PLAYERS)],
+    )
+    created_at = datetime.datetime(2000, 1, 1, tzinfo=datetime.UTC).replace(tzinfo=None)
+    await conn.execute(
+        insert(Game),
+        [
+            {
+                "id": FIRST_ID + i,
+                "status": GameStatuses.ENDED,
+                "result": GameResults.MAFIA_WON,
+                "comments": "",
+                "created_at": created_at + datetime.timedelta(hours=i),
+            }
+            for i in range(GAMES)
+        ],
+    )
+    await conn.execute(
+        insert(PlayerGame),
+        [
+            {
+                "game_id": FIRST_ID + i,
+                "player_id": FIRST_ID + (i + number) % PLAYERS,
+                "role": role,
+                "number": number,
+                "is_first_killed": number == 5,
+                "in_best_move": number in (1, 3, 6),
+            }
+            for i in range(GAMES)
+            for number, role in enumerate(ROLES, start=1)
+        ],
+    )
+
+
+async def _measure(maker: async_sessionmaker, call: Callable[[DBRepository], Awaitable]) -> float:
+    timings = []
+    for _ in range(REPEATS):
+        draft_game_cache.invalidate()
+        games_cache.clear()
+        started_at = time.perf_counter()
+        async with DBRepository(maker) as db:
+            await call(db)
+        timings.append(time.perf_counter() - started_at)
+    return min(timings)
+
+
+async def _get_games_by_id(db: DBRepository, strategy: GamesFetchStrategy) -> None:
+    for i in range(GAMES_BY_ID):
+        await db.get_game_by_id(FIRST_ID + i, strategy=strategy)
+
+
+async def main() -> None:
+    engine = create_async_engine(DBConfig().db_url)
+    rows_count = 0
+
+    def _count_rows(conn, cursor, statement, parameters, context, executemany) -> None:  # noqa: ARG001
+        nonlocal rows_count
+        rows_count += max(cursor.rowcount, 0)
+
+    async with engine.connect() as conn:
+        await conn.begin()
+        await _seed(conn)
+        maker = async_sessionmaker(bind=conn, autoflush=False, join_transaction_mode="create_savepoint")
+        event.listen(engine.sync_engine, "after_cursor_execute", _count_rows)
+        for strategy in GamesFetchStrategy:
+            rows_count = 0
+            all_games = await _measure(
+                maker,
+                lambda db, s=strategy: db.get_games(status=GameStatuses.ENDED, strategy=s),
+            )
+            all_games_rows = rows_count // REPEATS
+            by_id = await _measure(maker, lambda db, s=strategy: _get_games_by_id(db, s))
+            sys.stdout.write(
+                f"{strategy:>9}: get_games {all_games * 1000:7.1f} ms ({all_games_rows} rows), "
+                f"get_game_by_id {by_id / GAMES_BY_ID * 1000:5.2f} ms per game\n"
+            )
+        event.remove(engine.sync_engine, "after_cursor_execute", _count_rows)
+        await conn.rollback()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,106 @@
+"""
+Time and allocations of formatting 1000 loaded games into GameSchema.
+
+Before every participant was validated up to three times and timezone was looked up per game,
+now participants are built once without validation and shared.
+
+    PYTHONPATH=src python -m tests.benchmarks.format_games
+"""
+
+import datetime
+import sys
+import timeit
+import tracemalloc
+from collections.abc import Callable
+
+import pytz
+
+from core import GameResults, GameStatuses, Roles
+from repositories.db import DBRepository
+from repositories.db.models import Game, Player, PlayerGame
+from usecases.schemas import GameSchema, PlayerInGameSchema
+
+GAMES = 1_000
+ROLES = [Roles.DON, Roles.SHERIFF, Roles.MAFIA, Roles.MAFIA, *[Roles.CIVILIAN] * 6]
+
+
+def _get_games() -> list[Game]:
+    players = [Player(id=i, fio=f"fio {i}", nickname=f"nickname {i}", avatar_path=None) for i in range(1, 21)]
+    games = []
+    for game_id in range(1, GAMES + 1):
+        game = Game(
+            id=game_id,
+            result=GameResults.MAFIA_WON,
+            status=GameStatuses.ENDED,
+            comments="",
+            # games are stored with naive moscow time
+            created_at=datetime.datetime(2025, 1, 1) + datetime.timedelta(hours=game_id),  # noqa: DTZ001
+        )
+        for number, role in enumerate(ROLES, start=1):
+            player = players[(game_id + number) % len(players)]
+            game.players.append(
+                PlayerGame(
+                    player=player,
+                    player_id=player.id,
+                    game_id=game_id,
+                    role=role,
+                    number=number,
+                    is_first_killed=number == 5,
+                    in_best_move=number in (1, 3, 6),
+                )
+            )
+        games.append(game)
+    return games
+
+
+def _format_player_before(p: PlayerGame) -> PlayerInGameSchema:
+    return PlayerInGameSchema(
+        id=p.player.id,
+        fio=p.player.fio,
+        nickname=p.player.nickname,
+        role=Roles(p.role),
+        number=p.number,
+        avatar_path=p.player.avatar_path,
+    )
+
+
+def _format_game_before(game: Game) -> GameSchema:
+    first_killed = next(filter(lambda p: p.is_first_killed, game.players), None)
+    return GameSchema(
+        id=game.id,
+        comments=game.comments,
+        result=GameResults(game.result) if game.result else None,
+        status=GameStatuses(game.status),
+        players={_format_player_before(p) for p in game.players},
+        created_at=game.created_at.replace(tzinfo=pytz.timezone("Europe/Moscow")),
+        best_move={_format_player_before(p) for p in game.players if p.in_best_move} or None,
+        first_killed=_format_player_before(first_killed) if first_killed else None,
+    )
+
+
+def _measure(format_game: Callable[[Game], GameSchema], games: list[Game]) -> tuple[float, int, int]:
+    """returns seconds, allocated blocks and peak bytes for formatting all games"""
+    seconds = min(timeit.repeat(lambda: [format_game(g) for g in games], number=1, repeat=5))
+    tracemalloc.start()
+    snapshot_before = tracemalloc.take_snapshot()
+    formatted = [format_game(g) for g in games]
+    snapshot_after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    blocks = sum(stat.count_diff for stat in snapshot_after.compare_to(snapshot_before, "filename"))
+    del formatted
+    return seconds, blocks, peak
+
+
+def main() -> None:
+    games = _get_games()
+    for name, format_game in (("before", _format_game_before), ("after", DBRepository._format_game)):
+        seconds, blocks, peak = _measure(format_game, games)
+        sys.stdout.write(
+            f"{name:>6}: {seconds * 1000:7.1f} ms, {blocks:8d} live blocks, {peak / 1024:8.0f} KiB peak"
+            f" per {GAMES} games\n"
+        )
+
+
+if __name__ == "__main__":
+    main()
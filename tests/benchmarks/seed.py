@@ -0,0 +1,107 @@
+import datetime
+import random
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+
+from core import RED_ROLES, GameResults, GameStatuses, Roles
+from repositories.db import DBRepository
+from repositories.db.models import Base
+from usecases import RatingsUseCase
+
+ROLES = [Roles.DON, Roles.SHERIFF, Roles.MAFIA, Roles.MAFIA, *[Roles.CIVILIAN] * 6]
+RESULTS = [GameResults.CIVILIANS_WON] * 5 + [GameResults.MAFIA_WON] * 4 + [GameResults.DRAW]
+DRAFT_GAMES = 3
+PLAYERS_WITHOUT_GAMES = 100
+USERS = 100
+FIRST_GAME_AT = datetime.datetime(2015, 1, 1)  # noqa: DTZ001 games are stored without timezone
+BENCH_DB_NAME_MARKER = "bench"
+
+
+def _get_games(players: int, games: int, rng: random.Random) -> tuple[list[tuple], list[tuple]]:
+    games_records = []
+    players_games_records = []
+    players_with_games = max(players - PLAYERS_WITHOUT_GAMES, len(ROLES))
+    for game_id in range(1, games + 1):
+        is_draft = game_id > games - DRAFT_GAMES
+        games_records.append(
+            (
+                game_id,
+                None if is_draft else rng.choice(RESULTS),
+                GameStatuses.DRAFT if is_draft else GameStatuses.ENDED,
+                "",
+                FIRST_GAME_AT + datetime.timedelta(minutes=30 * game_id),
+            )
+        )
+        roles = ROLES.copy()
+        rng.shuffle(roles)
+        first_killed = rng.choice([n for n, r in enumerate(roles, start=1) if r in RED_ROLES])
+        has_first_killed = rng.random() < 0.7
+        best_move = set(rng.sample(range(1, 11), 3)) if has_first_killed else set()
+        players_ids = rng.sample(range(1, players_with_games + 1), len(roles))
+        for number, (player_id, role) in enumerate(zip(players_ids, roles, strict=True), start=1):
+            players_games_records.append(
+                (
+                    player_id,
+                    game_id,
+                    role,
+                    number,
+                    number in best_move,
+                    has_first_killed and number == first_killed,
+                )
+            )
+    return games_records, players_games_records
+
+
+async def seed_database(
+    engine: AsyncEngine,
+    players: int,
+    games: int,
+    seed: int = 0,
+    force: bool = False,
+) -> None:
+    """
+    Drops all tables of the database and fills it with synthetic club history.
+    Refuses to drop a database which name does not contain "bench" unless `force` is set.
+    """
+    database = engine.url.database or ""
+    if not force and BENCH_DB_NAME_MARKER not in database:
+        raise ValueError(f"Database {database!r} is not a benchmark one, its tables are dropped only with force")
+    rng = random.Random(seed)
+    games_records, players_games_records = _get_games(players, games, rng)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+        driver_connection = (await conn.get_raw_connection()).driver_connection
+        await driver_connection.copy_records_to_table(
+            "players",
+            records=[(i, f"Player {i}", f"Nickname {i}", None) for i in range(1, players + 1)],
+            columns=["id", "fio", "nickname", "avatar_path"],
+        )
+        await driver_connection.copy_records_to_table(
+            "users",
+            records=[(i, f"User {i}", None, f"user_{i}") for i in range(1, USERS + 1)],
+            columns=["telegram_id", "first_name", "last_name", "username"],
+        )
+        await driver_connection.copy_records_to_table(
+            "games",
+            records=games_records,
+            columns=["id", "result", "status", "comments", "created_at"],
+        )
+        await driver_connection.copy_records_to_table(
+            "players_games",
+            records=players_games_records,
+            columns=["player_id", "game_id", "role", "number", "in_best_move", "is_first_killed"],
+        )
+        for table in ("players", "games"):
+            await conn.execute(
+                text(f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT max(id) FROM {table}))")
+            )
+    maker = async_sessionmaker(bind=engine, autoflush=False)
+    async with DBRepository(maker) as db:
+        await db.rebuild_player_stats()
+        await db.rebuild_leaderboard()
+    await RatingsUseCase(DBRepository(maker)).recompute()
+    async with engine.connect() as conn:
+        await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("ANALYZE"))
@@ -0,0 +1,44 @@
+"""
+Per update overhead of reading settings and checking admin rights.
+
+Before settings were parsed from environment on every get_settings call, now they are parsed once per process.
+
+    PYTHONPATH=src python -m tests.benchmarks.settings_overhead
+"""
+
+import os
+import sys
+import timeit
+
+os.environ.setdefault("DB_HOST", "localhost")
+os.environ.setdefault("DB_NAME", "bench")
+os.environ.setdefault("DB_USER", "bench")
+os.environ.setdefault("DB_PASSWORD", "bench")
+os.environ.setdefault("DB_PORT", "5432")
+os.environ.setdefault("TELEGRAM_BOT_TOKEN", "bench")
+os.environ.setdefault("ADMIN_ID", "1")
+
+from bot.auth import is_admin
+from config import Settings
+
+UPDATES = 2_000
+USER_ID = 2
+
+
+def _update_before() -> bool:
+    # validate_admin in handler and check in SaveUserMiddleware
+    return USER_ID == Settings().ADMIN_ID or USER_ID == Settings().ADMIN_ID
+
+
+def _update_after() -> bool:
+    return is_admin(USER_ID) or is_admin(USER_ID)
+
+
+def main() -> None:
+    for name, update in (("before", _update_before), ("after", _update_after)):
+        seconds = min(timeit.repeat(update, number=UPDATES, repeat=5))
+        sys.stdout.write(f"{name:>6}: {seconds / UPDATES * 1e6:9.2f} us per update\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -33,7 +33,8 @@ CREATE TABLE public.games (
     result character varying,
     status character varying NOT NULL,
     comments character varying NOT NULL,
-    created_at timestamp without time zone NOT NULL
+    created_at timestamp without time zone NOT NULL,
+    version integer DEFAULT 1 NOT NULL
 );
 
 
@@ -149,7 +150,7 @@ ALTER TABLE ONLY public.users ALTER COLUMN telegram_id SET DEFAULT nextval('publ
 --
 
 COPY public.alembic_version (version_num) FROM stdin;
-7e7f6f73932e
+3e9b7d21c6a4
 \.
 
 
@@ -655,3 +656,170 @@ ALTER TABLE ONLY public.players_games
 
 ALTER TABLE ONLY public.players_games
     ADD CONSTRAINT players_games_player_id_fkey FOREIGN KEY (player_id) REFERENCES public.players(id);
+
+
+
+CREATE TABLE public.player_stats (
+    player_id integer NOT NULL,
+    games_count_total integer DEFAULT 0 NOT NULL,
+    won_games_count_total integer DEFAULT 0 NOT NULL,
+    games_count_as_civilian integer DEFAULT 0 NOT NULL,
+    won_games_count_as_civilian integer DEFAULT 0 NOT NULL,
+    games_count_as_mafia integer DEFAULT 0 NOT NULL,
+    won_games_count_as_mafia integer DEFAULT 0 NOT NULL,
+    games_count_as_don integer DEFAULT 0 NOT NULL,
+    won_games_count_as_don integer DEFAULT 0 NOT NULL,
+    games_count_as_sheriff integer DEFAULT 0 NOT NULL,
+    won_games_count_as_sheriff integer DEFAULT 0 NOT NULL,
+    first_killed_count integer DEFAULT 0 NOT NULL,
+    best_move_count_total integer DEFAULT 0 NOT NULL,
+    zero_mafia_best_move_count integer DEFAULT 0 NOT NULL,
+    one_mafia_best_move_count integer DEFAULT 0 NOT NULL,
+    two_mafia_best_move_count integer DEFAULT 0 NOT NULL,
+    three_mafia_best_move_count integer DEFAULT 0 NOT NULL
+);
+
+
+ALTER TABLE ONLY public.player_stats
+    ADD CONSTRAINT player_stats_pkey PRIMARY KEY (player_id);
+
+
+ALTER TABLE ONLY public.player_stats
+    ADD CONSTRAINT player_stats_player_id_fkey FOREIGN KEY (player_id) REFERENCES public.players(id) ON DELETE CASCADE;
+
+
+CREATE INDEX ix_players_games_player_id_role ON public.players_games USING btree (player_id, role);
+
+CREATE INDEX ix_players_games_game_id_number ON public.players_games USING btree (game_id, number);
+
+CREATE INDEX ix_games_status_created_at ON public.games USING btree (status, created_at DESC);
+
+CREATE INDEX ix_games_draft_created_at ON public.games USING btree (created_at DESC) WHERE ((status)::text = 'draft'::text);
+
+
+CREATE TABLE public.leaderboard (
+    category character varying NOT NULL,
+    player_id integer NOT NULL,
+    games_count integer NOT NULL,
+    won_games_count integer NOT NULL,
+    win_rate double precision NOT NULL
+);
+
+
+ALTER TABLE ONLY public.leaderboard
+    ADD CONSTRAINT leaderboard_pkey PRIMARY KEY (category, player_id);
+
+
+ALTER TABLE ONLY public.leaderboard
+    ADD CONSTRAINT leaderboard_player_id_fkey FOREIGN KEY (player_id) REFERENCES public.players(id) ON DELETE CASCADE;
+
+
+CREATE INDEX ix_leaderboard_category_win_rate ON public.leaderboard USING btree (category, win_rate DESC, games_count DESC, player_id DESC);
+
+
+CREATE TABLE public.players_ratings (
+    player_id integer NOT NULL,
+    rating double precision NOT NULL,
+    games_count integer NOT NULL
+);
+
+
+ALTER TABLE ONLY public.players_ratings
+    ADD CONSTRAINT players_ratings_pkey PRIMARY KEY (player_id);
+
+
+ALTER TABLE ONLY public.players_ratings
+    ADD CONSTRAINT players_ratings_player_id_fkey FOREIGN KEY (player_id) REFERENCES public.players(id) ON DELETE CASCADE;
+
+
+SELECT pg_catalog.set_config('search_path', 'public', false);
+
+INSERT INTO player_stats (player_id, games_count_total, won_games_count_total, games_count_as_civilian, won_games_count_as_civilian, games_count_as_mafia, won_games_count_as_mafia, games_count_as_don, won_games_count_as_don, games_count_as_sheriff, won_games_count_as_sheriff, first_killed_count, best_move_count_total, zero_mafia_best_move_count, one_mafia_best_move_count, two_mafia_best_move_count, three_mafia_best_move_count)
+SELECT
+    pg.player_id,
+    count(*),
+    count(*) FILTER (WHERE ((pg.role IN ('civilian', 'sheriff') AND g.result = 'civilians_won') OR (pg.role IN ('mafia', 'don') AND g.result = 'mafia_won'))),
+    count(*) FILTER (WHERE pg.role = 'civilian'),
+    count(*) FILTER (WHERE pg.role = 'civilian' AND ((pg.role IN ('civilian', 'sheriff') AND g.result = 'civilians_won') OR (pg.role IN ('mafia', 'don') AND g.result = 'mafia_won'))),
+    count(*) FILTER (WHERE pg.role = 'mafia'),
+    count(*) FILTER (WHERE pg.role = 'mafia' AND ((pg.role IN ('civilian', 'sheriff') AND g.result = 'civilians_won') OR (pg.role IN ('mafia', 'don') AND g.result = 'mafia_won'))),
+    count(*) FILTER (WHERE pg.role = 'don'),
+    count(*) FILTER (WHERE pg.role = 'don' AND ((pg.role IN ('civilian', 'sheriff') AND g.result = 'civilians_won') OR (pg.role IN ('mafia', 'don') AND g.result = 'mafia_won'))),
+    count(*) FILTER (WHERE pg.role = 'sheriff'),
+    count(*) FILTER (WHERE pg.role = 'sheriff' AND ((pg.role IN ('civilian', 'sheriff') AND g.result = 'civilians_won') OR (pg.role IN ('mafia', 'don') AND g.result = 'mafia_won'))),
+    count(*) FILTER (WHERE (pg.is_first_killed AND pg.role IN ('civilian', 'sheriff'))),
+    count(*) FILTER (WHERE (pg.is_first_killed AND pg.role IN ('civilian', 'sheriff') AND bm.best_move_size > 0)),
+    count(*) FILTER (WHERE (pg.is_first_killed AND pg.role IN ('civilian', 'sheriff') AND bm.best_move_size > 0) AND bm.black_in_best_move = 0),
+    count(*) FILTER (WHERE (pg.is_first_killed AND pg.role IN ('civilian', 'sheriff') AND bm.best_move_size > 0) AND bm.black_in_best_move = 1),
+    count(*) FILTER (WHERE (pg.is_first_killed AND pg.role IN ('civilian', 'sheriff') AND bm.best_move_size > 0) AND bm.black_in_best_move = 2),
+    count(*) FILTER (WHERE (pg.is_first_killed AND pg.role IN ('civilian', 'sheriff') AND bm.best_move_size > 0) AND bm.black_in_best_move = 3)
+FROM players_games pg
+JOIN games g ON g.id = pg.game_id
+LEFT JOIN (
+    SELECT
+        game_id,
+        count(*) FILTER (WHERE in_best_move) AS best_move_size,
+        count(*) FILTER (WHERE in_best_move AND role IN ('mafia', 'don')) AS black_in_best_move
+    FROM players_games
+    GROUP BY game_id
+) bm ON bm.game_id = pg.game_id
+WHERE g.status = 'ended'
+GROUP BY pg.player_id;
+
+INSERT INTO leaderboard (category, player_id, games_count, won_games_count, win_rate)
+SELECT 'overall', player_id, games_count_total, won_games_count_total, CAST(won_games_count_total AS FLOAT) / (games_count_total)
+FROM player_stats
+WHERE games_count_total > 0
+UNION ALL
+
+SELECT 'red', player_id, games_count_as_civilian + games_count_as_sheriff, won_games_count_as_civilian + won_games_count_as_sheriff, CAST(won_games_count_as_civilian + won_games_count_as_sheriff AS FLOAT) / (games_count_as_civilian + games_count_as_sheriff)
+FROM player_stats
+WHERE games_count_as_civilian + games_count_as_sheriff > 0
+UNION ALL
+
+SELECT 'black', player_id, games_count_as_mafia + games_count_as_don, won_games_count_as_mafia + won_games_count_as_don, CAST(won_games_count_as_mafia + won_games_count_as_don AS FLOAT) / (games_count_as_mafia + games_count_as_don)
+FROM player_stats
+WHERE games_count_as_mafia + games_count_as_don > 0
+UNION ALL
+
+SELECT 'civilian', player_id, games_count_as_civilian, won_games_count_as_civilian, CAST(won_games_count_as_civilian AS FLOAT) / (games_count_as_civilian)
+FROM player_stats
+WHERE games_count_as_civilian > 0
+UNION ALL
+
+SELECT 'mafia', player_id, games_count_as_mafia, won_games_count_as_mafia, CAST(won_games_count_as_mafia AS FLOAT) / (games_count_as_mafia)
+FROM player_stats
+WHERE games_count_as_mafia > 0
+UNION ALL
+
+SELECT 'don', player_id, games_count_as_don, won_games_count_as_don, CAST(won_games_count_as_don AS FLOAT) / (games_count_as_don)
+FROM player_stats
+WHERE games_count_as_don > 0
+UNION ALL
+
+SELECT 'sheriff', player_id, games_count_as_sheriff, won_games_count_as_sheriff, CAST(won_games_count_as_sheriff AS FLOAT) / (games_count_as_sheriff)
+FROM player_stats
+WHERE games_count_as_sheriff > 0;
+
+-- ratings replayed from ended games as the players_ratings migration does
+INSERT INTO players_ratings (player_id, rating, games_count) VALUES
+    (34, 1531.9047747758225, 33),
+    (35, 1540.0859342966546, 29),
+    (36, 1440.274179656489, 26),
+    (37, 1560.8053044569688, 29),
+    (38, 1519.8118445622829, 12),
+    (39, 1498.3401067263997, 4),
+    (40, 1476.9029409043599, 34),
+    (41, 1437.07525309121, 29),
+    (42, 1579.7337130404892, 25),
+    (43, 1570.147717090432, 32),
+    (44, 1429.5121506657194, 35),
+    (45, 1436.9831712176904, 7),
+    (46, 1557.049146762615, 13),
+    (47, 1477.00250111821, 4),
+    (48, 1488.5440653383582, 9),
+    (49, 1411.2225902749271, 12),
+    (50, 1493.3821842868388, 2),
+    (51, 1531.6584355887614, 4),
+    (52, 1517.2184184914538, 4),
+    (53, 1465.3016745588, 3);
@@ -1,4 +1,7 @@
+import os
+
 from config import DBConfig
+from usecases.schemas import GameSchema
 
 test_db_config = DBConfig(
     DB_HOST="test_db",
@@ -7,3 +10,22 @@ test_db_config = DBConfig(
     DB_PASSWORD="test_password",
     DB_PORT=5432,
 )
+
+
+def set_test_environment() -> None:
+    """Bot and API modules read settings and create the database engine on import, so it is set before importing them"""
+    for name, value in test_db_config.model_dump().items():
+        if value is not None:
+            os.environ.setdefault(name, str(value))
+    os.environ.setdefault("TELEGRAM_BOT_TOKEN", "test")
+    os.environ.setdefault("ADMIN_ID", "1")
+
+
+def dump_game(game: GameSchema) -> tuple:
+    """All game fields, GameSchema equality compares only ids"""
+    return (
+        game.model_dump(exclude={"players", "best_move", "first_killed"}),
+        sorted((p.model_dump() for p in game.players), key=lambda p: p["number"]),
+        sorted(p.id for p in game.best_move or ()),
+        game.first_killed.id if game.first_killed else None,
+    )
@@ -0,0 +1,101 @@
+import pytest
+from aiogram import Bot
+from aiogram.client.session.base import BaseSession
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.types import User
+from sqlalchemy import delete
+
+from repositories.db import DBRepository
+from repositories.db.models import User as UserModel
+from tests.integration.db import set_test_environment
+from usecases.schemas import UpdatePlayerSchema
+
+set_test_environment()
+
+NEW_USER_ID = 987_654_321_012
+PLAYER_ID = 44
+
+
+class _FakeBot:
+    def __init__(self) -> None:
+        self.messages: list[tuple[int, str]] = []
+
+    async def send_message(self, chat_id: int, text: str) -> None:
+        self.messages.append((chat_id, text))
+
+
+class _FakeEvent:
+    def __init__(self) -> None:
+        self.bot = _FakeBot()
+
+
+class _RejectingSession(BaseSession):
+    """Telegram rejects every request, e.g. markdown of a nickname can't be parsed"""
+
+    async def make_request(self, bot: Bot, method, timeout: int | None = None):  # noqa: ARG002, ASYNC109
+        raise TelegramBadRequest(method=method, message="Bad Request: can't parse entities")
+
+    async def stream_content(self, url: str, *args, **kwargs):
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+
+async def _failing_handler(_event, _data) -> None:
+    raise RuntimeError("handler failed")
+
+
+@pytest.mark.asyncio
+async def test_new_user_is_saved_when_handler_fails():
+    from bot.middleware import SaveUserMiddleware, UnitOfWorkMiddleware
+    from config import get_settings
+    from dependencies import db_engine, db_session_factory
+
+    middleware = SaveUserMiddleware()
+    event = _FakeEvent()
+    user = User(id=NEW_USER_ID, is_bot=False, first_name="New", username=None)
+
+    with pytest.raises(RuntimeError, match="handler failed"):
+        await UnitOfWorkMiddleware(db_session_factory)(
+            lambda e, d: middleware(_failing_handler, e, d),
+            event,
+            {"event_from_user": user},
+        )
+
+    async with DBRepository(db_session_factory) as db:
+        assert NEW_USER_ID in {u.telegram_id for u in await db.get_users()}
+    assert NEW_USER_ID in middleware._known_users_ids
+    assert {chat_id for chat_id, _ in event.bot.messages} == get_settings().admin_ids
+
+    async with db_session_factory() as session:
+        await session.execute(delete(UserModel).where(UserModel.telegram_id == NEW_USER_ID))
+        await session.commit()
+    await db_engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_changes_are_committed_before_telegram_call_fails():
+    from bot.middleware import CommitUnitOfWorkRequestMiddleware, UnitOfWorkMiddleware
+    from dependencies import db_engine, db_session_factory
+
+    session = _RejectingSession()
+    session.middleware(CommitUnitOfWorkRequestMiddleware())
+    bot = Bot(token="42:TEST", session=session)
+
+    async def _handler(_event, _data) -> None:
+        async with DBRepository(db_session_factory) as db:
+            await db.update_player(PLAYER_ID, UpdatePlayerSchema(nickname="Renamed_*"))
+        await bot.send_message(chat_id=1, text="Никнейм установлен")
+
+    async with DBRepository(db_session_factory) as db:
+        nickname = (await db.get_player_by_id(PLAYER_ID)).nickname
+    try:
+        with pytest.raises(TelegramBadRequest):
+            await UnitOfWorkMiddleware(db_session_factory)(_handler, _FakeEvent(), {})
+        async with DBRepository(db_session_factory) as db:
+            assert (await db.get_player_by_id(PLAYER_ID)).nickname == "Renamed_*"
+    finally:
+        async with DBRepository(db_session_factory) as db:
+            await db.update_player(PLAYER_ID, UpdatePlayerSchema(nickname=nickname))
+        await db_engine.dispose()
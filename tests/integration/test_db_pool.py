@@ -0,0 +1,33 @@
+import pytest
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from repositories.db.engine import create_engine, get_pool_metrics
+from tests.integration.db import test_db_config
+
+POOL_TIMEOUT = 0.2
+
+
+@pytest.mark.asyncio
+async def test_pool_metrics_count_checkouts_and_timeouts():
+    config = test_db_config.model_copy(
+        update={"DB_POOL_SIZE": 2, "DB_MAX_OVERFLOW": 0, "DB_POOL_TIMEOUT": POOL_TIMEOUT}
+    )
+    engine = create_engine(config)
+    try:
+        metrics = get_pool_metrics(engine)
+        assert (metrics.checked_out, metrics.overflow, metrics.checkouts_count) == (0, 0, 0)
+
+        async with engine.connect(), engine.connect():
+            metrics = get_pool_metrics(engine)
+            assert (metrics.checked_out, metrics.overflow) == (2, 0)
+            with pytest.raises(PoolTimeoutError):
+                async with engine.connect():
+                    pass
+
+        metrics = get_pool_metrics(engine)
+        assert (metrics.checked_in, metrics.checked_out) == (2, 0)
+        assert (metrics.checkouts_count, metrics.checkout_timeouts_count) == (3, 1)
+        assert metrics.checkout_wait_max >= POOL_TIMEOUT
+        assert metrics.checkout_wait_total >= metrics.checkout_wait_max
+    finally:
+        await engine.dispose()
@@ -0,0 +1,66 @@
+import asyncio
+import datetime
+
+import pytest
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from core import GameResults, GameStatuses, Roles
+from repositories.db import DBRepository
+from repositories.db.cache import games_cache
+from repositories.db.models import Game, PlayerGame
+from tests.integration.db import test_db_config
+from usecases.schemas import CreateGameSchema, PlayerInGameSchema
+
+PLAYERS_IDS = range(34, 44)
+ROLES = [Roles.DON, Roles.SHERIFF, Roles.MAFIA, Roles.MAFIA, *[Roles.CIVILIAN] * 6]
+
+
+@pytest.mark.asyncio
+async def test_game_is_ended_once_by_concurrent_transactions():
+    engine = create_async_engine(test_db_config.db_url)
+    maker = async_sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    players = [
+        PlayerInGameSchema(id=player_id, fio="", nickname="", role=role, number=number)
+        for number, (player_id, role) in enumerate(zip(PLAYERS_IDS, ROLES, strict=True), start=1)
+    ]
+    async with DBRepository(maker) as db:
+        game = await db.create_game(
+            CreateGameSchema(
+                players=set(players),
+                status=GameStatuses.DRAFT,
+                result=None,
+                comments="",
+                created_at=datetime.datetime.now(),
+                best_move=set(),
+                first_killed=players[-1],
+            )
+        )
+
+    try:
+        async with DBRepository(maker) as first_db:
+            assert await first_db.end_game(game.id, GameResults.MAFIA_WON)
+
+            async def _end_in_second_transaction() -> bool:
+                async with DBRepository(maker) as second_db:
+                    return await second_db.end_game(game.id, GameResults.CIVILIANS_WON)
+
+            # blocked by the row lock until the first transaction is committed, then sees the game ended
+            second = asyncio.create_task(_end_in_second_transaction())
+            await asyncio.sleep(0.2)
+            assert not second.done()
+        assert not await second
+
+        async with DBRepository(maker) as db:
+            ended_game = await db.get_game_by_id(game.id)
+        assert (ended_game.status, ended_game.result, ended_game.version) == (
+            GameStatuses.ENDED,
+            GameResults.MAFIA_WON,
+            2,
+        )
+    finally:
+        async with engine.begin() as conn:
+            await conn.execute(delete(PlayerGame).where(PlayerGame.game_id == game.id))
+            await conn.execute(delete(Game).where(Game.id == game.id))
+        await engine.dispose()
+        games_cache.clear()
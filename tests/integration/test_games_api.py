@@ -0,0 +1,131 @@
+import asyncio
+import pathlib
+from collections.abc import Iterator
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from repositories.db import DBRepository
+from tests.integration.db import set_test_environment, test_db_config
+from usecases import GetGamesUseCase
+from usecases.schemas import UpdatePlayerSchema
+
+set_test_environment()
+
+SRC_DIR = pathlib.Path(__file__).parents[2] / "src"
+ENDED_GAME_ID = 1
+DRAFT_GAME_ID = 39
+PLAYER_ID = 44
+
+
+@pytest.fixture
+def client(monkeypatch: pytest.MonkeyPatch) -> Iterator[TestClient]:
+    # static files and templates are looked up relative to src
+    monkeypatch.chdir(SRC_DIR)
+    from api.main import app
+
+    with TestClient(app) as client:
+        yield client
+
+
+async def _rename_player(nickname: str) -> None:
+    engine = create_async_engine(test_db_config.db_url)
+    async with DBRepository(async_sessionmaker(bind=engine, autoflush=False)) as db:
+        await db.update_player(PLAYER_ID, UpdatePlayerSchema(nickname=nickname))
+    await engine.dispose()
+
+
+@pytest.mark.parametrize(
+    "if_none_match",
+    ["{etag}", "W/{etag}", '"0-0", {etag}', '"0-0",W/{etag}', "*"],
+)
+def test_matching_game_is_not_modified(client: TestClient, if_none_match: str):
+    response = client.get(f"/games/{ENDED_GAME_ID}")
+    assert response.status_code == 200
+    assert response.json()["id"] == ENDED_GAME_ID
+    assert response.headers["Cache-Control"] == "no-cache"
+    etag = response.headers["ETag"]
+
+    response = client.get(f"/games/{ENDED_GAME_ID}", headers={"If-None-Match": if_none_match.format(etag=etag)})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert (response.headers["ETag"], response.headers["Cache-Control"]) == (etag, "no-cache")
+
+
+def test_not_matching_game_is_returned(client: TestClient):
+    response = client.get(f"/games/{ENDED_GAME_ID}", headers={"If-None-Match": f'"{ENDED_GAME_ID}-0"'})
+    assert response.status_code == 200
+    assert response.json()["id"] == ENDED_GAME_ID
+
+
+def test_draft_game_is_not_modified(client: TestClient):
+    response = client.get("/games/draft")
+    assert response.status_code == 200
+    assert response.json()["id"] == DRAFT_GAME_ID
+    etag = response.headers["ETag"]
+
+    response = client.get("/games/draft", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+
+
+def test_unknown_game_is_not_found(client: TestClient):
+    assert client.get("/games/1000000000").status_code == 404
+    assert client.get("/games/1000000000", headers={"If-None-Match": "*"}).status_code == 404
+
+
+def test_no_draft_game_is_not_found(client: TestClient, monkeypatch: pytest.MonkeyPatch):
+    async def _none(_self: GetGamesUseCase) -> None:
+        return None
+
+    monkeypatch.setattr(GetGamesUseCase, "get_draft_game_version", _none)
+    monkeypatch.setattr(GetGamesUseCase, "get_last_game_in_draft", _none)
+    response = client.get("/games/draft", headers={"If-None-Match": "*"})
+    assert response.status_code == 404
+    assert response.json() == {"detail": "No game in draft"}
+
+
+def test_etag_changes_after_player_rename(client: TestClient):
+    response = client.get(f"/games/{DRAFT_GAME_ID}")
+    etag = response.headers["ETag"]
+    nickname = next(p["nickname"] for p in response.json()["players"] if p["id"] == PLAYER_ID)
+
+    asyncio.run(_rename_player("Renamed"))
+    try:
+        response = client.get(f"/games/{DRAFT_GAME_ID}", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+        assert "Renamed" in {p["nickname"] for p in response.json()["players"]}
+    finally:
+        asyncio.run(_rename_player(nickname))
+
+
+@pytest.fixture
+def metrics_token(monkeypatch: pytest.MonkeyPatch) -> Iterator[str]:
+    from config import reload_settings
+
+    monkeypatch.setenv("METRICS_TOKEN", "secret")
+    reload_settings()
+    yield "secret"
+    monkeypatch.delenv("METRICS_TOKEN")
+    reload_settings()
+
+
+def test_metrics_are_disabled_without_token(client: TestClient):
+    assert client.get("/metrics/db-pool").status_code == 404
+
+
+@pytest.mark.usefixtures("metrics_token")
+@pytest.mark.parametrize("authorization", [None, "Bearer wrong", "secret"])
+def test_metrics_require_token(client: TestClient, authorization: str | None):
+    headers = {"Authorization": authorization} if authorization else {}
+    response = client.get("/metrics/db-pool", headers=headers)
+    assert response.status_code == 401
+    assert response.headers["WWW-Authenticate"] == "Bearer"
+
+
+def test_metrics_are_returned_with_token(client: TestClient, metrics_token: str):
+    response = client.get("/metrics/db-pool", headers={"Authorization": f"Bearer {metrics_token}"})
+    assert response.status_code == 200
+    assert response.json()["overflow"] >= 0
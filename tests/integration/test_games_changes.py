@@ -0,0 +1,54 @@
+import asyncio
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from repositories.db import DBRepository, UnitOfWork
+from repositories.db.cache import draft_game_cache, games_cache
+from repositories.db.notifications import GAMES_CHANGES_CHANNEL, GamesChangesListener
+from tests.integration.db import test_db_config
+from usecases.schemas import UpdateGameSchema, UpdatePlayerSchema
+
+DRAFT_GAME_ID = 39
+PLAYER_ID = 44
+NOTIFICATION_TIMEOUT = 5.0
+
+
+@pytest.mark.asyncio
+async def test_committed_changes_are_notified():
+    engine = create_async_engine(test_db_config.db_url)
+    maker = async_sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    changes: asyncio.Queue[None] = asyncio.Queue()
+    listener = asyncio.create_task(GamesChangesListener(engine, lambda: changes.put_nowait(None)).run())
+    # called once listening is started
+    await asyncio.wait_for(changes.get(), NOTIFICATION_TIMEOUT)
+
+    async with UnitOfWork(maker), DBRepository(maker) as db:
+        # changes nothing, but players shown in games are considered changed
+        await db.update_player(PLAYER_ID, UpdatePlayerSchema())
+    await asyncio.wait_for(changes.get(), NOTIFICATION_TIMEOUT)
+
+    # change made by another process
+    async with DBRepository(maker) as db:
+        await db.get_game_by_id(DRAFT_GAME_ID)
+    assert games_cache.get(DRAFT_GAME_ID) is not None
+    async with engine.begin() as conn:
+        await conn.execute(select(func.pg_notify(GAMES_CHANGES_CHANNEL, str(DRAFT_GAME_ID))))
+    await asyncio.wait_for(changes.get(), NOTIFICATION_TIMEOUT)
+    assert games_cache.get(DRAFT_GAME_ID) is None
+
+    async with engine.connect() as conn:
+        await conn.begin()
+        savepoint_maker = async_sessionmaker(bind=conn, autoflush=False, join_transaction_mode="create_savepoint")
+        async with DBRepository(savepoint_maker) as db:
+            await db.update_game(DRAFT_GAME_ID, UpdateGameSchema(comments="not committed"))
+        await conn.rollback()
+    with pytest.raises(TimeoutError):
+        await asyncio.wait_for(changes.get(), 0.5)
+
+    listener.cancel()
+    await asyncio.gather(listener, return_exceptions=True)
+    await engine.dispose()
+    draft_game_cache.invalidate()
+    games_cache.clear()
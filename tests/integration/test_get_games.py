@@ -1,28 +1,156 @@
+import datetime
+
 import pytest
+from sqlalchemy import update
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
+from bot.filters import GamesCurrentPageCallbackFactory
+from core import GameStatuses, Roles
 from repositories.db import DBRepository
-from tests.integration.db import test_db_config
+from repositories.db.cache import games_cache
+from repositories.db.models import Game
+from tests.integration.db import dump_game, set_test_environment, test_db_config
 from usecases import GetGamesUseCase
-from usecases.schemas import GameSchema
+from usecases.errors import NotFoundError
+from usecases.interfaces import GamesFetchStrategy
+from usecases.schemas import GameSchema, UpdateGameSchema, UpdatePlayerSchema
 
 
 @pytest.mark.asyncio
-async def test_get_games():
+async def test_get_game_detail():
     engine = create_async_engine(test_db_config.db_url)
     maker = async_sessionmaker(autocommit=False, autoflush=False, bind=engine)
     uc = GetGamesUseCase(DBRepository(maker))
-    games, count = await uc.get_ended_games()
-    assert isinstance(games, list)
-    assert isinstance(games[0], GameSchema)
-    assert isinstance(count, int)
+    page = await uc.get_ended_games_page(limit=5)
+    g = await uc.get_game(page.games[0].id)
+    assert isinstance(g, GameSchema)
+    assert g.status == GameStatuses.ENDED
 
 
 @pytest.mark.asyncio
-async def test_get_game_detail():
+async def test_get_ended_games_page():
     engine = create_async_engine(test_db_config.db_url)
     maker = async_sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    async with DBRepository(maker) as db:
+        games = await db.get_games(status=GameStatuses.ENDED, strategy=GamesFetchStrategy.JSON_AGG)
     uc = GetGamesUseCase(DBRepository(maker))
-    games, count = await uc.get_ended_games()
-    g = await uc.get_game(games[0].id)
-    assert isinstance(g, GameSchema)
+    first_page = await uc.get_ended_games_page(limit=5)
+    second_page = await uc.get_ended_games_page(limit=5, cursor=first_page.next_page)
+    assert [g.id for g in first_page.games + second_page.games] == [g.id for g in games[:10]]
+    previous_page = await uc.get_ended_games_page(limit=5, cursor=second_page.previous_page)
+    assert previous_page.games == first_page.games
+
+
+@pytest.mark.asyncio
+async def test_ended_games_page_cursor_passes_through_bot_callback():
+    set_test_environment()
+    from bot.routes.games import _get_games_page_callback, _get_games_page_cursor
+
+    engine = create_async_engine(test_db_config.db_url)
+    maker = async_sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    uc = GetGamesUseCase(DBRepository(maker))
+    first_page = await uc.get_ended_games_page(limit=5)
+    second_page = await uc.get_ended_games_page(limit=5, cursor=first_page.next_page)
+    for page, cursor in ((second_page, first_page.next_page), (first_page, second_page.previous_page)):
+        callback = GamesCurrentPageCallbackFactory.unpack(_get_games_page_callback(cursor).pack())
+        unpacked = _get_games_page_cursor(callback)
+        assert DBRepository._to_stored_time(unpacked.created_at) == DBRepository._to_stored_time(cursor.created_at)
+        assert (await uc.get_ended_games_page(limit=5, cursor=unpacked)).games == page.games
+
+
+@pytest.mark.asyncio
+async def test_get_last_game_in_draft():
+    engine = create_async_engine(test_db_config.db_url)
+    maker = async_sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    uc = GetGamesUseCase(DBRepository(maker))
+    game = await uc.get_last_game_in_draft()
+    assert isinstance(game, GameSchema)
+    assert game.status == GameStatuses.DRAFT
+    assert game == await uc.get_last_game_in_draft()
+
+
+@pytest.mark.parametrize("strategy", (GamesFetchStrategy.SELECTIN, GamesFetchStrategy.JSON_AGG))
+@pytest.mark.asyncio
+async def test_games_fetch_strategies_match_joined(strategy: GamesFetchStrategy):
+    engine = create_async_engine(test_db_config.db_url)
+    maker = async_sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    async with DBRepository(maker) as db:
+        for filters in ({}, {"status": GameStatuses.ENDED}, {"player_id": 44, "role__in": [Roles.CIVILIAN]}):
+            games = await db.get_games(**filters, strategy=GamesFetchStrategy.JOINED)
+            fetched_games = await db.get_games(**filters, strategy=strategy)
+            assert [dump_game(g) for g in fetched_games] == [dump_game(g) for g in games]
+        game = await db.get_game_by_id(games[0].id, strategy=strategy)
+        assert dump_game(game) == dump_game(games[0])
+
+
+@pytest.mark.asyncio
+async def test_iter_ended_games_matches_get_games():
+    engine = create_async_engine(test_db_config.db_url)
+    maker = async_sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    uc = GetGamesUseCase(DBRepository(maker))
+    async with DBRepository(maker) as db:
+        games = await db.get_games(status=GameStatuses.ENDED, strategy=GamesFetchStrategy.JSON_AGG)
+    streamed = [g async for g in uc.iter_ended_games()]
+    assert [dump_game(g) for g in streamed] == [
+        dump_game(g) for g in sorted(games, key=lambda g: (g.created_at, g.id))
+    ]
+
+    since = streamed[len(streamed) // 2].created_at
+    assert [g.id async for g in uc.iter_ended_games(since=since)] == [g.id for g in streamed if g.created_at >= since]
+    # bounds with timezone are converted to the stored moscow time
+    until = since.astimezone(datetime.UTC)
+    assert [g.id async for g in uc.iter_ended_games(until=until)] == [g.id for g in streamed if g.created_at < since]
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_get_game_by_id_cached_by_version():
+    draft_game_id = 39
+    games_cache.clear()
+    engine = create_async_engine(test_db_config.db_url)
+    async with engine.connect() as conn:
+        await conn.begin()
+        maker = async_sessionmaker(bind=conn, autoflush=False, join_transaction_mode="create_savepoint")
+        async with DBRepository(maker) as db:
+            game = await db.get_game_by_id(draft_game_id)
+            assert await db.get_game_by_id(draft_game_id) is game
+            await db.update_game(draft_game_id, UpdateGameSchema(comments="changed"))
+            changed_game = await db.get_game_by_id(draft_game_id)
+        assert changed_game.comments == "changed"
+        assert changed_game.version == game.version + 1
+        # changed by another process, which can't invalidate this cache
+        await conn.execute(update(Game).where(Game.id == draft_game_id).values(version=Game.version + 1))
+        async with DBRepository(maker) as db:
+            assert (await db.get_game_by_id(draft_game_id)).version == changed_game.version + 1
+        await conn.rollback()
+    await engine.dispose()
+    games_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_games_versions():
+    draft_game_id = 39
+    player_id = 44
+    engine = create_async_engine(test_db_config.db_url)
+    async with engine.connect() as conn:
+        await conn.begin()
+        maker = async_sessionmaker(bind=conn, autoflush=False, join_transaction_mode="create_savepoint")
+        async with DBRepository(maker) as db:
+            draft_version = await db.get_draft_game_version()
+            player_games = await db.get_games(player_id=player_id)
+            versions = {g.id: (await db.get_game_version(g.id)).version for g in player_games}
+            with pytest.raises(NotFoundError):
+                await db.get_game_version(-1)
+        assert (draft_version.id, draft_version.status) == (draft_game_id, GameStatuses.DRAFT)
+        assert versions == {g.id: g.version for g in player_games}
+
+        async with DBRepository(maker) as db:
+            await db.update_player(player_id, UpdatePlayerSchema(nickname="Renamed"))
+        async with DBRepository(maker) as db:
+            # renamed player is shown in the games
+            assert {g.id: (await db.get_game_version(g.id)).version for g in player_games} == {
+                game_id: version + 1 for game_id, version in versions.items()
+            }
+        await conn.rollback()
+    await engine.dispose()
+    games_cache.clear()
@@ -1,6 +1,7 @@
 import pytest
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
+from core import GameStatuses, Roles
 from repositories.db import DBRepository
 from tests.integration.db import test_db_config
 from usecases import GetPlayerStatsUseCase, GetPlayersUseCase
@@ -27,3 +28,20 @@ async def test_get_player_detail():
     uc = GetPlayerStatsUseCase(DBRepository(maker))
     player_stats = await uc.get_player_stats(player_id=players[0].id)
     assert isinstance(player_stats, PlayerStatsSchema)
+
+
+@pytest.mark.asyncio
+async def test_player_stats_counters_match_games():
+    engine = create_async_engine(test_db_config.db_url)
+    maker = async_sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    async with DBRepository(maker) as db:
+        players = await db.get_players(limit=None, offset=None)
+        for player in players:
+            counters = await db.get_player_stats_counters(player.id)
+            games = await db.get_games(player_id=player.id, status=GameStatuses.ENDED)
+            won = await db.get_games(player_id=player.id, status=GameStatuses.ENDED, is_won=True)
+            assert counters.games_count_total == len(games)
+            assert counters.won_games_count_total == len(won)
+            for role in Roles:
+                games_as_role = await db.get_games(player_id=player.id, status=GameStatuses.ENDED, role__in=[role])
+                assert getattr(counters, f"games_count_as_{role.value}") == len(games_as_role)
@@ -0,0 +1,92 @@
+import datetime
+
+import pytest
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncConnection, async_sessionmaker, create_async_engine
+
+from repositories.db import DBRepository
+from repositories.db.models import Game, LeaderboardEntry, Player, PlayerGame, PlayerRating, PlayerStats
+from tests.integration.db import test_db_config
+from usecases import HistoryTransferUseCase
+
+PLAYER_ID = 44
+IMPORTED_GAME_ID = 1_000_000
+
+
+async def _export(maker: async_sessionmaker) -> list[bytes]:
+    files = [bytearray(), bytearray(), bytearray()]
+
+    async def _output(file: bytearray, data: bytes) -> None:
+        file.extend(data)
+
+    await HistoryTransferUseCase(DBRepository(maker)).export_history(
+        *(lambda data, f=file: _output(f, data) for file in files)
+    )
+    return [bytes(file) for file in files]
+
+
+async def _get_sequences(conn: AsyncConnection) -> list[int]:
+    return [
+        await conn.scalar(select(func.pg_sequence_last_value(func.pg_get_serial_sequence(table, "id"))))
+        for table in (Player.__tablename__, Game.__tablename__)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_exported_history_is_imported_back():
+    engine = create_async_engine(test_db_config.db_url)
+    async with engine.connect() as conn:
+        sequences = await _get_sequences(conn)
+        await conn.rollback()
+        await conn.begin()
+        maker = async_sessionmaker(bind=conn, autoflush=False, join_transaction_mode="create_savepoint")
+        # a few old games of the dump break the best move rule checked by import
+        invalid_best_move_games = (
+            select(PlayerGame.game_id)
+            .where(PlayerGame.in_best_move)
+            .group_by(PlayerGame.game_id)
+            .having(func.count() != 3)
+        )
+        await conn.execute(
+            update(PlayerGame).where(PlayerGame.game_id.in_(invalid_best_move_games)).values(in_best_move=False)
+        )
+        exported = await _export(maker)
+        async with DBRepository(maker) as db:
+            stats = await db.get_player_stats_counters(PLAYER_ID)
+        for model in (PlayerRating, LeaderboardEntry, PlayerStats, PlayerGame, Game, Player):
+            await conn.execute(delete(model))
+
+        counts = await HistoryTransferUseCase(DBRepository(maker)).import_history(
+            *(file.decode().splitlines(keepends=True) for file in exported), batch_size=10
+        )
+
+        assert counts == (exported[0].count(b"\n") - 1, exported[1].count(b"\n") - 1)
+        assert await _export(maker) == exported
+        async with DBRepository(maker) as db:
+            assert await db.get_player_stats_counters(PLAYER_ID) == stats
+            assert await db.get_players_ratings([PLAYER_ID])
+        await conn.rollback()
+        # sequences are not transactional
+        for table, last_value in zip((Player.__tablename__, Game.__tablename__), sequences, strict=True):
+            await conn.scalar(select(func.setval(func.pg_get_serial_sequence(table, "id"), last_value)))
+        await conn.commit()
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_imported_games_keep_created_at_offset():
+    engine = create_async_engine(test_db_config.db_url)
+    created_at = datetime.datetime(2024, 3, 1, 21, 30, tzinfo=datetime.UTC)
+    async with engine.connect() as conn:
+        await conn.begin()
+        maker = async_sessionmaker(bind=conn, autoflush=False, join_transaction_mode="create_savepoint")
+        async with DBRepository(maker) as db:
+            summary, *_ = await db.get_ended_games_summaries(limit=1, cursor=None)
+            game = await db.get_game_by_id(summary.id)
+            await db.import_games([game.model_copy(update={"id": IMPORTED_GAME_ID, "created_at": created_at})])
+        async with DBRepository(maker) as db:
+            imported_game = await db.get_game_by_id(IMPORTED_GAME_ID)
+        assert imported_game.created_at == created_at
+        assert imported_game.created_at.utcoffset() == datetime.timedelta(hours=3)
+        await conn.rollback()
+    await engine.dispose()
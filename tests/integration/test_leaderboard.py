@@ -0,0 +1,51 @@
+import pytest
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from core import LeaderboardCategories
+from repositories.db import DBRepository
+from repositories.db.models import LeaderboardEntry, PlayerGame
+from tests.integration.db import test_db_config
+from usecases import GetLeaderboardUseCase
+
+ENDED_GAME_ID = 1
+
+
+@pytest.mark.asyncio
+async def test_apply_game_to_leaderboard_matches_rebuild():
+    engine = create_async_engine(test_db_config.db_url)
+    async with engine.connect() as conn:
+        await conn.begin()
+        maker = async_sessionmaker(bind=conn, autoflush=False, join_transaction_mode="create_savepoint")
+        entries = select(LeaderboardEntry.__table__).order_by(LeaderboardEntry.category, LeaderboardEntry.player_id)
+        async with DBRepository(maker) as db:
+            await db.rebuild_leaderboard()
+        rebuilt = (await conn.execute(entries)).all()
+        await conn.execute(
+            delete(LeaderboardEntry).where(
+                LeaderboardEntry.player_id.in_(select(PlayerGame.player_id).where(PlayerGame.game_id == ENDED_GAME_ID))
+            )
+        )
+        async with DBRepository(maker) as db:
+            await db.apply_game_to_leaderboard(ENDED_GAME_ID)
+        assert (await conn.execute(entries)).all() == rebuilt
+        await conn.rollback()
+    await engine.dispose()
+
+
+@pytest.mark.parametrize("category", list(LeaderboardCategories))
+@pytest.mark.asyncio
+async def test_leaderboard_pages_follow_each_other(category: LeaderboardCategories):
+    engine = create_async_engine(test_db_config.db_url)
+    uc = GetLeaderboardUseCase(DBRepository(async_sessionmaker(bind=engine, autoflush=False)))
+    whole = await uc.get_leaderboard_page(category, min_games=2, limit=1000)
+    assert whole.entries
+    assert all(e.games_count >= 2 for e in whole.entries)
+
+    page = await uc.get_leaderboard_page(category, min_games=2, limit=3)
+    paged = list(page.entries)
+    while page.next_page is not None:
+        page = await uc.get_leaderboard_page(category, min_games=2, limit=3, cursor=page.next_page)
+        paged += page.entries
+    assert paged == whole.entries
+    await engine.dispose()
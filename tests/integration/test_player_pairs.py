@@ -0,0 +1,46 @@
+import collections
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from core import RED_ROLES, GameStatuses, get_win_result_by_player_role
+from repositories.db import DBRepository
+from tests.integration.db import test_db_config
+from usecases import GetPlayerPairsUseCase
+from usecases.get_player_pairs import pairs_stats
+
+PLAYER_ID = 44
+
+
+@pytest.mark.asyncio
+async def test_player_pairs_match_player_games():
+    pairs_stats.clear()
+    engine = create_async_engine(test_db_config.db_url)
+    maker = async_sessionmaker(bind=engine, autoflush=False)
+    async with DBRepository(maker) as db:
+        games = await db.get_games(player_id=PLAYER_ID, status=GameStatuses.ENDED)
+    assert games
+    expected = collections.defaultdict(lambda: [0, 0, 0, 0])
+    for game in games:
+        player = next(p for p in game.players if p.id == PLAYER_ID)
+        is_won = game.result == get_win_result_by_player_role(player.role)
+        for other in game.players - {player}:
+            counters = expected[other.id]
+            offset = 0 if (player.role in RED_ROLES) == (other.role in RED_ROLES) else 2
+            counters[offset] += 1
+            counters[offset + 1] += is_won
+
+    pairs = await GetPlayerPairsUseCase(DBRepository(maker)).get_player_pairs(PLAYER_ID)
+
+    assert {
+        p.player_id: [
+            p.together_games_count,
+            p.together_won_games_count,
+            p.against_games_count,
+            p.against_won_games_count,
+        ]
+        for p in pairs
+    } == expected
+    assert all(p.nickname for p in pairs)
+    pairs_stats.clear()
+    await engine.dispose()
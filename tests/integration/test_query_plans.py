@@ -0,0 +1,141 @@
+import datetime
+from collections.abc import Awaitable, Callable
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from core import GameStatuses, LeaderboardCategories, Roles
+from repositories.db import DBRepository
+from repositories.db.cache import draft_game_cache, games_cache
+from tests.integration.db import test_db_config
+from usecases.interfaces import GamesFetchStrategy
+from usecases.schemas import LeaderboardCursorSchema, UpdateGameSchema
+
+ENDED_GAME_ID = 1
+DRAFT_GAME_ID = 39
+PLAYER_ID = 44
+SINCE = datetime.datetime(2024, 12, 1)  # noqa: DTZ001 games are stored without timezone
+UNTIL = datetime.datetime(2025, 1, 1)  # noqa: DTZ001
+EXPLAINED_STATEMENTS = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+
+
+async def _get_query_plans(call: Callable[[DBRepository], Awaitable]) -> list[str]:
+    """
+    Runs repository method inside a rolled back transaction and returns plans of all executed statements.
+    Sequential scans are disabled, so planner picks them only if there is no usable index.
+    """
+    draft_game_cache.invalidate()
+    games_cache.clear()
+    engine = create_async_engine(test_db_config.db_url)
+    statements = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany) -> None:  # noqa: ARG001
+        if statement.lstrip().upper().startswith(EXPLAINED_STATEMENTS):
+            statements.append((statement, parameters))
+
+    async with engine.connect() as conn:
+        await conn.begin()
+        await conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+        maker = async_sessionmaker(bind=conn, autoflush=False, join_transaction_mode="create_savepoint")
+        event.listen(engine.sync_engine, "before_cursor_execute", _capture)
+        try:
+            async with DBRepository(maker) as db:
+                await call(db)
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", _capture)
+        plans = []
+        for statement, parameters in statements:
+            result = await conn.exec_driver_sql(f"EXPLAIN {statement}", parameters)
+            plans.append("\n".join(row[0] for row in result))
+        await conn.rollback()
+    await engine.dispose()
+    return plans
+
+
+@pytest.mark.parametrize(
+    "call",
+    (
+        pytest.param(lambda db: db.get_game_by_id(ENDED_GAME_ID), id="get_game_by_id"),
+        pytest.param(lambda db: db.get_games(status=GameStatuses.ENDED), id="get_games_by_status"),
+        pytest.param(lambda db: db.get_games(status=GameStatuses.DRAFT), id="get_games_in_draft"),
+        pytest.param(
+            lambda db: db.get_games(player_id=PLAYER_ID, strategy=GamesFetchStrategy.SELECTIN),
+            id="get_games_by_player_selectin",
+        ),
+        pytest.param(
+            lambda db: db.get_games(player_id=PLAYER_ID, strategy=GamesFetchStrategy.JSON_AGG),
+            id="get_games_by_player_json_agg",
+        ),
+        pytest.param(
+            lambda db: db.get_game_by_id(ENDED_GAME_ID, strategy=GamesFetchStrategy.JSON_AGG),
+            id="get_game_by_id_json_agg",
+        ),
+        pytest.param(
+            lambda db: db.get_games(player_id=PLAYER_ID, role__in=[Roles.CIVILIAN], status=GameStatuses.ENDED),
+            id="get_games_by_player_and_role",
+        ),
+        pytest.param(
+            lambda db: db.get_games(player_id=PLAYER_ID, status=GameStatuses.ENDED, is_won=True),
+            id="get_won_games_by_player",
+        ),
+        pytest.param(lambda db: db.get_last_game_in_draft(), id="get_last_game_in_draft"),
+        pytest.param(lambda db: db.get_ended_games_summaries(limit=5, cursor=None), id="get_ended_games_summaries"),
+        pytest.param(lambda db: db.get_player_by_id(PLAYER_ID), id="get_player_by_id"),
+        pytest.param(lambda db: db.get_player_by_number(DRAFT_GAME_ID, 1), id="get_player_by_number"),
+        pytest.param(lambda db: db.remove_player_on_seat(DRAFT_GAME_ID, 1), id="remove_player_on_seat"),
+        pytest.param(lambda db: db.remove_player_from_game(DRAFT_GAME_ID, PLAYER_ID), id="remove_player_from_game"),
+        pytest.param(lambda db: db.update_game(DRAFT_GAME_ID, UpdateGameSchema(comments="")), id="update_game"),
+        pytest.param(
+            lambda db: db.reseat_player(DRAFT_GAME_ID, PLAYER_ID, seat_number=5, role=Roles.DON),
+            id="reseat_player",
+        ),
+        pytest.param(lambda db: db.set_game_best_move({8, 9, 10}, DRAFT_GAME_ID), id="set_game_best_move"),
+        pytest.param(
+            lambda db: db.assign_player_as_first_killed(DRAFT_GAME_ID, 1),
+            id="assign_player_as_first_killed",
+        ),
+        pytest.param(
+            lambda db: db.clear_game_first_killed_and_best_move(DRAFT_GAME_ID),
+            id="clear_game_first_killed_and_best_move",
+        ),
+        pytest.param(lambda db: db.get_player_stats_counters(PLAYER_ID), id="get_player_stats_counters"),
+        pytest.param(lambda db: db.get_seats_stats(player_id=PLAYER_ID), id="get_player_seats_stats"),
+        pytest.param(
+            lambda db: db.get_player_stats_counters(PLAYER_ID, since=SINCE, until=UNTIL),
+            id="get_period_player_stats_counters",
+        ),
+        pytest.param(lambda db: db.get_seats_stats(since=SINCE, until=UNTIL), id="get_period_seats_stats"),
+        pytest.param(
+            lambda db: db.get_games(status=GameStatuses.ENDED, created_at__gte=SINCE, created_at__lt=UNTIL),
+            id="get_period_games",
+        ),
+        pytest.param(lambda db: db.apply_game_to_player_stats(ENDED_GAME_ID), id="apply_game_to_player_stats"),
+        pytest.param(lambda db: db.apply_game_to_leaderboard(ENDED_GAME_ID), id="apply_game_to_leaderboard"),
+        pytest.param(
+            lambda db: db.get_leaderboard(LeaderboardCategories.RED, min_games=2, limit=10, cursor=None),
+            id="get_leaderboard",
+        ),
+        pytest.param(
+            lambda db: db.get_leaderboard(
+                LeaderboardCategories.RED,
+                min_games=2,
+                limit=10,
+                cursor=LeaderboardCursorSchema(win_rate=0.5, games_count=4, player_id=PLAYER_ID, backward=True),
+            ),
+            id="get_leaderboard_page",
+        ),
+        pytest.param(
+            lambda db: db.get_leaderboard(
+                LeaderboardCategories.RED, min_games=2, limit=10, cursor=None, since=SINCE, until=UNTIL
+            ),
+            id="get_period_leaderboard",
+        ),
+    ),
+)
+@pytest.mark.asyncio
+async def test_query_plans_use_indexes(call: Callable[[DBRepository], Awaitable]):
+    plans = await _get_query_plans(call)
+    assert plans
+    for plan in plans:
+        assert "Seq Scan" not in plan, plan
@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+import core
+from repositories.db import DBRepository
+from tests.integration.db import test_db_config
+from usecases import RatingsUseCase
+from usecases.schemas import PlayerRatingSchema
+
+
+@pytest.mark.asyncio
+async def test_recompute_and_save_ratings():
+    engine = create_async_engine(test_db_config.db_url)
+    async with engine.connect() as conn:
+        await conn.begin()
+        maker = async_sessionmaker(bind=conn, autoflush=False, join_transaction_mode="create_savepoint")
+        async with DBRepository(maker) as db:
+            participants = await db.get_ended_games_participants()
+        expected = [
+            PlayerRatingSchema(player_id=player_id, rating=rating, games_count=games_count)
+            for player_id, rating, games_count in core.replay_games(participants)
+        ]
+        assert expected
+
+        assert await RatingsUseCase(DBRepository(maker)).recompute() == len(expected)
+        async with DBRepository(maker) as db:
+            stored = await db.get_players_ratings([r.player_id for r in expected])
+        assert sorted(stored, key=lambda r: r.player_id) == expected
+
+        changed = expected[0].model_copy(update={"rating": 2000.0, "games_count": expected[0].games_count + 1})
+        async with DBRepository(maker) as db:
+            await db.save_players_ratings([changed])
+        async with DBRepository(maker) as db:
+            assert await db.get_players_ratings([changed.player_id]) == [changed]
+        await conn.rollback()
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_concurrently_locked_ratings_are_not_lost():
+    engine = create_async_engine(test_db_config.db_url)
+    maker = async_sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    async with DBRepository(maker) as db:
+        player_id = (await db.get_ended_games_participants())[0][1]
+        (original,) = await db.get_players_ratings([player_id])
+    first_locked = asyncio.Event()
+
+    async def _rate(is_first: bool) -> None:
+        if not is_first:
+            await first_locked.wait()
+        async with DBRepository(maker) as db:
+            (rating,) = await db.lock_players_ratings([player_id])
+            if is_first:
+                first_locked.set()
+                await asyncio.sleep(0.2)
+            await db.save_players_ratings(
+                [rating.model_copy(update={"rating": rating.rating + 1, "games_count": rating.games_count + 1})]
+            )
+
+    try:
+        await asyncio.gather(_rate(is_first=True), _rate(is_first=False))
+        async with DBRepository(maker) as db:
+            assert await db.get_players_ratings([player_id]) == [
+                original.model_copy(update={"rating": original.rating + 2, "games_count": original.games_count + 2})
+            ]
+    finally:
+        async with DBRepository(maker) as db:
+            await db.save_players_ratings([original])
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_ratings_of_new_players_are_locked_with_initial_rating():
+    engine = create_async_engine(test_db_config.db_url)
+    async with engine.connect() as conn:
+        await conn.begin()
+        maker = async_sessionmaker(bind=conn, autoflush=False, join_transaction_mode="create_savepoint")
+        async with DBRepository(maker) as db:
+            await db.replace_players_ratings([])
+            player_id = (await db.get_ended_games_participants())[0][1]
+            assert await db.lock_players_ratings([player_id]) == [PlayerRatingSchema(player_id=player_id)]
+            assert await db.get_players_ratings([player_id]) == [PlayerRatingSchema(player_id=player_id)]
+        await conn.rollback()
+    await engine.dispose()
@@ -0,0 +1,57 @@
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from core import Roles
+from repositories.db import DBRepository
+from tests.integration.db import dump_game, test_db_config
+from usecases.errors import NotFoundError
+from usecases.schemas import GameSchema
+
+DRAFT_GAME_ID = 39
+PLAYER_IN_GAME_ID = 44
+PLAYER_NOT_IN_GAME_ID = 38
+
+
+async def _reseat_and_reload(player_id: int, seat_number: int, role: Roles) -> tuple[GameSchema, GameSchema]:
+    """Reseats player inside a rolled back transaction, returns reseat result and game loaded after it"""
+    engine = create_async_engine(test_db_config.db_url)
+    async with engine.connect() as conn:
+        await conn.begin()
+        maker = async_sessionmaker(bind=conn, autoflush=False, join_transaction_mode="create_savepoint")
+        async with DBRepository(maker) as db:
+            game = await db.reseat_player(DRAFT_GAME_ID, player_id, seat_number=seat_number, role=role)
+        async with DBRepository(maker) as db:
+            reloaded_game = await db.get_game_by_id(DRAFT_GAME_ID)
+        await conn.rollback()
+    await engine.dispose()
+    return game, reloaded_game
+
+
+@pytest.mark.parametrize(
+    ("player_id", "seat_number"),
+    (
+        pytest.param(PLAYER_IN_GAME_ID, 5, id="move_to_taken_seat"),
+        pytest.param(PLAYER_IN_GAME_ID, 1, id="same_seat"),
+        pytest.param(PLAYER_NOT_IN_GAME_ID, 5, id="new_player_to_taken_seat"),
+    ),
+)
+@pytest.mark.asyncio
+async def test_reseat_player(player_id: int, seat_number: int):
+    game, reloaded_game = await _reseat_and_reload(player_id, seat_number, Roles.DON)
+    assert dump_game(game) == dump_game(reloaded_game)
+    assert game.first_killed is None
+    assert game.best_move is None
+    player_on_seat = next(p for p in game.players if p.number == seat_number)
+    assert player_on_seat.id == player_id
+    assert player_on_seat.role == Roles.DON
+    assert len([p for p in game.players if p.id == player_id]) == 1
+
+
+@pytest.mark.asyncio
+async def test_reseat_player_in_unknown_game():
+    engine = create_async_engine(test_db_config.db_url)
+    maker = async_sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with pytest.raises(NotFoundError):
+        async with DBRepository(maker) as db:
+            await db.reseat_player(1_000_000_000, PLAYER_NOT_IN_GAME_ID, seat_number=5, role=Roles.DON)
+    await engine.dispose()
@@ -0,0 +1,26 @@
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from core import GameStatuses, get_win_result_by_player_role
+from repositories.db import DBRepository
+from tests.integration.db import test_db_config
+
+PLAYER_ID = 44
+
+
+@pytest.mark.parametrize("player_id", (PLAYER_ID, None))
+@pytest.mark.asyncio
+async def test_seats_stats_match_games(player_id: int | None):
+    engine = create_async_engine(test_db_config.db_url)
+    async with DBRepository(async_sessionmaker(bind=engine, autoflush=False)) as db:
+        seats_stats = await db.get_seats_stats(player_id=player_id)
+        games = await db.get_games(player_id=player_id, status=GameStatuses.ENDED)
+    expected = {}
+    for game in games:
+        for p in game.players:
+            if player_id is None or p.id == player_id:
+                games_count, won_games_count = expected.get((p.number, p.role), (0, 0))
+                is_won = game.result == get_win_result_by_player_role(p.role)
+                expected[(p.number, p.role)] = (games_count + 1, won_games_count + is_won)
+    assert {(s.number, s.role): (s.games_count, s.won_games_count) for s in seats_stats} == expected
+    await engine.dispose()
@@ -0,0 +1,140 @@
+import argparse
+import datetime
+from collections.abc import AsyncGenerator
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+import core
+from config import DBConfig
+from core import GameResults, GameStatuses, LeaderboardCategories, Roles
+from repositories.db import DBRepository
+from repositories.db.cache import draft_game_cache, games_cache
+from repositories.db.engine import create_engine, create_schema, create_session_factory
+from tests.integration.db import set_test_environment
+from usecases import (
+    AddToBestMoveUseCase,
+    AssignAsFirstKilledUseCase,
+    AssignPlayerToSeatUseCase,
+    CreateGameUseCase,
+    EndGameUseCase,
+    GetGamesUseCase,
+    GetLeaderboardUseCase,
+    GetPlayerPairsUseCase,
+    GetPlayerStatsUseCase,
+    HistoryTransferUseCase,
+    PlayerStatsProjectionUseCase,
+    UsersUseCase,
+)
+from usecases.get_player_pairs import pairs_stats
+from usecases.interfaces import GamesFetchStrategy
+from usecases.schemas import CreatePlayerSchema, UserSchema
+
+set_test_environment()
+
+ROLES = [Roles.DON, Roles.SHERIFF, Roles.MAFIA, Roles.MAFIA, *[Roles.CIVILIAN] * 6]
+
+
+@pytest_asyncio.fixture
+async def sqlite_session_factory(tmp_path: Path) -> AsyncGenerator[async_sessionmaker]:
+    draft_game_cache.invalidate()
+    games_cache.clear()
+    pairs_stats.clear()
+    engine = create_engine(DBConfig(DB_BACKEND="sqlite", DB_PATH=str(tmp_path / "mafia.sqlite3")))
+    await create_schema(engine)
+    yield create_session_factory(engine)
+    await engine.dispose()
+    draft_game_cache.invalidate()
+    games_cache.clear()
+    pairs_stats.clear()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_backend_plays_game(sqlite_session_factory: async_sessionmaker):
+    maker = sqlite_session_factory
+    async with DBRepository(maker) as db:
+        for i in range(11):
+            await db.create_player(CreatePlayerSchema(fio=f"Player {i}", nickname=f"Nickname {i}"))
+        players = await db.get_players(limit=11, offset=0)
+
+    game = await CreateGameUseCase(DBRepository(maker)).create_game_in_draft(datetime.datetime.now())
+    assert game.status == GameStatuses.DRAFT
+    for number, (player, role) in enumerate(zip(players[:10], ROLES, strict=True), start=1):
+        game = await AssignPlayerToSeatUseCase(DBRepository(maker)).assign_player_to_seat(
+            game.id, player.id, number, role
+        )
+    # seat of the last player is taken by a new one
+    game = await AssignPlayerToSeatUseCase(DBRepository(maker)).assign_player_to_seat(
+        game.id, players[10].id, 10, Roles.CIVILIAN
+    )
+    assert {(p.id, p.number) for p in game.players} == {
+        *((player.id, number) for number, player in enumerate(players[:9], start=1)),
+        (players[10].id, 10),
+    }
+    await AssignAsFirstKilledUseCase(DBRepository(maker)).assign_player_as_first_killed(game.id, 10)
+    await AddToBestMoveUseCase(DBRepository(maker)).add_players_to_best_move({1, 3, 4}, game.id)
+    await EndGameUseCase(DBRepository(maker)).end_game(game.id, GameResults.MAFIA_WON)
+
+    games_uc = GetGamesUseCase(DBRepository(maker))
+    ended_game = await games_uc.get_game(game.id)
+    assert ended_game.status == GameStatuses.ENDED
+    assert ended_game.first_killed.number == 10
+    assert {p.number for p in ended_game.best_move} == {1, 3, 4}
+    async with DBRepository(maker) as db:
+        for strategy in GamesFetchStrategy:
+            assert await db.get_games(player_id=players[0].id, strategy=strategy) == [ended_game]
+    assert (await games_uc.get_ended_games_page(limit=5)).games[0].id == game.id
+    assert [g async for g in games_uc.iter_ended_games(since=ended_game.created_at)] == [ended_game]
+
+    stats = await GetPlayerStatsUseCase(DBRepository(maker)).get_player_stats(players[0].id)
+    assert (stats.games_count_as_don, stats.won_games_count_as_don) == (1, 1)
+    assert stats.rating > core.INITIAL_RATING
+    assert await PlayerStatsProjectionUseCase(DBRepository(maker)).get_inconsistent_players_ids() == []
+    leaderboard = await GetLeaderboardUseCase(DBRepository(maker)).get_leaderboard_page(
+        LeaderboardCategories.BLACK, min_games=1, limit=10
+    )
+    assert [(e.player_id, e.win_rate) for e in leaderboard.entries] == [
+        (player.id, 1.0) for player in (players[3], players[2], players[0])
+    ]
+    since, until = core.get_period_bounds(core.StatsPeriods.MONTH, datetime.datetime.now())
+    month_leaderboard = await GetLeaderboardUseCase(DBRepository(maker)).get_leaderboard_page(
+        LeaderboardCategories.BLACK, min_games=1, limit=10, since=since, until=until
+    )
+    assert month_leaderboard.entries == leaderboard.entries
+    month_stats = await GetPlayerStatsUseCase(DBRepository(maker)).get_player_stats(
+        players[0].id, since=since, until=until
+    )
+    assert month_stats == stats
+    previous_month_stats = await GetPlayerStatsUseCase(DBRepository(maker)).get_player_stats(
+        players[0].id, until=since
+    )
+    assert previous_month_stats.games_count_total == 0
+
+    pairs = await GetPlayerPairsUseCase(DBRepository(maker)).get_player_pairs(players[0].id)
+    assert sum(p.together_won_games_count for p in pairs) == 2
+    assert sum(p.against_won_games_count for p in pairs) == 7
+
+    users_uc = UsersUseCase(DBRepository(maker))
+    user = UserSchema(telegram_id=1, first_name="User")
+    assert await users_uc.save_user_if_new(user) is True
+    assert await users_uc.save_user_if_new(user) is False
+
+
+@pytest.mark.asyncio
+async def test_sqlite_backend_refuses_history_transfer(
+    sqlite_session_factory: async_sessionmaker, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    import manage
+
+    monkeypatch.setattr(
+        manage.container, "resolve", lambda _: HistoryTransferUseCase(DBRepository(sqlite_session_factory))
+    )
+    args = argparse.Namespace(directory=tmp_path / "history", batch_size=10)
+    assert await manage.export_history(args) == 1
+    for name, content in zip(manage.HISTORY_FILES, ("id,fio,nickname\n1,,Nickname\n", "", ""), strict=True):
+        (args.directory / name).write_text(content)
+    assert await manage.import_history(args) == 1
+    async with DBRepository(sqlite_session_factory) as db:
+        assert await db.get_players(limit=1, offset=0) == []
@@ -0,0 +1,51 @@
+import datetime
+from itertools import pairwise
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from core import GameStatuses, LeaderboardCategories
+from repositories.db import DBRepository
+from tests.integration.db import test_db_config
+from usecases.schemas import PlayerStatsCountersSchema
+
+PLAYER_ID = 44
+HISTORY_SINCE = datetime.datetime(2000, 1, 1)  # noqa: DTZ001 games are stored without timezone
+MONTHS_SINCE = [
+    datetime.datetime(2024 + (month > 12), (month - 1) % 12 + 1, 1)  # noqa: DTZ001
+    for month in range(10, 21)
+]
+
+
+@pytest.mark.parametrize("category", list(LeaderboardCategories))
+@pytest.mark.asyncio
+async def test_whole_history_period_matches_stored_stats(category: LeaderboardCategories):
+    engine = create_async_engine(test_db_config.db_url)
+    async with DBRepository(async_sessionmaker(bind=engine, autoflush=False)) as db:
+        stored = await db.get_leaderboard(category, min_games=1, limit=1000, cursor=None)
+        period = await db.get_leaderboard(category, min_games=1, limit=1000, cursor=None, since=HISTORY_SINCE)
+        assert period == stored
+        stored_counters = await db.get_player_stats_counters(PLAYER_ID)
+        assert await db.get_player_stats_counters(PLAYER_ID, since=HISTORY_SINCE) == stored_counters
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_monthly_stats_sum_up_to_all_time():
+    engine = create_async_engine(test_db_config.db_url)
+    async with DBRepository(async_sessionmaker(bind=engine, autoflush=False)) as db:
+        all_time = await db.get_player_stats_counters(PLAYER_ID)
+        months = [
+            await db.get_player_stats_counters(PLAYER_ID, since=since, until=until)
+            for since, until in pairwise(MONTHS_SINCE)
+        ]
+        games_by_month = [
+            await db.get_games(status=GameStatuses.ENDED, created_at__gte=since, created_at__lt=until)
+            for since, until in pairwise(MONTHS_SINCE)
+        ]
+        ended_games_count = await db.get_ended_games_count()
+    assert sum(1 for m in months if m.games_count_total) > 1
+    for counter in PlayerStatsCountersSchema.model_fields:
+        assert sum(getattr(m, counter) for m in months) == getattr(all_time, counter)
+    assert sum(len(games) for games in games_by_month) == ended_games_count
+    await engine.dispose()
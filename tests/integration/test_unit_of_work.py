@@ -0,0 +1,45 @@
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from repositories.db import DBRepository, UnitOfWork
+from tests.integration.db import test_db_config
+from usecases.schemas import UpdatePlayerSchema
+
+
+@pytest.mark.asyncio
+async def test_unit_of_work_shares_session_and_rolls_back():
+    engine = create_async_engine(test_db_config.db_url)
+    maker = async_sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    async with DBRepository(maker) as db:
+        player = (await db.get_players(limit=1, offset=0))[0]
+    with pytest.raises(RuntimeError):
+        async with UnitOfWork(maker):
+            async with DBRepository(maker) as db:
+                await db.update_player(player.id, UpdatePlayerSchema(nickname="Renamed in unit of work"))
+            async with DBRepository(maker) as db:
+                assert (await db.get_player_by_id(player.id)).nickname == "Renamed in unit of work"
+            raise RuntimeError
+    async with DBRepository(maker) as db:
+        assert (await db.get_player_by_id(player.id)).nickname == player.nickname
+
+
+@pytest.mark.asyncio
+async def test_commit_callbacks_are_called_only_after_commit():
+    engine = create_async_engine(test_db_config.db_url)
+    maker = async_sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    committed = []
+    with pytest.raises(RuntimeError):
+        async with UnitOfWork(maker):
+            async with DBRepository(maker) as db:
+                db.on_commit(lambda: committed.append("rolled back"))
+            raise RuntimeError
+    async with UnitOfWork(maker) as unit_of_work:
+        async with DBRepository(maker) as db:
+            db.on_commit(lambda: committed.append("unit of work"))
+        assert committed == []
+        await unit_of_work.commit()
+        assert committed == ["unit of work"]
+    async with DBRepository(maker) as db:
+        db.on_commit(lambda: committed.append("repository"))
+    assert committed == ["unit of work", "repository"]
+    await engine.dispose()
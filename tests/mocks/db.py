@@ -1,16 +1,35 @@
+import csv
+import datetime
+import io
+from collections.abc import AsyncIterator, Callable
 from typing import Self
 
 import core
 from core import GameStatuses
-from usecases.errors import NotFoundError
-from usecases.interfaces import DBRepositoryInterface
+from usecases.errors import NotFoundError, ValidationError
+from usecases.interfaces import (
+    GAMES_CSV_COLUMNS,
+    PARTICIPANTS_CSV_COLUMNS,
+    PLAYERS_CSV_COLUMNS,
+    DBRepositoryInterface,
+    GamesFetchStrategy,
+    HistoryOutput,
+)
 from usecases.schemas import (
     CreateGameSchema,
     CreatePlayerSchema,
     GameSchema,
+    GameSummarySchema,
+    GameVersionSchema,
+    GamesCursorSchema,
+    LeaderboardCursorSchema,
+    LeaderboardEntrySchema,
     PlayerInGameSchema,
+    PlayerRatingSchema,
     PlayerSchema,
+    PlayerStatsCountersSchema,
     RawGameSchema,
+    SeatRoleStatsSchema,
     UpdateGameSchema,
     UpdatePlayerSchema,
     UserSchema,
@@ -27,6 +46,10 @@ class FakeDBRepository(DBRepositoryInterface):
         self._players = players or {}
         self._games = games or {}
         self._users = users or {}
+        self._player_stats_games: list[int] = []
+        self._leaderboard_games: list[int] = []
+        self._ratings: dict[int, PlayerRatingSchema] = {}
+        self._commit_callbacks: list[Callable[[], None]] = []
 
     async def __aenter__(self) -> Self:
         return self
@@ -38,7 +61,14 @@ class FakeDBRepository(DBRepositoryInterface):
         except ValueError:
             return 1
 
-    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None: ...
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        callbacks, self._commit_callbacks = self._commit_callbacks, []
+        if exc_type is None:
+            for callback in callbacks:
+                callback()
+
+    def on_commit(self, callback: Callable[[], None]) -> None:
+        self._commit_callbacks.append(callback)
 
     async def create_player(self, player: CreatePlayerSchema) -> None:
         id_ = self._get_next_id(self._players)
@@ -47,6 +77,12 @@ class FakeDBRepository(DBRepositoryInterface):
     async def create_user(self, user: UserSchema) -> None:
         self._users[user.telegram_id] = UserSchema(**user.model_dump())
 
+    async def create_user_if_not_exists(self, user: UserSchema) -> bool:
+        if user.telegram_id in self._users:
+            return False
+        await self.create_user(user)
+        return True
+
     async def get_users(self) -> list[UserSchema]:
         return list(self._users.values())
 
@@ -72,6 +108,9 @@ class FakeDBRepository(DBRepositoryInterface):
         except KeyError as e:
             raise NotFoundError(f"TEST player id={player_id} not found") from e
 
+    async def get_players_by_ids(self, players_ids: list[int]) -> list[PlayerSchema]:
+        return [self._players[player_id] for player_id in players_ids if player_id in self._players]
+
     async def get_players_count(self) -> int:
         return len(self._players)
 
@@ -89,13 +128,20 @@ class FakeDBRepository(DBRepositoryInterface):
     async def get_ended_games_count(self) -> int:
         return len(list(filter(lambda g: g.status == GameStatuses.ENDED, self._games.values())))
 
+    async def get_ended_games_ids(self) -> list[int]:
+        return [g.id for g in self._games.values() if g.status == GameStatuses.ENDED]
+
     async def create_game(self, data: CreateGameSchema) -> RawGameSchema:
         id_ = self._get_next_id(self._games)
         game_to_create = GameSchema(id=id_, **data.model_dump())
         self._games[id_] = game_to_create
         return RawGameSchema.model_validate(game_to_create, from_attributes=True)
 
-    async def get_game_by_id(self, game_id: int) -> GameSchema:
+    async def get_game_by_id(
+        self,
+        game_id: int,
+        strategy: GamesFetchStrategy = GamesFetchStrategy.JOINED,  # noqa: ARG002
+    ) -> GameSchema:
         try:
             return self._games[game_id]
         except KeyError as e:
@@ -106,6 +152,13 @@ class FakeDBRepository(DBRepositoryInterface):
         player = self._players[player_id]
         game.players.add(PlayerInGameSchema(number=seat_number, role=role, **player.model_dump()))
 
+    async def reseat_player(self, game_id: int, player_id: int, seat_number: int, role: core.Roles) -> GameSchema:
+        await self.remove_player_from_game(game_id, player_id)
+        await self.remove_player_on_seat(game_id, seat_number=seat_number)
+        await self.clear_game_first_killed_and_best_move(game_id=game_id)
+        await self.add_player(game_id=game_id, player_id=player_id, seat_number=seat_number, role=role)
+        return self._games[game_id]
+
     async def remove_player_from_game(self, game_id: int, player_id: int) -> None:
         for p in self._games[game_id].players:
             if p.id == player_id:
@@ -141,6 +194,55 @@ class FakeDBRepository(DBRepositoryInterface):
     async def update_game(self, game_id: int, data: UpdateGameSchema) -> None:
         self._games[game_id] = self._games[game_id].model_copy(update=data.model_dump(exclude_unset=True))
 
+    async def end_game(self, game_id: int, result: core.GameResults) -> bool:
+        game = self._games[game_id]
+        if game.status != GameStatuses.DRAFT:
+            return False
+        self._games[game_id] = game.model_copy(update={"status": GameStatuses.ENDED, "result": result})
+        return True
+
+    async def get_game_version(self, game_id: int) -> GameVersionSchema:
+        game = await self.get_game_by_id(game_id)
+        return GameVersionSchema(id=game.id, version=game.version, status=game.status)
+
+    async def get_draft_game_version(self) -> GameVersionSchema | None:
+        game = await self.get_last_game_in_draft()
+        return None if game is None else GameVersionSchema(id=game.id, version=game.version, status=game.status)
+
+    async def get_last_game_in_draft(self) -> GameSchema | None:
+        games = [g for g in self._games.values() if g.status == GameStatuses.DRAFT]
+        return max(games, key=lambda g: g.created_at, default=None)
+
+    async def get_ended_games_summaries(
+        self,
+        limit: int,
+        cursor: GamesCursorSchema | None,
+    ) -> list[GameSummarySchema]:
+        games = sorted(
+            (
+                GameSummarySchema(id=g.id, result=g.result, created_at=g.created_at)
+                for g in self._games.values()
+                if g.status == GameStatuses.ENDED
+            ),
+            key=lambda g: (g.created_at, g.id),
+            reverse=True,
+        )
+        if cursor is None:
+            return games[: limit + 1]
+        position = (cursor.created_at, cursor.id)
+        if cursor.backward:
+            return [g for g in games if (g.created_at, g.id) > position][-(limit + 1) :]
+        return [g for g in games if (g.created_at, g.id) < position][: limit + 1]
+
+    async def iter_ended_games(
+        self,
+        since: datetime.datetime | None = None,
+        until: datetime.datetime | None = None,
+    ) -> AsyncIterator[GameSchema]:
+        games = await self.get_games(status=GameStatuses.ENDED, created_at__gte=since, created_at__lt=until)
+        for game in sorted(games, key=lambda g: (g.created_at, g.id)):
+            yield game
+
     async def get_games(
         self,
         player_id: int | None = None,
@@ -149,6 +251,9 @@ class FakeDBRepository(DBRepositoryInterface):
         result__in: list[core.GameResults] | None = None,
         status: core.GameStatuses | None = None,
         is_won: bool | None = None,
+        created_at__gte: datetime.datetime | None = None,
+        created_at__lt: datetime.datetime | None = None,
+        strategy: GamesFetchStrategy = GamesFetchStrategy.JOINED,  # noqa: ARG002
     ) -> list[GameSchema]:
         games = self._games.values()
         if player_id:
@@ -161,6 +266,10 @@ class FakeDBRepository(DBRepositoryInterface):
             games = filter(lambda g: g.result in result__in, games)
         if status:
             games = filter(lambda g: g.status == status, games)
+        if created_at__gte:
+            games = filter(lambda g: g.created_at.replace(tzinfo=None) >= created_at__gte, games)
+        if created_at__lt:
+            games = filter(lambda g: g.created_at.replace(tzinfo=None) < created_at__lt, games)
         if is_won:
             if not player_id:
                 raise Exception("TEST no user_id in filters")
@@ -171,3 +280,212 @@ class FakeDBRepository(DBRepositoryInterface):
     def _user_won(game: GameSchema, user_id: int) -> bool:
         user = next(filter(lambda p: p.id == user_id, game.players))
         return core.get_win_result_by_player_role(user.role) == game.result
+
+    async def get_player_stats_counters(
+        self,
+        player_id: int,
+        since: datetime.datetime | None = None,
+        until: datetime.datetime | None = None,
+    ) -> PlayerStatsCountersSchema:
+        filters = {
+            "player_id": player_id,
+            "status": core.GameStatuses.ENDED,
+            "created_at__gte": since,
+            "created_at__lt": until,
+        }
+        counters = {
+            "games_count_total": len(await self.get_games(**filters)),
+            "won_games_count_total": len(await self.get_games(**filters, is_won=True)),
+        }
+        for role in core.Roles:
+            games = await self.get_games(**filters, role__in=[role])
+            won = await self.get_games(**filters, role__in=[role], is_won=True)
+            counters[f"games_count_as_{role.value}"] = len(games)
+            counters[f"won_games_count_as_{role.value}"] = len(won)
+        first_killed_games = [
+            g
+            for g in await self.get_games(**filters, role__in=list(core.RED_ROLES))
+            if g.first_killed and g.first_killed.id == player_id
+        ]
+        best_move_games = [g for g in first_killed_games if g.best_move]
+        counters["first_killed_count"] = len(first_killed_games)
+        counters["best_move_count_total"] = len(best_move_games)
+        for black_count, prefix in enumerate(("zero", "one", "two", "three")):
+            counters[f"{prefix}_mafia_best_move_count"] = len(
+                [g for g in best_move_games if self._black_in_best_move(g) == black_count]
+            )
+        return PlayerStatsCountersSchema(**counters)
+
+    @staticmethod
+    def _black_in_best_move(game: GameSchema) -> int:
+        return len([p for p in game.best_move if p.role in core.BLACK_ROLES])
+
+    async def get_seats_stats(
+        self,
+        player_id: int | None = None,
+        since: datetime.datetime | None = None,
+        until: datetime.datetime | None = None,
+    ) -> list[SeatRoleStatsSchema]:
+        counters: dict[tuple[int, core.Roles], list[int]] = {}
+        for game in await self.get_games(status=GameStatuses.ENDED, created_at__gte=since, created_at__lt=until):
+            for p in game.players:
+                if player_id is None or p.id == player_id:
+                    seat_counters = counters.setdefault((p.number, p.role), [0, 0])
+                    seat_counters[0] += 1
+                    seat_counters[1] += game.result == core.get_win_result_by_player_role(p.role)
+        return [
+            SeatRoleStatsSchema(number=number, role=role, games_count=games_count, won_games_count=won_games_count)
+            for (number, role), (games_count, won_games_count) in sorted(counters.items())
+        ]
+
+    async def apply_game_to_player_stats(self, game_id: int) -> None:
+        self._player_stats_games.append(game_id)
+
+    async def rebuild_player_stats(self) -> None:
+        self._player_stats_games = [g.id for g in self._games.values() if g.status == GameStatuses.ENDED]
+
+    async def get_inconsistent_player_stats(self) -> list[int]:
+        return []
+
+    async def apply_game_to_leaderboard(self, game_id: int) -> None:
+        self._leaderboard_games.append(game_id)
+
+    async def rebuild_leaderboard(self) -> None:
+        self._leaderboard_games = [g.id for g in self._games.values() if g.status == GameStatuses.ENDED]
+
+    async def get_leaderboard(
+        self,
+        category: core.LeaderboardCategories,
+        min_games: int,
+        limit: int,
+        cursor: LeaderboardCursorSchema | None,
+        since: datetime.datetime | None = None,
+        until: datetime.datetime | None = None,
+    ) -> list[LeaderboardEntrySchema]:
+        match category:
+            case core.LeaderboardCategories.OVERALL:
+                roles = list(core.Roles)
+            case core.LeaderboardCategories.RED:
+                roles = list(core.RED_ROLES)
+            case core.LeaderboardCategories.BLACK:
+                roles = list(core.BLACK_ROLES)
+            case _:
+                roles = [core.Roles(category.value)]
+        entries = []
+        for player in self._players.values():
+            filters = {
+                "player_id": player.id,
+                "status": core.GameStatuses.ENDED,
+                "role__in": roles,
+                "created_at__gte": since,
+                "created_at__lt": until,
+            }
+            games_count = len(await self.get_games(**filters))
+            won_games_count = len(await self.get_games(**filters, is_won=True))
+            if games_count and games_count >= min_games:
+                entries.append(
+                    LeaderboardEntrySchema(
+                        player_id=player.id,
+                        nickname=player.nickname,
+                        games_count=games_count,
+                        won_games_count=won_games_count,
+                        win_rate=won_games_count / games_count,
+                    )
+                )
+        entries.sort(key=lambda e: (e.win_rate, e.games_count, e.player_id), reverse=True)
+        if cursor is None:
+            return entries[: limit + 1]
+        position = (cursor.win_rate, cursor.games_count, cursor.player_id)
+        if cursor.backward:
+            return [e for e in entries if (e.win_rate, e.games_count, e.player_id) > position][-(limit + 1) :]
+        return [e for e in entries if (e.win_rate, e.games_count, e.player_id) < position][: limit + 1]
+
+    async def get_players_ratings(self, players_ids: list[int]) -> list[PlayerRatingSchema]:
+        return [self._ratings[player_id] for player_id in players_ids if player_id in self._ratings]
+
+    async def lock_players_ratings(self, players_ids: list[int]) -> list[PlayerRatingSchema]:
+        return [self._ratings.setdefault(p, PlayerRatingSchema(player_id=p)) for p in players_ids]
+
+    async def save_players_ratings(self, ratings: list[PlayerRatingSchema]) -> None:
+        self._ratings.update({r.player_id: r for r in ratings})
+
+    async def replace_players_ratings(self, ratings: list[PlayerRatingSchema]) -> None:
+        self._ratings = {r.player_id: r for r in ratings}
+
+    async def get_ended_games_participants(
+        self,
+        games_ids: list[int] | None = None,
+    ) -> list[tuple[int, int, core.Roles, core.GameResults]]:
+        ended_games = sorted(
+            (
+                g
+                for g in self._games.values()
+                if g.status == GameStatuses.ENDED and (games_ids is None or g.id in games_ids)
+            ),
+            key=lambda g: (g.created_at, g.id),
+        )
+        return [(g.id, p.id, p.role, g.result) for g in ended_games for p in sorted(g.players, key=lambda p: p.number)]
+
+    @staticmethod
+    async def _write_csv(output: HistoryOutput, columns: tuple[str, ...], rows: list[tuple]) -> None:
+        lines = io.StringIO()
+        writer = csv.writer(lines)
+        writer.writerow(columns)
+        writer.writerows(rows)
+        await output(lines.getvalue().encode())
+
+    async def export_history(
+        self,
+        players_output: HistoryOutput,
+        games_output: HistoryOutput,
+        participants_output: HistoryOutput,
+    ) -> None:
+        games = sorted((g for g in self._games.values() if g.status == GameStatuses.ENDED), key=lambda g: g.id)
+        players = sorted(self._players.values(), key=lambda p: p.id)
+        await self._write_csv(players_output, PLAYERS_CSV_COLUMNS, [(p.id, p.fio, p.nickname) for p in players])
+        await self._write_csv(
+            games_output, GAMES_CSV_COLUMNS, [(g.id, g.result, g.comments, g.created_at) for g in games]
+        )
+        await self._write_csv(
+            participants_output,
+            PARTICIPANTS_CSV_COLUMNS,
+            [
+                (
+                    g.id,
+                    p.id,
+                    p.role,
+                    p.number,
+                    p in (g.best_move or ()),
+                    g.first_killed is not None and g.first_killed.id == p.id,
+                )
+                for g in games
+                for p in sorted(g.players, key=lambda p: p.number)
+            ],
+        )
+
+    async def import_players(self, players: list[PlayerSchema]) -> None:
+        if taken := [p.id for p in players if p.id in self._players]:
+            raise ValidationError(f"TEST players ids {taken} are taken")
+        self._players.update({p.id: p for p in players})
+
+    async def import_games(self, games: list[GameSchema]) -> None:
+        if taken := [g.id for g in games if g.id in self._games]:
+            raise ValidationError(f"TEST games ids {taken} are taken")
+        if unknown := [p.id for g in games for p in g.players if p.id not in self._players]:
+            raise ValidationError(f"TEST players {unknown} don't exist")
+
+        def _in_game(player: PlayerInGameSchema) -> PlayerInGameSchema:
+            stored = self._players[player.id]
+            return player.model_copy(update={"fio": stored.fio, "nickname": stored.nickname})
+
+        for game in games:
+            self._games[game.id] = game.model_copy(
+                update={
+                    "players": {_in_game(p) for p in game.players},
+                    "best_move": {_in_game(p) for p in game.best_move} if game.best_move else None,
+                    "first_killed": _in_game(game.first_killed) if game.first_killed else None,
+                }
+            )
+
+    async def reset_ids_sequences(self) -> None:
+        pass
@@ -6,6 +6,7 @@ import pytest
 
 from core import GameResults, GameStatuses, Roles
 from tests.conftest import (
+    civilian_player,
     game_with_best_move_and_no_first_killed,
     game_with_invalid_best_move,
     game_with_invalid_players_quantity,
@@ -14,11 +15,12 @@ from tests.conftest import (
     game_with_valid_best_move,
     valid_game,
     valid_player,
+    won_game,
 )
 from tests.mocks import FakeDBRepository
 from usecases import AssignPlayerToSeatUseCase, CreateGameUseCase, EndGameUseCase, GetGamesUseCase
-from usecases.errors import ValidationError
-from usecases.schemas import GameSchema, PlayerSchema
+from usecases.errors import NotFoundError, ValidationError
+from usecases.schemas import GameSchema, PlayerInGameSchema, PlayerSchema
 
 
 @pytest.mark.asyncio
@@ -83,6 +85,38 @@ async def test_end_game(
         await uc.end_game(game_id=game.id, result=game_result)
         assert db._games[game.id].result == game_result
         assert db._games[game.id].status == GameStatuses.ENDED
+        assert db._player_stats_games == [game.id]
+
+
+@pytest.mark.asyncio
+async def test_end_ended_game():
+    game = valid_game()
+    db = FakeDBRepository(games={game.id: game})
+    uc = EndGameUseCase(db=db)
+    await uc.end_game(game_id=game.id, result=GameResults.MAFIA_WON)
+    with pytest.raises(ValidationError):
+        await uc.end_game(game_id=game.id, result=GameResults.CIVILIANS_WON)
+    assert db._player_stats_games == [game.id]
+
+
+class _ConcurrentlyEndingDBRepository(FakeDBRepository):
+    """Another request ends the game right after it is read"""
+
+    async def get_game_by_id(self, game_id: int, **kwargs) -> GameSchema:
+        game = await super().get_game_by_id(game_id, **kwargs)
+        await super().end_game(game_id, GameResults.DRAW)
+        return game
+
+
+@pytest.mark.asyncio
+async def test_end_game_ended_concurrently():
+    game = valid_game()
+    db = _ConcurrentlyEndingDBRepository(games={game.id: game})
+    with pytest.raises(ValidationError):
+        await EndGameUseCase(db=db).end_game(game_id=game.id, result=GameResults.MAFIA_WON)
+    assert db._games[game.id].result == GameResults.DRAW
+    assert db._player_stats_games == []
+    assert db._ratings == {}
 
 
 @pytest.mark.parametrize(
@@ -116,3 +150,80 @@ async def test_assign_player_to_seat(
         player_on_seat = next(filter(lambda p: p.number == seat_number, result_game.players))
         assert player.id == player_on_seat.id
         assert role == player_on_seat.role
+
+
+@pytest.mark.asyncio
+async def test_get_ended_games_pages():
+    seats = iter(range(1, 11))
+    players = iter([(f"fio {i}", f"nick {i}") for i in range(12)])
+    player = civilian_player(seats, players)
+    created_at = datetime.datetime(2025, 1, 1, tzinfo=datetime.UTC)
+    games = [
+        won_game(player).model_copy(update={"created_at": created_at + datetime.timedelta(minutes=i)})
+        for i in range(12)
+    ]
+    uc = GetGamesUseCase(db=FakeDBRepository(games={g.id: g for g in games}))
+    newest_first = [g.id for g in reversed(games)]
+
+    first_page = await uc.get_ended_games_page(limit=5)
+    assert [g.id for g in first_page.games] == newest_first[:5]
+    assert first_page.previous_page is None
+
+    second_page = await uc.get_ended_games_page(limit=5, cursor=first_page.next_page)
+    assert [g.id for g in second_page.games] == newest_first[5:10]
+
+    last_page = await uc.get_ended_games_page(limit=5, cursor=second_page.next_page)
+    assert [g.id for g in last_page.games] == newest_first[10:]
+    assert last_page.next_page is None
+
+    back_page = await uc.get_ended_games_page(limit=5, cursor=last_page.previous_page)
+    assert [g.id for g in back_page.games] == newest_first[5:10]
+    assert back_page.next_page == second_page.next_page
+
+    back_to_first_page = await uc.get_ended_games_page(limit=5, cursor=back_page.previous_page)
+    assert [g.id for g in back_to_first_page.games] == newest_first[:5]
+    assert back_to_first_page.previous_page is None
+
+
+@pytest.mark.asyncio
+async def test_iter_ended_games():
+    seats = iter(range(1, 11))
+    players = iter([(f"fio {i}", f"nick {i}") for i in range(12)])
+    player = civilian_player(seats, players)
+    created_at = datetime.datetime(2025, 1, 1)  # noqa: DTZ001 games are stored without timezone
+    games = [
+        won_game(player).model_copy(update={"created_at": created_at + datetime.timedelta(days=i)}) for i in range(5)
+    ]
+    draft_game = valid_game().model_copy(update={"created_at": created_at})
+    uc = GetGamesUseCase(db=FakeDBRepository(games={g.id: g for g in reversed([*games, draft_game])}))
+
+    assert [g.id async for g in uc.iter_ended_games()] == [g.id for g in games]
+    since, until = games[1].created_at, games[3].created_at
+    assert [g.id async for g in uc.iter_ended_games(since=since, until=until)] == [games[1].id, games[2].id]
+
+
+@pytest.mark.asyncio
+async def test_get_draft_game_state():
+    game = game_with_valid_best_move().model_copy(update={"status": GameStatuses.DRAFT})
+    uc = GetGamesUseCase(db=FakeDBRepository(games={game.id: game}))
+
+    state = await uc.get_draft_game_state()
+
+    assert [s.number for s in state.seats] == list(range(1, 11))
+    assert {(s.player_id, s.role) for s in state.seats} == {(p.id, p.role) for p in game.players}
+    assert state.first_killed == game.first_killed.number
+    assert state.best_move == sorted(p.number for p in game.best_move)
+    assert await GetGamesUseCase(db=FakeDBRepository()).get_draft_game_state() is None
+
+
+@pytest.mark.asyncio
+async def test_get_games_versions():
+    draft_game = valid_game()
+    ended_game = won_game(PlayerInGameSchema(**valid_player().model_dump(), role=Roles.CIVILIAN, number=1))
+    uc = GetGamesUseCase(db=FakeDBRepository(games={g.id: g for g in (draft_game, ended_game)}))
+
+    draft_version = await uc.get_draft_game_version()
+    assert (draft_version.id, draft_version.version) == (draft_game.id, draft_game.version)
+    assert (await uc.get_game_version(ended_game.id)).status == GameStatuses.ENDED
+    with pytest.raises(NotFoundError):
+        await uc.get_game_version(-1)
@@ -0,0 +1,90 @@
+import pytest
+
+from core import Roles
+from tests.conftest import valid_player, won_game
+from tests.mocks import FakeDBRepository
+from usecases import HistoryTransferUseCase
+from usecases.errors import ValidationError
+from usecases.schemas import GameSchema, PlayerInGameSchema, PlayerSchema
+
+
+def _source_db() -> FakeDBRepository:
+    player = valid_player()
+    games = [won_game(PlayerInGameSchema(**player.model_dump(), role=role, number=1)) for role in Roles]
+    civilians = sorted((p for p in games[0].players if p.role == Roles.CIVILIAN), key=lambda p: p.number)
+    games[0] = games[0].model_copy(
+        update={"first_killed": civilians[0], "best_move": set(civilians[1:4]), "comments": 'with "quotes",\ncommas'}
+    )
+    players = {p.id: PlayerSchema(id=p.id, fio=p.fio, nickname=p.nickname) for g in games for p in g.players}
+    return FakeDBRepository(players=players, games={g.id: g for g in games})
+
+
+async def _export(db: FakeDBRepository) -> list[list[str]]:
+    files = [bytearray(), bytearray(), bytearray()]
+
+    async def _output(file: bytearray, data: bytes) -> None:
+        file.extend(data)
+
+    await HistoryTransferUseCase(db).export_history(*(lambda data, f=file: _output(f, data) for file in files))
+    return [file.decode().splitlines(keepends=True) for file in files]
+
+
+def _dump(games: list[GameSchema]) -> list[tuple]:
+    return [
+        (
+            g.model_dump(exclude={"players", "best_move", "first_killed"}),
+            sorted((p.id, p.fio, p.nickname, p.role, p.number) for p in g.players),
+            sorted(p.id for p in g.best_move or ()),
+            g.first_killed and g.first_killed.id,
+        )
+        for g in sorted(games, key=lambda g: g.id)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_history_round_trip():
+    source = _source_db()
+    target = FakeDBRepository()
+
+    counts = await HistoryTransferUseCase(target).import_history(*await _export(source), batch_size=2)
+
+    assert counts == (len(source._players), len(source._games))
+    assert target._players == source._players
+    assert _dump(list(target._games.values())) == _dump(list(source._games.values()))
+    assert sorted(target._player_stats_games) == sorted(source._games)
+    assert target._ratings
+
+
+@pytest.mark.asyncio
+async def test_import_stops_at_invalid_game():
+    source = _source_db()
+    players_lines, games_lines, participants_lines = await _export(source)
+    # the last game loses two participants
+    participants_lines = participants_lines[:-2]
+    target = FakeDBRepository()
+
+    with pytest.raises(ValidationError, match="Can't create game with 8 players"):
+        await HistoryTransferUseCase(target).import_history(
+            players_lines, games_lines, participants_lines, batch_size=2
+        )
+    assert len(target._players) == len(source._players)
+    assert sorted(target._games) == sorted(source._games)[:2]
+    assert sorted(target._player_stats_games) == sorted(source._games)[:2]
+
+
+@pytest.mark.asyncio
+async def test_import_requires_participants_in_games_order():
+    players_lines, games_lines, participants_lines = await _export(_source_db())
+    games_lines = [games_lines[0], *reversed(games_lines[1:])]
+
+    with pytest.raises(ValidationError, match="must follow the order of games"):
+        await HistoryTransferUseCase(FakeDBRepository()).import_history(players_lines, games_lines, participants_lines)
+
+
+@pytest.mark.asyncio
+async def test_import_rejects_unknown_role():
+    players_lines, games_lines, participants_lines = await _export(_source_db())
+    participants_lines[1] = participants_lines[1].replace(",civilian,", ",doctor,").replace(",mafia,", ",doctor,")
+
+    with pytest.raises(ValidationError, match="is not valid"):
+        await HistoryTransferUseCase(FakeDBRepository()).import_history(players_lines, games_lines, participants_lines)
@@ -0,0 +1,47 @@
+import pytest
+
+from core import LeaderboardCategories, Roles
+from tests.conftest import id_g, lost_game, won_game
+from tests.mocks import FakeDBRepository
+from usecases import GetLeaderboardUseCase
+from usecases.schemas import PlayerInGameSchema, PlayerSchema
+
+
+def _civilian(player: PlayerSchema) -> PlayerInGameSchema:
+    return PlayerInGameSchema(id=player.id, fio=player.fio, nickname=player.nickname, role=Roles.CIVILIAN, number=1)
+
+
+@pytest.mark.asyncio
+async def test_get_leaderboard_pages():
+    players = [PlayerSchema(id=next(id_g), fio=f"fio {i}", nickname=f"nick {i}") for i in range(7)]
+    games = []
+    for won_count, player in enumerate(players[:6]):
+        games += [won_game(_civilian(player)) for _ in range(won_count)]
+        games += [lost_game(_civilian(player)) for _ in range(6 - won_count)]
+    # newcomer won the only game, but hasn't played enough games to be ranked
+    games.append(won_game(_civilian(players[6])))
+    uc = GetLeaderboardUseCase(
+        db=FakeDBRepository(players={p.id: p for p in players}, games={g.id: g for g in games})
+    )
+    best_first = [p.id for p in reversed(players[:6])]
+
+    first_page = await uc.get_leaderboard_page(LeaderboardCategories.RED, min_games=2, limit=4)
+    assert [e.player_id for e in first_page.entries] == best_first[:4]
+    assert [e.win_percent for e in first_page.entries] == [83.33, 66.67, 50, 33.33]
+    assert first_page.previous_page is None
+
+    last_page = await uc.get_leaderboard_page(
+        LeaderboardCategories.RED, min_games=2, limit=4, cursor=first_page.next_page
+    )
+    assert [e.player_id for e in last_page.entries] == best_first[4:]
+    assert last_page.next_page is None
+
+    back_page = await uc.get_leaderboard_page(
+        LeaderboardCategories.RED, min_games=2, limit=4, cursor=last_page.previous_page
+    )
+    assert back_page == first_page
+
+    overall_page = await uc.get_leaderboard_page(LeaderboardCategories.OVERALL, min_games=1, limit=4)
+    assert overall_page.entries[0].player_id == players[6].id
+    mafia_page = await uc.get_leaderboard_page(LeaderboardCategories.MAFIA, min_games=1, limit=4)
+    assert mafia_page.entries == []
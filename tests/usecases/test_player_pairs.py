@@ -0,0 +1,94 @@
+import datetime
+
+import pytest
+
+from core import GameResults, GameStatuses, Roles
+from tests.conftest import id_g
+from tests.mocks import FakeDBRepository
+from usecases import EndGameUseCase, GetPlayerPairsUseCase
+from usecases.get_player_pairs import pairs_stats
+from usecases.schemas import GameSchema, PlayerInGameSchema, PlayerPairStatsSchema, PlayerRatingSchema, PlayerSchema
+
+ROLES = [Roles.DON, Roles.SHERIFF, Roles.MAFIA, Roles.MAFIA, *[Roles.CIVILIAN] * 6]
+
+
+def _game(players: list[PlayerSchema], status: GameStatuses, result: GameResults | None) -> GameSchema:
+    """players are seated in order of ROLES: don, sheriff, two mafia and civilians"""
+    return GameSchema(
+        id=next(id_g),
+        comments="",
+        result=result,
+        status=status,
+        created_at=datetime.datetime.now(),
+        best_move=None,
+        first_killed=None,
+        players={
+            PlayerInGameSchema(id=p.id, fio=p.fio, nickname=p.nickname, role=role, number=number)
+            for number, (p, role) in enumerate(zip(players, ROLES, strict=True), start=1)
+        },
+    )
+
+
+@pytest.fixture(autouse=True)
+def clear_pairs_stats():
+    pairs_stats.clear()
+    yield
+    pairs_stats.clear()
+
+
+@pytest.mark.asyncio
+async def test_get_player_pairs():
+    players = [PlayerSchema(id=next(id_g), fio=f"fio {i}", nickname=f"nick {i}") for i in range(11)]
+    first_game = _game(players[:10], GameStatuses.ENDED, GameResults.MAFIA_WON)
+    # don and sheriff of the first game swap roles
+    second_game = _game([players[1], players[0], *players[2:10]], GameStatuses.DRAFT, None)
+    db = FakeDBRepository(
+        players={p.id: p for p in players},
+        games={first_game.id: first_game, second_game.id: second_game},
+    )
+    uc = GetPlayerPairsUseCase(db=db)
+
+    pairs = {p.player_id: p for p in await uc.get_player_pairs(players[0].id)}
+    assert len(pairs) == 9
+    assert pairs[players[2].id] == PlayerPairStatsSchema(
+        player_id=players[2].id,
+        nickname=players[2].nickname,
+        together_games_count=1,
+        together_won_games_count=1,
+        against_games_count=0,
+        against_won_games_count=0,
+    )
+    assert (pairs[players[1].id].against_games_count, pairs[players[1].id].against_won_games_count) == (1, 1)
+
+    # game ended by this process is added to loaded pairs
+    await EndGameUseCase(db=db).end_game(second_game.id, GameResults.MAFIA_WON)
+    assert pairs_stats.games_ids == {first_game.id, second_game.id}
+    head_to_head = await uc.get_pair_stats(players[0].id, players[1].id)
+    assert (head_to_head.against_games_count, head_to_head.against_won_games_count) == (2, 1)
+    assert head_to_head.against_win_percent == 50
+
+    # game ended by another process is loaded by id
+    third_game = _game([players[10], *players[1:10]], GameStatuses.ENDED, GameResults.DRAW)
+    db._games[third_game.id] = third_game
+    head_to_head = await uc.get_pair_stats(players[1].id, players[10].id)
+    assert (head_to_head.against_games_count, head_to_head.against_won_games_count) == (1, 0)
+    assert pairs_stats.games_ids == {first_game.id, second_game.id, third_game.id}
+    never_met = await uc.get_pair_stats(players[0].id, players[10].id)
+    assert (never_met.together_games_count, never_met.against_games_count) == (0, 0)
+    assert never_met.together_win_percent is None
+
+
+class _FailingRatingsDBRepository(FakeDBRepository):
+    async def save_players_ratings(self, ratings: list[PlayerRatingSchema]) -> None:  # noqa: ARG002
+        raise RuntimeError("ratings are not saved")
+
+
+@pytest.mark.asyncio
+async def test_game_is_not_added_to_pairs_if_end_game_fails():
+    players = [PlayerSchema(id=next(id_g), fio=f"fio {i}", nickname=f"nick {i}") for i in range(10)]
+    game = _game(players, GameStatuses.DRAFT, None)
+    db = _FailingRatingsDBRepository(players={p.id: p for p in players}, games={game.id: game})
+
+    with pytest.raises(RuntimeError):
+        await EndGameUseCase(db=db).end_game(game.id, GameResults.MAFIA_WON)
+    assert game.id not in pairs_stats.games_ids
@@ -0,0 +1,87 @@
+import datetime
+import random
+
+import pytest
+
+import core
+from core import GameResults, GameStatuses, Roles
+from tests.conftest import id_g, valid_game
+from tests.mocks import FakeDBRepository
+from usecases import EndGameUseCase, RatingsUseCase
+from usecases.schemas import GameSchema, PlayerInGameSchema, PlayerSchema
+
+ROLES = [Roles.DON, Roles.SHERIFF, Roles.MAFIA, Roles.MAFIA, *[Roles.CIVILIAN] * 6]
+
+
+def _random_game(players: list[PlayerSchema], created_at: datetime.datetime, rng: random.Random) -> GameSchema:
+    roles = ROLES.copy()
+    rng.shuffle(roles)
+    return GameSchema(
+        id=next(id_g),
+        comments="",
+        result=None,
+        status=GameStatuses.DRAFT,
+        created_at=created_at,
+        best_move=None,
+        first_killed=None,
+        players={
+            PlayerInGameSchema(id=p.id, fio=p.fio, nickname=p.nickname, role=role, number=number)
+            for number, (p, role) in enumerate(zip(rng.sample(players, len(roles)), roles, strict=True), start=1)
+        },
+    )
+
+
+@pytest.mark.asyncio
+async def test_end_game_updates_ratings():
+    game = valid_game()
+    db = FakeDBRepository(games={game.id: game})
+    await EndGameUseCase(db=db).end_game(game_id=game.id, result=GameResults.CIVILIANS_WON)
+
+    ratings = {r.player_id: r for r in await db.get_players_ratings([p.id for p in game.players])}
+    deltas = {p.role: ratings[p.id].rating - core.INITIAL_RATING for p in game.players}
+    assert {r.games_count for r in ratings.values()} == {1}
+    assert deltas[Roles.SHERIFF] > deltas[Roles.CIVILIAN] > 0
+    assert deltas[Roles.DON] < deltas[Roles.MAFIA] < 0
+    # equal teams expect a draw, so winners get half of K-factor
+    assert deltas[Roles.CIVILIAN] == pytest.approx(core.RATING_K_FACTOR / 2)
+
+
+@pytest.mark.asyncio
+async def test_recompute_ratings_matches_incremental_updates():
+    rng = random.Random(0)
+    players = [PlayerSchema(id=next(id_g), fio=f"fio {i}", nickname=f"nick {i}") for i in range(14)]
+    first_game_at = datetime.datetime(2024, 1, 1)  # noqa: DTZ001 games are stored without timezone
+    games = [_random_game(players, first_game_at + datetime.timedelta(hours=i), rng) for i in range(30)]
+    db = FakeDBRepository(players={p.id: p for p in players}, games={g.id: g for g in games})
+    for game in games:
+        await EndGameUseCase(db=db).end_game(game_id=game.id, result=rng.choice(list(GameResults)))
+    incremental = {p.id: (await db.get_players_ratings([p.id]))[0] for p in players}
+
+    assert await RatingsUseCase(db=db).recompute() == len(players)
+
+    for player in players:
+        recomputed = (await db.get_players_ratings([player.id]))[0]
+        assert recomputed.rating == pytest.approx(incremental[player.id].rating)
+        assert recomputed.games_count == incremental[player.id].games_count
+
+
+def test_replay_games_with_empty_seats():
+    # the second game doesn't share players with the first one, so both are rated in one batch
+    participants = [
+        *[(1, player_id, role, GameResults.MAFIA_WON) for player_id, role in zip(range(1, 10), ROLES, strict=False)],
+        *[(2, player_id, role, GameResults.DRAW) for player_id, role in zip(range(11, 21), ROLES, strict=True)],
+        *[(3, player_id, role, GameResults.CIVILIANS_WON) for player_id, role in zip(range(1, 11), ROLES, strict=True)],
+    ]
+    ratings = dict.fromkeys(range(1, 21), (core.INITIAL_RATING, 0))
+    for game_id in (1, 2, 3):
+        game = [(player_id, role, result) for g, player_id, role, result in participants if g == game_id]
+        new_ratings = core.rate_game([ratings[p][0] for p, _, _ in game], [r for _, r, _ in game], game[0][2])
+        for (player_id, _, _), rating in zip(game, new_ratings, strict=True):
+            ratings[player_id] = (rating, ratings[player_id][1] + 1)
+
+    replayed = core.replay_games(participants)
+
+    assert [player_id for player_id, _, _ in replayed] == list(range(1, 21))
+    for player_id, rating, games_count in replayed:
+        assert rating == pytest.approx(ratings[player_id][0])
+        assert games_count == ratings[player_id][1]
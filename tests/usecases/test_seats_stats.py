@@ -0,0 +1,44 @@
+import pytest
+
+from core import MAX_PLAYERS, Roles
+from tests.conftest import lost_game, valid_player, won_game
+from tests.mocks import FakeDBRepository
+from usecases import GetSeatsStatsUseCase
+from usecases.errors import NotFoundError
+from usecases.schemas import PlayerInGameSchema, PlayerSchema
+
+
+def _in_game(player: PlayerSchema, role: Roles, number: int) -> PlayerInGameSchema:
+    return PlayerInGameSchema(id=player.id, fio=player.fio, nickname=player.nickname, role=role, number=number)
+
+
+@pytest.mark.asyncio
+async def test_get_seats_stats():
+    player = valid_player()
+    games = [
+        won_game(_in_game(player, Roles.SHERIFF, 1)),
+        lost_game(_in_game(player, Roles.CIVILIAN, 1)),
+        won_game(_in_game(player, Roles.MAFIA, 1)),
+    ]
+    uc = GetSeatsStatsUseCase(db=FakeDBRepository(players={player.id: player}, games={g.id: g for g in games}))
+
+    seats = await uc.get_seats_stats(player_id=player.id)
+
+    assert [s.number for s in seats] == list(range(1, MAX_PLAYERS + 1))
+    assert (seats[0].games_count, seats[0].won_games_count, seats[0].win_percent) == (3, 2, 66.67)
+    assert {r.role: (r.games_count, r.won_games_count) for r in seats[0].roles} == {
+        Roles.SHERIFF: (1, 1),
+        Roles.CIVILIAN: (1, 0),
+        Roles.MAFIA: (1, 1),
+        Roles.DON: (0, 0),
+    }
+    assert all(s.games_count == 0 and s.win_percent is None for s in seats[1:])
+    # other players of the games take seats from 2 to 10
+    club_seats = await uc.get_seats_stats()
+    assert all(s.games_count == len(games) for s in club_seats)
+
+
+@pytest.mark.asyncio
+async def test_get_seats_stats_of_unknown_player():
+    with pytest.raises(NotFoundError):
+        await GetSeatsStatsUseCase(db=FakeDBRepository()).get_seats_stats(player_id=1)
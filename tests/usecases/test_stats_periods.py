@@ -0,0 +1,73 @@
+import datetime
+
+import pytest
+
+from core import LeaderboardCategories, Roles, StatsPeriods, get_current_period_bounds, get_period_bounds
+from tests.conftest import id_g, lost_game, won_game
+from tests.mocks import FakeDBRepository
+from usecases import GetLeaderboardUseCase, GetPlayerStatsUseCase, GetSeatsStatsUseCase
+from usecases.schemas import GameSchema, PlayerInGameSchema, PlayerSchema
+
+NOW = datetime.datetime(2026, 10, 18, 15, 30)  # noqa: DTZ001 games are stored without timezone
+
+
+@pytest.mark.parametrize(
+    ("period", "season_start_month", "bounds"),
+    (
+        (StatsPeriods.ALL_TIME, 1, (None, None)),
+        (StatsPeriods.MONTH, 1, (datetime.datetime(2026, 10, 1), datetime.datetime(2026, 11, 1))),  # noqa: DTZ001
+        (StatsPeriods.SEASON, 1, (datetime.datetime(2026, 1, 1), datetime.datetime(2027, 1, 1))),  # noqa: DTZ001
+        (StatsPeriods.SEASON, 9, (datetime.datetime(2026, 9, 1), datetime.datetime(2027, 9, 1))),  # noqa: DTZ001
+        (StatsPeriods.SEASON, 11, (datetime.datetime(2025, 11, 1), datetime.datetime(2026, 11, 1))),  # noqa: DTZ001
+    ),
+)
+def test_get_period_bounds(period: StatsPeriods, season_start_month: int, bounds: tuple):
+    assert get_period_bounds(period, NOW, season_start_month) == bounds
+
+
+def test_get_december_bounds():
+    december = datetime.datetime(2026, 12, 31, 23, 59)  # noqa: DTZ001
+    assert get_period_bounds(StatsPeriods.MONTH, december) == (
+        datetime.datetime(2026, 12, 1),  # noqa: DTZ001
+        datetime.datetime(2027, 1, 1),  # noqa: DTZ001
+    )
+
+
+def test_current_season_contains_now():
+    since, until = get_current_period_bounds(StatsPeriods.SEASON, season_start_month=9)
+    assert since.month == 9
+    assert since <= datetime.datetime.now() < until
+
+
+def _played_at(game: GameSchema, created_at: datetime.datetime) -> GameSchema:
+    return game.model_copy(update={"created_at": created_at})
+
+
+@pytest.mark.asyncio
+async def test_period_stats():
+    player = PlayerSchema(id=next(id_g), fio="Period Player", nickname="Period Player")
+    civilian = PlayerInGameSchema(id=player.id, fio=player.fio, nickname=player.nickname, role=Roles.CIVILIAN, number=1)
+    month_since, month_until = get_period_bounds(StatsPeriods.MONTH, NOW)
+    games = [
+        _played_at(won_game(civilian), NOW),
+        _played_at(won_game(civilian), month_since),
+        _played_at(lost_game(civilian), month_since - datetime.timedelta(seconds=1)),
+        _played_at(lost_game(civilian), month_until),
+    ]
+    db = FakeDBRepository(players={player.id: player}, games={g.id: g for g in games})
+
+    month_stats = await GetPlayerStatsUseCase(db).get_player_stats(player.id, since=month_since, until=month_until)
+    assert (month_stats.games_count_total, month_stats.won_games_count_total) == (2, 2)
+    all_time_stats = await GetPlayerStatsUseCase(db).get_player_stats(player.id)
+    assert (all_time_stats.games_count_total, all_time_stats.won_games_count_total) == (4, 2)
+
+    month_page = await GetLeaderboardUseCase(db).get_leaderboard_page(
+        LeaderboardCategories.OVERALL, min_games=1, limit=10, since=month_since, until=month_until
+    )
+    player_entry = next(e for e in month_page.entries if e.player_id == player.id)
+    assert (player_entry.games_count, player_entry.win_percent) == (2, 100)
+
+    month_seats = await GetSeatsStatsUseCase(db).get_seats_stats(player.id, since=month_since, until=month_until)
+    assert (month_seats[0].games_count, month_seats[0].won_games_count) == (2, 2)
+    earlier_seats = await GetSeatsStatsUseCase(db).get_seats_stats(player.id, until=month_since)
+    assert (earlier_seats[0].games_count, earlier_seats[0].won_games_count) == (1, 0)
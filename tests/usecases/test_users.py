@@ -28,3 +28,12 @@ async def test_get_users():
     users = await uc.get_users()
     assert len(users) == 1
     assert users[0] == user
+
+
+@pytest.mark.asyncio
+async def test_save_user_if_new():
+    db = FakeDBRepository()
+    uc = UsersUseCase(db=db)
+    assert await uc.save_user_if_new(user)
+    assert not await uc.save_user_if_new(user)
+    assert len(db._users) == 1